@@ -1,3 +1,4 @@
+import importlib
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
@@ -6,19 +7,19 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QSize
 
-# Import your 5 UI modules
-from ui.patient import PatientManagement
-from ui.doctor import DoctorManagement
-from ui.settings import SettingsWindow
-from ui.appointment import AppointmentBooking
-from ui.followup import FollowUpManager
-from ui.dashboard import Dashboard
+from database import events
+from database.connection import get_connection, close_connection
 
-from database.followup_db import FollowUpDB
-from database.appointment_db import AppointmentDB
-from database.clinic_db import PatientDB
-from database.doctor_db import DoctorDB
-from database.setting_db import StatusDB
+# (module, class) of each page in menu order. A page -- and its module --
+# is only loaded the first time it is shown.
+PAGES = [
+    ("ui.dashboard", "Dashboard"),
+    ("ui.patient", "PatientManagement"),
+    ("ui.doctor", "DoctorManagement"),
+    ("ui.appointment", "AppointmentBooking"),
+    ("ui.followup", "FollowUpManager"),
+    ("ui.settings", "SettingsWindow"),
+]
 
 
 class MainDashboard(QMainWindow):
@@ -63,38 +64,19 @@ class MainDashboard(QMainWindow):
         # 🔄 Refresh button
         self.refresh_btn = QPushButton("🔄 Refresh Data")
         self.refresh_btn.setFixedHeight(40)
-        self.refresh_btn.clicked.connect(self.refresh_all_dropdowns)
+        self.refresh_btn.clicked.connect(self.reload_all)
         self.menu_layout.addWidget(self.refresh_btn)
 
         self.menu_layout.addStretch()
 
-        # Create UI modules once and store them
-        self.dashboard_ui = Dashboard()
-        self.patient_ui = PatientManagement()
-        self.doctor_ui = DoctorManagement()
-        self.appointment_ui = AppointmentBooking()
-        self.followup_ui = FollowUpManager()
-        self.settings_ui = SettingsWindow()
-
-        # Connect data_changed signals from modules to refresh dashboard
-        # This requires these modules to emit data_changed signal after CRUD
-        if hasattr(self.patient_ui, 'data_changed'):
-            self.patient_ui.data_changed.connect(self.refresh_dashboard)
-        if hasattr(self.doctor_ui, 'data_changed'):
-            self.doctor_ui.data_changed.connect(self.refresh_dashboard)
-        if hasattr(self.appointment_ui, 'data_changed'):
-            self.appointment_ui.data_changed.connect(self.refresh_dashboard)
-        if hasattr(self.followup_ui, 'data_changed'):
-            self.followup_ui.data_changed.connect(self.refresh_dashboard)
-
-        # Right content area (stacked views)
+        # Right content area (stacked views). Each slot holds an empty
+        # placeholder until display_page builds the real page; pages keep
+        # themselves current from database.events (see ui/events.py).
+        self.pages = [None] * len(PAGES)
         self.stack = QStackedWidget()
-        self.stack.addWidget(self.dashboard_ui)
-        self.stack.addWidget(self.patient_ui)
-        self.stack.addWidget(self.doctor_ui)
-        self.stack.addWidget(self.appointment_ui)
-        self.stack.addWidget(self.followup_ui)
-        self.stack.addWidget(self.settings_ui)
+        for _ in PAGES:
+            self.stack.addWidget(QWidget())
+        self.display_page(0)
 
         # Combine menu and content
         main_layout.addLayout(self.menu_layout, 1)
@@ -111,33 +93,30 @@ class MainDashboard(QMainWindow):
             btn.setIconSize(QSize(24, 24))
         return btn
 
-    def display_page(self, index):
-        self.stack.setCurrentIndex(index)
-
-    def refresh_dashboard(self):
-        """Refresh dashboard data (summary, appointments, followups)"""
-        if hasattr(self.dashboard_ui, "refresh_summary"):
-            self.dashboard_ui.refresh_summary()
-        if hasattr(self.dashboard_ui, "refresh_appointments"):
-            self.dashboard_ui.refresh_appointments()
-        if hasattr(self.dashboard_ui, "refresh_followups_for_date"):
-            self.dashboard_ui.refresh_followups_for_date()
+    def page(self, index):
+        """The page at index, built and put into the stack on first use."""
+        page = self.pages[index]
+        if page is None:
+            module, name = PAGES[index]
+            page = self.pages[index] = getattr(importlib.import_module(module), name)()
+            placeholder = self.stack.widget(index)
+            self.stack.insertWidget(index, page)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return page
 
-    def refresh_all_dropdowns(self):
-        """Calls refresh on dropdowns and dashboard to keep data in sync."""
-        if hasattr(self.followup_ui, "refresh_dropdowns"):
-            self.followup_ui.refresh_dropdowns()
-        if hasattr(self.appointment_ui, "refresh_dropdowns"):
-            self.appointment_ui.refresh_dropdowns()
-        if hasattr(self.settings_ui, "refresh_dropdowns"):
-            self.settings_ui.refresh_dropdowns()
+    def display_page(self, index):
+        self.stack.setCurrentWidget(self.page(index))
 
-        self.refresh_dashboard()
+    def reload_all(self):
+        """Re-read everything, e.g. after another process wrote to the database."""
+        events.changed(None, events.RELOAD)
 
 
 if __name__ == "__main__":
-    StatusDB()
+    get_connection()  # applies pending schema migrations
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_connection)
     window = MainDashboard()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,402 @@
+"""Time every public method of the database classes at several data scales.
+
+    python -m benchmarks.db_bench --scales 10k 100k 1m --out bench.json
+    python -m benchmarks.db_bench --scales 100k --compare bench.json --only AppointmentDB
+
+For each scale (a number of appointments; see benchmarks.synthetic.scale)
+a synthetic database is generated -- or reused from --data-dir -- and
+copied to a scratch file, so write methods never touch the cached copy.
+Each case runs until --budget seconds are spent (at least --min-runs,
+at most --max-runs times); p50/p95 come from those runs and peak Python
+memory from one more run under tracemalloc. Results are written as JSON
+(by default db_bench-<commit>.json) together with the git commit, so
+runs from two commits can be compared with --compare.
+"""
+
+import argparse
+import collections
+import inspect
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from benchmarks import synthetic
+from database import connection
+from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.doctor_db import DoctorDB
+from database.followup_db import FollowUpDB
+from database.setting_db import StatusDB
+
+CLASSES = [PatientDB, DoctorDB, AppointmentDB, FollowUpDB, StatusDB]
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+REGRESSION = 1.2  # --compare flags a p50 this many times slower...
+NOISE_MS = 0.05  # ...and at least this much slower
+
+# call(db, ctx, prepared) is timed; setup(db, ctx) runs untimed before each
+# call and its result is passed as prepared. Labels are "Class.method",
+# optionally with a "[variant]" suffix.
+Case = namedtuple("Case", ["call", "setup"], defaults=(None,))
+
+
+def _drain(iterable):
+    collections.deque(iterable, maxlen=0)
+
+
+def _unique(ctx, prefix):
+    ctx.serial += 1
+    return f"{prefix} {ctx.serial}"
+
+
+def _new_patient(db, ctx):
+    return db.insert_patient(_unique(ctx, "Bench Patient"), "Female", "30",
+                             f"97{ctx.serial:08d}", "Lalitpur")
+
+
+def _new_appointment(db, ctx):
+    return db.insert(ctx.patient_id, ctx.doctor_id, ctx.today, "10:00", "Bench", ctx.status_id)
+
+
+def _new_followup(db, ctx):
+    return db.insert(ctx.patient_id, ctx.doctor_id, ctx.today, "Bench", ctx.status_id)
+
+
+def _row(ctx, sql, key):
+    return ctx.conn.execute(sql, (key,)).fetchone()
+
+
+CASES = {
+    # --- PatientDB ---
+    "PatientDB.insert_patient": Case(lambda db, ctx, _: _new_patient(db, ctx)),
+    "PatientDB.get_all_patients": Case(lambda db, ctx, _: db.get_all_patients()),
+    "PatientDB.delete_patient": Case(lambda db, ctx, pid: db.delete_patient(pid), _new_patient),
+    "PatientDB.update_patient": Case(
+        lambda db, ctx, row: db.update_patient(ctx.patient_id, *row),
+        lambda db, ctx: _row(ctx, "SELECT name, gender, age, phone_number, address FROM patients "
+                                  "WHERE id = ?", ctx.patient_id),
+    ),
+    "PatientDB.get_all": Case(lambda db, ctx, _: db.get_all()),
+    "PatientDB.search": Case(lambda db, ctx, _: db.search(ctx.keyword)),
+    "PatientDB.search[phone]": Case(lambda db, ctx, _: db.search(ctx.phone[:6])),
+    "PatientDB.get_phone_by_patient_name": Case(
+        lambda db, ctx, _: db.get_phone_by_patient_name(ctx.patient_name)
+    ),
+    "PatientDB.get_all_with_summary": Case(lambda db, ctx, _: db.get_all_with_summary()),
+    "PatientDB.iter_all_with_summary": Case(lambda db, ctx, _: _drain(db.iter_all_with_summary())),
+    "PatientDB.get_summary_page": Case(lambda db, ctx, _: db.get_summary_page()),
+    "PatientDB.get_summary_page[keyword]": Case(
+        lambda db, ctx, _: db.get_summary_page(keyword=ctx.keyword)
+    ),
+    "PatientDB.get_summary_row": Case(lambda db, ctx, _: db.get_summary_row(ctx.patient_id)),
+    "PatientDB.get_counts": Case(lambda db, ctx, _: db.get_counts(list(range(1, 101)))),
+
+    # --- DoctorDB ---
+    "DoctorDB.insert": Case(lambda db, ctx, _: db.insert(_unique(ctx, "Dr. Bench"), None)),
+    "DoctorDB.get_all": Case(lambda db, ctx, _: db.get_all()),
+    "DoctorDB.get_page": Case(lambda db, ctx, _: db.get_page()),
+    "DoctorDB.get_page[keyword]": Case(lambda db, ctx, _: db.get_page(keyword="Sharma")),
+    "DoctorDB.get_row": Case(lambda db, ctx, _: db.get_row(ctx.doctor_id)),
+    "DoctorDB.delete": Case(lambda db, ctx, did: db.delete(did),
+                            lambda db, ctx: db.insert(_unique(ctx, "Dr. Bench"), None)),
+    "DoctorDB.update": Case(
+        lambda db, ctx, row: db.update(ctx.doctor_id, *row),
+        lambda db, ctx: _row(ctx, "SELECT name, specialization_id FROM doctors WHERE id = ?",
+                             ctx.doctor_id),
+    ),
+
+    # --- AppointmentDB ---
+    "AppointmentDB.insert": Case(lambda db, ctx, _: _new_appointment(db, ctx)),
+    "AppointmentDB.update": Case(
+        lambda db, ctx, row: db.update(ctx.appointment_id, *row),
+        lambda db, ctx: _row(ctx, "SELECT patient_id, doctor_id, date, time, reason, status_id "
+                                  "FROM appointments WHERE id = ?", ctx.appointment_id),
+    ),
+    "AppointmentDB.delete": Case(lambda db, ctx, aid: db.delete(aid), _new_appointment),
+    "AppointmentDB.get_all": Case(lambda db, ctx, _: db.get_all()),
+    "AppointmentDB.iter_all": Case(lambda db, ctx, _: _drain(db.iter_all())),
+    "AppointmentDB.get_schedule_page": Case(lambda db, ctx, _: db.get_schedule_page()),
+    "AppointmentDB.get_schedule_page[week]": Case(
+        lambda db, ctx, _: db.get_schedule_page(start=ctx.today, end=ctx.week_end)
+    ),
+    "AppointmentDB.get_schedule_page[doctor]": Case(
+        lambda db, ctx, _: db.get_schedule_page(start=ctx.today, end=ctx.week_end,
+                                                doctor_id=ctx.doctor_id)
+    ),
+    "AppointmentDB.count_between": Case(
+        lambda db, ctx, _: db.count_between(ctx.today, ctx.month_end)
+    ),
+    "AppointmentDB.get_page": Case(lambda db, ctx, _: db.get_page()),
+    "AppointmentDB.get_page[keyword]": Case(lambda db, ctx, _: db.get_page(keyword=ctx.keyword)),
+    "AppointmentDB.get_row": Case(lambda db, ctx, _: db.get_row(ctx.appointment_id)),
+    "AppointmentDB.get_by_date": Case(lambda db, ctx, _: db.get_by_date(ctx.today)),
+    "AppointmentDB.get_by_date_with_patient": Case(
+        lambda db, ctx, _: db.get_by_date_with_patient(ctx.today)
+    ),
+    "AppointmentDB.get_by_date_range[month]": Case(
+        lambda db, ctx, _: db.get_by_date_range(ctx.today, ctx.month_end)
+    ),
+    "AppointmentDB.get_by_date_range[doctor,status]": Case(
+        lambda db, ctx, _: db.get_by_date_range(ctx.today, ctx.month_end, ctx.doctor_id, ctx.status_id)
+    ),
+    "AppointmentDB.count_by_day[month]": Case(
+        lambda db, ctx, _: db.count_by_day(ctx.today, ctx.month_end)
+    ),
+    "AppointmentDB.get_all_joined": Case(lambda db, ctx, _: db.get_all_joined()),
+
+    # --- FollowUpDB ---
+    "FollowUpDB.insert": Case(lambda db, ctx, _: _new_followup(db, ctx)),
+    "FollowUpDB.update": Case(
+        lambda db, ctx, row: db.update(ctx.followup_id, *row),
+        lambda db, ctx: _row(ctx, "SELECT patient_id, doctor_id, date, remarks, status_id "
+                                  "FROM followups WHERE id = ?", ctx.followup_id),
+    ),
+    "FollowUpDB.delete": Case(lambda db, ctx, fid: db.delete(fid), _new_followup),
+    "FollowUpDB.get_all": Case(lambda db, ctx, _: db.get_all()),
+    "FollowUpDB.iter_all": Case(lambda db, ctx, _: _drain(db.iter_all())),
+    "FollowUpDB.get_schedule_page": Case(lambda db, ctx, _: db.get_schedule_page()),
+    "FollowUpDB.get_schedule_page[week]": Case(
+        lambda db, ctx, _: db.get_schedule_page(start=ctx.today, end=ctx.week_end)
+    ),
+    "FollowUpDB.count_between": Case(lambda db, ctx, _: db.count_between(ctx.today, ctx.month_end)),
+    "FollowUpDB.get_page": Case(lambda db, ctx, _: db.get_page()),
+    "FollowUpDB.get_page[keyword]": Case(lambda db, ctx, _: db.get_page(keyword=ctx.keyword)),
+    "FollowUpDB.get_row": Case(lambda db, ctx, _: db.get_row(ctx.followup_id)),
+    "FollowUpDB.get_patient_followup_counts": Case(
+        lambda db, ctx, _: db.get_patient_followup_counts()
+    ),
+    "FollowUpDB.get_all_sorted_by_count": Case(lambda db, ctx, _: db.get_all_sorted_by_count()),
+    "FollowUpDB.get_by_status": Case(lambda db, ctx, _: db.get_by_status("Pending")),
+    "FollowUpDB.get_all_joined": Case(lambda db, ctx, _: db.get_all_joined()),
+    "FollowUpDB.get_by_date": Case(lambda db, ctx, _: db.get_by_date(ctx.today)),
+    "FollowUpDB.get_by_date_with_patient": Case(
+        lambda db, ctx, _: db.get_by_date_with_patient(ctx.today)
+    ),
+    "FollowUpDB.get_by_date_range[month]": Case(
+        lambda db, ctx, _: db.get_by_date_range(ctx.today, ctx.month_end)
+    ),
+    "FollowUpDB.get_by_date_range[status]": Case(
+        lambda db, ctx, _: db.get_by_date_range(ctx.today, ctx.month_end, status=ctx.status_id)
+    ),
+    "FollowUpDB.count_by_day[month]": Case(
+        lambda db, ctx, _: db.count_by_day(ctx.today, ctx.month_end)
+    ),
+
+    # --- StatusDB ---
+    "StatusDB.insert": Case(lambda db, ctx, _: db.insert(_unique(ctx, "Bench Status"))),
+    "StatusDB.get_all": Case(lambda db, ctx, _: db.get_all()),
+    "StatusDB.delete": Case(lambda db, ctx, sid: db.delete(sid),
+                            lambda db, ctx: db.insert(_unique(ctx, "Bench Status"))),
+}
+
+
+def public_methods(cls):
+    return [name for name, _ in inspect.getmembers(cls, inspect.isfunction)
+            if not name.startswith("_")]
+
+
+def uncovered():
+    """Public methods of CLASSES without a case, as "Class.method"."""
+    covered = {label.split("[")[0] for label in CASES}
+    return [f"{cls.__name__}.{name}" for cls in CLASSES for name in public_methods(cls)
+            if f"{cls.__name__}.{name}" not in covered]
+
+
+def parse_scale(text):
+    text = text.lower()
+    return SCALES.get(text) or int(text.replace("_", ""))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def context(conn, today=synthetic.DEFAULT_TODAY):
+    """Realistic arguments drawn from the generated data."""
+    def one(sql):
+        return conn.execute(sql).fetchone()
+
+    patient_id, patient_name, phone = one(
+        "SELECT id, name, phone_number FROM patients ORDER BY id LIMIT 1 OFFSET "
+        "(SELECT COUNT(*) / 2 FROM patients)"
+    )
+    return SimpleNamespace(
+        conn=conn,
+        serial=0,
+        today=today.isoformat(),
+        week_end=(today + timedelta(days=6)).isoformat(),
+        month_end=(today + timedelta(days=30)).isoformat(),
+        patient_id=patient_id,
+        patient_name=patient_name,
+        phone=phone,
+        keyword=patient_name.split()[-1],
+        doctor_id=one("SELECT MIN(id) FROM doctors")[0],
+        appointment_id=one("SELECT MAX(id) / 2 FROM appointments")[0],
+        followup_id=one("SELECT MAX(id) / 2 FROM followups")[0],
+        status_id=one("SELECT id FROM statuses WHERE name = 'Pending'")[0],
+    )
+
+
+def measure(case, db, ctx, budget, min_runs, max_runs, memory=True):
+    times = []
+    spent = 0.0
+    while len(times) < max_runs and (spent < budget or len(times) < min_runs):
+        prepared = case.setup(db, ctx) if case.setup else None
+        started = time.perf_counter()
+        case.call(db, ctx, prepared)
+        elapsed = time.perf_counter() - started
+        times.append(elapsed)
+        spent += elapsed
+    result = {
+        "runs": len(times),
+        "p50_ms": round(percentile(times, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(times, 0.95) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "max_ms": round(max(times) * 1000, 3),
+    }
+    if memory:
+        prepared = case.setup(db, ctx) if case.setup else None
+        tracemalloc.start()
+        try:
+            case.call(db, ctx, prepared)
+            result["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def prepare(rows, data_dir, scratch, seed):
+    """Path of a scratch copy of the synthetic database for rows; (path, sizes, seconds)."""
+    sizes = synthetic.scale(rows)
+    cached = os.path.join(data_dir, f"synthetic-{rows}-{seed}.db")
+    seconds = 0.0
+    if not os.path.exists(cached):
+        started = time.perf_counter()
+        synthetic.generate(f"{cached}.part", seed=seed, **sizes)
+        connection.close_connection()
+        os.replace(f"{cached}.part", cached)
+        seconds = time.perf_counter() - started
+    working = os.path.join(scratch, f"bench-{rows}.db")
+    shutil.copyfile(cached, working)
+    return working, sizes, seconds
+
+
+def git_commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=here, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def compare(baseline, results):
+    """Print p50 changes against a baseline results dict; returns the regressions."""
+    regressions = []
+    for scale, current in results["scales"].items():
+        before = baseline.get("scales", {}).get(scale)
+        if not before:
+            continue
+        print(f"\n{int(scale):,} rows vs {baseline['meta'].get('commit') or 'baseline'}")
+        for label, now in current["methods"].items():
+            then = before["methods"].get(label)
+            if not then or "error" in now or "error" in then:
+                continue
+            ratio = now["p50_ms"] / then["p50_ms"] if then["p50_ms"] else 1.0
+            slower = ratio > REGRESSION and now["p50_ms"] - then["p50_ms"] > NOISE_MS
+            flag = "  SLOWER" if slower else ""
+            print(f"  {label:<48} {then['p50_ms']:>10.3f} -> {now['p50_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append((scale, label, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.db_bench",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["10k", "100k"],
+                        help="appointment counts: 10k, 100k, 1m or a number")
+    parser.add_argument("--out", help="results JSON to write (default: db_bench-<commit>.json)")
+    parser.add_argument("--compare", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--only", help="run only cases whose label contains this text")
+    parser.add_argument("--data-dir", help="keep generated databases here and reuse them")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per case (default 1)")
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--max-runs", type=int, default=200)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    args = parser.parse_args(argv)
+
+    missing = uncovered()
+    if missing:
+        print(f"warning: no benchmark case for {', '.join(missing)}", file=sys.stderr)
+    cases = {label: case for label, case in CASES.items() if not args.only or args.only in label}
+    commit, dirty = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "budget_s": args.budget,
+        },
+        "scales": {},
+    }
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = args.data_dir or scratch
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in map(parse_scale, args.scales):
+            path, sizes, generated = prepare(rows, data_dir, scratch, args.seed)
+            connection.configure(path)
+            conn = connection.get_connection()
+            ctx = context(conn)
+            print(f"\n{rows:,} appointments ({', '.join(f'{n:,} {t}' for t, n in sizes.items())})"
+                  + (f", generated in {generated:.1f}s" if generated else ""))
+            print(f"  {'case':<48} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10} {'peak KB':>9}")
+            methods = {}
+            for label, case in cases.items():
+                cls = next(cls for cls in CLASSES if cls.__name__ == label.split(".")[0])
+                try:
+                    result = measure(case, cls(conn), ctx, args.budget, args.min_runs,
+                                     args.max_runs, not args.no_memory)
+                except sqlite3.Error as exc:
+                    methods[label] = {"error": str(exc)}
+                    print(f"  {label:<48} failed: {exc}")
+                    continue
+                methods[label] = result
+                print(f"  {label:<48} {result['runs']:>5} {result['p50_ms']:>10.3f} "
+                      f"{result['p95_ms']:>10.3f} {result.get('peak_kb', float('nan')):>9.1f}")
+            results["scales"][str(rows)] = {"sizes": sizes, "methods": methods}
+            connection.close_connection()
+            os.remove(path)
+
+    out = args.out or f"db_bench-{(commit or 'nogit')[:10]}{'-dirty' if dirty else ''}.json"
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=1)
+    print(f"\nWrote {out}.")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(json.load(fh), results)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""Time the GUI pages offscreen against a large synthetic database.
+
+    python -m benchmarks.gui_bench                      # compare with the stored baseline
+    python -m benchmarks.gui_bench --update-baseline    # store this run as the baseline
+    python -m benchmarks.gui_bench --scale 1m --only Dashboard
+
+For every page this times construction, a full refresh, one search
+keystroke (from the key to the new rows being shown, with the debounce
+delay taken out), a calendar date change on the dashboard and a CRUD
+round-trip: an insert and a delete through the DB layer, including the
+change events every live page handles. Each timing ends with the page
+repainted. The run fails (exit status 1) when a case's p50 is more than
+--tolerance times its baseline and at least --noise-ms slower.
+
+Baselines are machine-specific: regenerate benchmarks/gui_baseline.json
+with --update-baseline on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QDate, QEvent, QThreadPool  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.db_bench import context, git_commit, parse_scale, percentile, prepare  # noqa: E402
+from database import connection  # noqa: E402
+
+BASELINE = Path(__file__).with_name("gui_baseline.json")
+TOLERANCE = 1.5
+NOISE_MS = 2.0
+TODAY = QDate(synthetic.DEFAULT_TODAY.year, synthetic.DEFAULT_TODAY.month,
+              synthetic.DEFAULT_TODAY.day)
+
+
+class Bench:
+    def __init__(self, app, budget, min_runs, max_runs, only=None):
+        self.app = app
+        self.budget = budget
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.only = only
+        self.results = {}
+
+    def settle(self, page):
+        self.app.processEvents()
+        page.repaint()
+
+    def run(self, label, page, action, setup=None):
+        """Time action(prepared) plus a repaint of page; setup() is untimed."""
+        if self.only and self.only not in label:
+            return
+        times = []
+        spent = 0.0
+        while len(times) < self.max_runs and (spent < self.budget or len(times) < self.min_runs):
+            prepared = setup() if setup else None
+            started = time.perf_counter()
+            action(prepared)
+            self.settle(page() if callable(page) else page)
+            elapsed = time.perf_counter() - started
+            times.append(elapsed)
+            spent += elapsed
+        result = self.results[label] = {
+            "runs": len(times),
+            "p50_ms": round(percentile(times, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(times, 0.95) * 1000, 3),
+        }
+        print(f"  {label:<52} {result['runs']:>5} {result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f}")
+
+    def wait_for(self, signal):
+        """Return a function that spins the event loop until signal fires once more."""
+        fired = []
+        signal.connect(lambda *args: fired.append(True))
+
+        def wait():
+            deadline = time.perf_counter() + 30
+            count = len(fired)
+            while len(fired) == count and time.perf_counter() < deadline:
+                self.app.processEvents()
+                time.sleep(0.0005)
+        return wait
+
+
+def destroy(widget):
+    widget.hide()
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def construct(bench, label, cls):
+    """Time building cls (and, for the dashboard, its deferred first load)."""
+    built = []
+
+    def setup():
+        while built:
+            destroy(built.pop())
+
+    def action(_):
+        page = cls()
+        page.show()
+        built.append(page)
+
+    bench.run(f"{label}.construct", lambda: built[-1], action, setup)
+    setup()
+
+
+def search_keystroke(bench, label, page, controller, line_edit, text):
+    """Time one typed character until the page shows the new results."""
+    controller.set_delay(0)
+    wait = bench.wait_for(controller.results_ready)
+    line_edit.setText(text[:-1])
+    wait()
+
+    def setup():
+        line_edit.blockSignals(True)
+        line_edit.setText(text[:-1])
+        line_edit.blockSignals(False)
+
+    def action(_):
+        line_edit.insert(text[-1])
+        wait()
+
+    bench.run(f"{label}.search_keystroke", page, action, setup)
+    line_edit.clear()
+    wait()
+
+
+def bench_pages(bench, ctx):
+    from database.appointment_db import AppointmentDB
+    from database.clinic_db import PatientDB
+    from database.doctor_db import DoctorDB
+    from database.followup_db import FollowUpDB
+    from ui.appointment import AppointmentBooking
+    from ui.dashboard import Dashboard
+    from ui.doctor import DoctorManagement
+    from ui.followup import FollowUpManager
+    from ui.patient import PatientManagement
+    from ui.settings import SettingsWindow
+
+    patients, doctors = PatientDB(), DoctorDB()
+    appointments, followups = AppointmentDB(), FollowUpDB()
+
+    def patient_round_trip(_):
+        patients.delete_patient(patients.insert_patient("Bench Patient", "Female", "30",
+                                                        "9700000000", "Lalitpur"))
+
+    def appointment_round_trip(_):
+        appointments.delete(appointments.insert(ctx.patient_id, ctx.doctor_id, ctx.today,
+                                                "10:00", "Bench", ctx.status_id))
+
+    def followup_round_trip(_):
+        followups.delete(followups.insert(ctx.patient_id, ctx.doctor_id, ctx.today,
+                                          "Bench", ctx.status_id))
+
+    # --- Dashboard ---
+    construct(bench, "Dashboard", Dashboard)
+    page = Dashboard()
+    page.appt_calendar.setSelectedDate(TODAY)
+    page.fup_calendar.setSelectedDate(TODAY)
+    page.show()
+    bench.settle(page)
+    bench.run("Dashboard.refresh_appointments", page, lambda _: page.refresh_appointments())
+    bench.run("Dashboard.refresh_followups_for_date", page,
+              lambda _: page.refresh_followups_for_date())
+    bench.run("Dashboard.refresh_summary", page, lambda _: page.refresh_summary())
+    days = iter(range(1, 10 ** 6))
+    bench.run("Dashboard.appt_calendar_next_day", page,
+              lambda _: page.appt_calendar.setSelectedDate(TODAY.addDays(next(days) % 60)))
+    bench.run("Dashboard.fup_calendar_next_day", page,
+              lambda _: page.fup_calendar.setSelectedDate(TODAY.addDays(next(days) % 60)))
+
+    def read_ahead():
+        # the pause a user makes between days, long enough for the prefetch to run
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            bench.app.processEvents()
+            time.sleep(0.005)
+        QThreadPool.globalInstance().waitForDone()
+
+    for name in ("appt_calendar", "fup_calendar"):
+        calendar = getattr(page, name)
+        bench.run(f"Dashboard.{name}_next_day[after_pause]", page,
+                  lambda _: calendar.setSelectedDate(calendar.selectedDate().addDays(1)), read_ahead)
+    page.appt_calendar.setSelectedDate(TODAY)
+    read_ahead()
+    bench.run("Dashboard.appt_search_keystroke", page,
+              lambda _: page.appt_search_input.setText(ctx.keyword[:3]),
+              lambda: page.appt_search_input.setText(ctx.keyword[:2]))
+    page.appt_search_input.clear()
+    bench.run("Dashboard.appointment_round_trip", page, appointment_round_trip)
+    destroy(page)
+
+    # --- list pages ---
+    for label, cls in [("PatientManagement", PatientManagement), ("DoctorManagement", DoctorManagement),
+                       ("AppointmentBooking", AppointmentBooking), ("FollowUpManager", FollowUpManager)]:
+        construct(bench, label, cls)
+        page = cls()
+        page.show()
+        bench.settle(page)
+        bench.run(f"{label}.refresh_table", page, lambda _: page.refresh_table())
+        if hasattr(page, "search"):
+            search_keystroke(bench, label, page, page.search, page.search_input, ctx.keyword[:3])
+        else:
+            bench.run(f"{label}.search_keystroke", page,
+                      lambda _: page.search_input.setText("Dr"),
+                      lambda: page.search_input.setText("D"))
+            page.search_input.clear()
+        if hasattr(page, "patient_search"):
+            search_keystroke(bench, f"{label}.patient_picker", page, page.patient_search,
+                             page.patient_search_input, ctx.keyword[:3])
+        round_trip = {
+            "PatientManagement": patient_round_trip,
+            "DoctorManagement": lambda _: doctors.delete(doctors.insert("Dr. Bench", None)),
+            "AppointmentBooking": appointment_round_trip,
+            "FollowUpManager": followup_round_trip,
+        }[label]
+        bench.run(f"{label}.round_trip", page, round_trip)
+        destroy(page)
+
+    # --- Settings ---
+    construct(bench, "SettingsWindow", SettingsWindow)
+    page = SettingsWindow()
+    page.show()
+    bench.settle(page)
+    bench.run("SettingsWindow.refresh_spec_table", page, lambda _: page.refresh_spec_table())
+    bench.run("SettingsWindow.refresh_status_table", page, lambda _: page.refresh_status_table())
+    destroy(page)
+
+
+def compare(baseline, results, tolerance, noise_ms):
+    """Print each case against the baseline; returns the regressed labels."""
+    regressions = []
+    print(f"\nvs baseline {baseline['meta'].get('commit') or ''} ({baseline['meta'].get('created')})")
+    for label, now in results["cases"].items():
+        then = baseline["cases"].get(label)
+        if not then:
+            print(f"  {label:<52} (new)")
+            continue
+        ratio = now["p50_ms"] / then["p50_ms"] if then["p50_ms"] else 1.0
+        regressed = ratio > tolerance and now["p50_ms"] - then["p50_ms"] > noise_ms
+        print(f"  {label:<52} {then['p50_ms']:>10.3f} -> {now['p50_ms']:>10.3f} ms  x{ratio:.2f}"
+              + ("  REGRESSED" if regressed else ""))
+        if regressed:
+            regressions.append(label)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.gui_bench",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="100k", help="appointments: 10k, 100k, 1m or a number")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--out", help="also write this run's results as JSON here")
+    parser.add_argument("--only", help="run only cases whose label contains this text")
+    parser.add_argument("--data-dir", help="keep generated databases here and reuse them")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per case (default 1)")
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=100)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--noise-ms", type=float, default=NOISE_MS)
+    args = parser.parse_args(argv)
+
+    rows = parse_scale(args.scale)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    bench = Bench(app, args.budget, args.min_runs, args.max_runs, args.only)
+    commit, dirty = git_commit()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = args.data_dir or scratch
+        os.makedirs(data_dir, exist_ok=True)
+        path, sizes, generated = prepare(rows, data_dir, scratch, args.seed)
+        connection.configure(path)
+        conn = connection.get_connection()
+        ctx = context(conn)
+        print(f"{rows:,} appointments ({', '.join(f'{n:,} {t}' for t, n in sizes.items())})"
+              + (f", generated in {generated:.1f}s" if generated else ""))
+        print(f"  {'case':<52} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10}")
+        bench_pages(bench, ctx)
+        QApplication.closeAllWindows()
+        connection.close_connection()
+
+    results = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+            "seed": args.seed,
+            "platform": os.environ.get("QT_QPA_PLATFORM"),
+        },
+        "cases": bench.results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=1)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=1)
+            fh.write("\n")
+        print(f"\nStored baseline {args.baseline}.")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    if baseline["meta"].get("rows") != rows:
+        print(f"\nBaseline was taken at {baseline['meta'].get('rows'):,} rows, not {rows:,}; "
+              f"not comparing.")
+        return 0
+    regressions = compare(baseline, results, args.tolerance, args.noise_ms)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Show that streaming appointments keeps RSS flat while fetchall() does not.
+
+    python -m benchmarks.stream_memory --rows 1000000
+
+Builds a throwaway database (never touches clinic.db), then walks every
+appointment with AppointmentDB.iter_all, with keyset pages, and finally
+with get_all, sampling resident memory along the way.
+"""
+
+import argparse
+import gc
+import os
+import resource
+import tempfile
+import time
+
+from database import connection
+from database.appointment_db import AppointmentDB
+from database.maintenance import bulk_load
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # no /proc (macOS): fall back to the peak, which is still monotone
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if peak > 2**24 else peak / 2**10
+
+
+def build_database(path, rows):
+    connection.configure(path)
+    conn = connection.get_connection()
+    with bulk_load(conn):
+        conn.executemany(
+            "INSERT INTO patients (name, gender, age, phone_number, address) VALUES (?, ?, ?, ?, ?)",
+            ((f"Patient {i}", "Female", "40", f"98{i:08d}", "Lalitpur") for i in range(1000)),
+        )
+        conn.executemany(
+            "INSERT INTO doctors (name) VALUES (?)", ((f"Dr. {i}",) for i in range(20))
+        )
+        conn.executemany(
+            """INSERT INTO appointments (patient_id, doctor_id, date, time, reason, status_id)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (
+                (i % 1000 + 1, i % 20 + 1, f"20{20 + i % 6}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                 f"{9 + i % 8:02d}:{i % 4 * 15:02d}", "Check up " * 4, i % 3 + 1)
+                for i in range(rows)
+            ),
+        )
+
+
+def walk(label, make_rows, total):
+    gc.collect()
+    start_rss = current_rss_mb()
+    samples = []
+    step = max(total // 10, 1)
+    started = time.perf_counter()
+    count = 0
+    for count, _row in enumerate(make_rows(), 1):
+        if count % step == 0:
+            samples.append(current_rss_mb() - start_rss)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<12} {count:>9} rows  {elapsed:6.2f}s  "
+          f"RSS growth per tenth (MB): {' '.join(f'{s:.0f}' for s in samples)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"building {args.rows} appointments...")
+        build_database(os.path.join(tmp, "bench.db"), args.rows)
+        db = AppointmentDB()
+
+        walk("iter_all", lambda: db.iter_all(args.batch_size), args.rows)
+
+        def keyset_rows():
+            after = None
+            while True:
+                page = db.get_schedule_page(after, args.batch_size)
+                yield from page
+                if len(page) < args.batch_size:
+                    return
+                after = (page[-1][4], page[-1][5], page[-1][0])
+
+        walk("keyset", keyset_rows, args.rows)
+        walk("fetchall", db.get_all, args.rows)
+        connection.close_connection()
+
+
+if __name__ == "__main__":
+    main()
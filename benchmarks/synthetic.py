@@ -0,0 +1,176 @@
+"""Build a deterministic, realistically shaped clinic database for benchmarks.
+
+    python -m benchmarks.synthetic bench.db --appointments 1000000
+    python -m benchmarks.synthetic bench.db --patients 5000 --years 3 --seed 7
+
+The same arguments always produce the same rows. Dates are laid out
+around a fixed "today" (--today, default 2025-07-01) rather than the
+real date, so statuses stay reproducible: past appointments are mostly
+completed, future ones pending, and some past follow-ups are left
+pending (overdue). Patients are skewed so that a minority account for
+most visits; Saturdays are quiet and mornings are busy.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from database import connection
+from database.days import day_number, minute_of_day
+from database.maintenance import bulk_load
+
+DEFAULT_SEED = 20250701
+DEFAULT_TODAY = date(2025, 7, 1)
+
+FEMALE_NAMES = ["Sita", "Gita", "Anita", "Sunita", "Kamala", "Radha", "Sarita", "Pooja", "Asmita",
+                "Sabina", "Laxmi", "Bimala", "Nirmala", "Srijana", "Manisha", "Rita", "Sushila",
+                "Pratima", "Samjhana", "Durga"]
+MALE_NAMES = ["Ram", "Hari", "Krishna", "Shyam", "Bikash", "Suresh", "Ramesh", "Rajesh", "Dipak",
+              "Binod", "Santosh", "Prakash", "Sanjay", "Anil", "Mohan", "Gopal", "Kiran", "Arjun",
+              "Nabin", "Sagar"]
+SURNAMES = ["Shrestha", "Sharma", "Adhikari", "Thapa", "Maharjan", "Tamang", "Gurung", "Karki",
+            "Rai", "Magar", "Poudel", "Khadka", "Bhattarai", "Joshi", "Dahal", "KC", "Basnet",
+            "Bajracharya", "Shakya", "Pandey"]
+PLACES = ["Lalitpur", "Kathmandu", "Bhaktapur", "Kirtipur", "Patan", "Imadol", "Satdobato",
+          "Jawalakhel", "Kupondole", "Sanepa", "Godawari", "Thimi"]
+SPECIALIZATIONS = ["General Medicine", "Pediatrics", "Gynecology", "Orthopedics", "Dermatology",
+                   "ENT", "Cardiology", "Dentistry", "Ophthalmology", "Psychiatry"]
+REASONS = ["Check up", "Fever", "Follow-up visit", "Blood pressure review", "Diabetes review",
+           "Back pain", "Skin rash", "Cough and cold", "Vaccination", "Lab report review",
+           "Joint pain", "Headache", "Antenatal visit", "Dental pain", "Eye check"]
+REMARKS = ["Review lab reports", "Check blood pressure", "Medicine refill", "Dressing change",
+           "Post-op review", "Sugar level review", "X-ray review", "Continue medication",
+           "Physiotherapy progress", "Vaccination due"]
+
+# date.weekday() -> share of a normal day's visits; Saturday (5) is the weekly holiday
+WEEKDAY_WEIGHTS = {6: 1.0, 0: 1.0, 1: 0.95, 2: 0.95, 3: 0.9, 4: 0.8, 5: 0.2}
+TIME_SLOTS = [f"{hour:02d}:{minute:02d}" for hour in range(9, 17) for minute in (0, 15, 30, 45)]
+TIME_WEIGHTS = [3 if slot < "12:00" else 2 if slot < "14:00" else 1 for slot in TIME_SLOTS]
+FOLLOWUP_AFTER_DAYS = [3, 7, 7, 14, 14, 30, 30, 90]
+
+
+def scale(rows):
+    """Table sizes for a benchmark scale given as a number of appointments."""
+    return {
+        "patients": max(rows // 5, 50),
+        "doctors": 30,
+        "appointments": rows,
+        "followups": rows // 4,
+    }
+
+
+def _days(today, years):
+    first = today - timedelta(days=365 * years)
+    days = [first + timedelta(days=n) for n in range((today - first).days + 31)]
+    return [day.isoformat() for day in days], [WEEKDAY_WEIGHTS[day.weekday()] for day in days]
+
+
+def _patient_id(rng, patients):
+    # squaring skews the draw towards low ids: a minority of regular patients
+    return int(patients * rng.random() ** 2) + 1
+
+
+def generate(path, patients, doctors, appointments, followups, years=2, today=DEFAULT_TODAY,
+             seed=DEFAULT_SEED):
+    """Fill a new database at path with the given numbers of rows; returns its connection."""
+    rng = random.Random(seed)
+    connection.configure(path)
+    conn = connection.get_connection()
+    statuses = dict(conn.execute("SELECT name, id FROM statuses"))
+    pending, completed, cancelled = statuses["Pending"], statuses["Completed"], statuses["Cancelled"]
+    days, day_weights = _days(today, years)
+    today = today.isoformat()
+
+    def patient_rows():
+        for n in range(patients):
+            female = rng.random() < 0.55
+            first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+            # 7919 is coprime with 10**8, so every patient gets a distinct number
+            phone = f"98{(n + 1) * 7919 % 10 ** 8:08d}"
+            yield (f"{first} {rng.choice(SURNAMES)}", "Female" if female else "Male",
+                   str(min(int(rng.expovariate(1 / 32)) + 1, 95)), phone,
+                   f"{rng.choice(PLACES)}-{rng.randint(1, 30)}")
+
+    def appointment_rows():
+        dates = rng.choices(days, day_weights, k=appointments)
+        times = rng.choices(TIME_SLOTS, TIME_WEIGHTS, k=appointments)
+        for day, slot in zip(dates, times):
+            roll = rng.random()
+            if day < today:
+                status = completed if roll < 0.75 else cancelled if roll < 0.87 else pending
+            else:
+                status = pending if roll < 0.95 else cancelled
+            yield (_patient_id(rng, patients), rng.randint(1, doctors), day, slot,
+                   rng.choice(REASONS), status, day_number(day), minute_of_day(slot))
+
+    def followup_rows():
+        dates = rng.choices(days, day_weights, k=followups)
+        for visit in dates:
+            day = (date.fromisoformat(visit) + timedelta(days=rng.choice(FOLLOWUP_AFTER_DAYS)))
+            day = day.isoformat()
+            roll = rng.random()
+            if day < today:
+                status = completed if roll < 0.7 else pending if roll < 0.9 else cancelled
+            else:
+                status = pending
+            yield (_patient_id(rng, patients), rng.randint(1, doctors), day,
+                   rng.choice(REMARKS), status, day_number(day))
+
+    with bulk_load(conn):
+        conn.executemany("INSERT OR IGNORE INTO specializations (name) VALUES (?)",
+                         ((name,) for name in SPECIALIZATIONS))
+        specializations = [row[0] for row in conn.execute("SELECT id FROM specializations")]
+        conn.executemany(
+            "INSERT INTO doctors (name, specialization_id) VALUES (?, ?)",
+            ((f"Dr. {rng.choice(FEMALE_NAMES + MALE_NAMES)} {rng.choice(SURNAMES)}",
+              rng.choice(specializations)) for _ in range(doctors)),
+        )
+        conn.executemany(
+            "INSERT INTO patients (name, gender, age, phone_number, address) VALUES (?, ?, ?, ?, ?)",
+            patient_rows(),
+        )
+        conn.executemany(
+            """INSERT INTO appointments (patient_id, doctor_id, date, time, reason, status_id,
+                                         day, minute)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            appointment_rows(),
+        )
+        conn.executemany(
+            """INSERT INTO followups (patient_id, doctor_id, date, remarks, status_id, day)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            followup_rows(),
+        )
+    conn.execute("ANALYZE")
+    return conn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="database to create; must not exist")
+    parser.add_argument("--appointments", type=int, default=10_000)
+    parser.add_argument("--patients", type=int, help="default: appointments / 5")
+    parser.add_argument("--doctors", type=int, help="default: 30")
+    parser.add_argument("--followups", type=int, help="default: appointments / 4")
+    parser.add_argument("--years", type=int, default=2, help="years of history before --today")
+    parser.add_argument("--today", type=date.fromisoformat, default=DEFAULT_TODAY)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.path):
+        parser.error(f"{args.path} already exists")
+    sizes = scale(args.appointments)
+    for name in ("patients", "doctors", "followups"):
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+    started = time.perf_counter()
+    generate(args.path, years=args.years, today=args.today, seed=args.seed, **sizes)
+    connection.close_connection()
+    print(f"Wrote {', '.join(f'{count} {name}' for name, count in sizes.items())} "
+          f"to {args.path} in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
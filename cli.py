@@ -0,0 +1,63 @@
+"""Headless entry point for jobs that need no window (cron, the clinic server).
+
+    python -m cli stats [--date 2025-07-03]
+    python -m cli import appointments visits.csv
+    python -m cli export patients patients.jsonl
+    python -m cli reports list appointments 2025-07-03
+    python -m cli reports schedules --days 3
+    python -m cli backup clinic-backup.db
+    python -m cli maintenance rebuild-counts
+    python -m cli --db /srv/clinic.db stats
+
+Each subcommand is the main() of the module that implements it, imported
+only when that subcommand runs; nothing here imports PyQt6.
+"""
+
+import argparse
+import importlib
+import sys
+
+# name -> (module with main(argv), argv prefix, help)
+COMMANDS = {
+    "stats": ("database.stats_db", [], "headline numbers for a day"),
+    "import": ("database.importer", [], "bulk-load patients, appointments or follow-ups"),
+    "export": ("database.export", [], "write a list to CSV or JSONL"),
+    "reports": (None, [], "print appointment/follow-up lists or doctor schedule packs"),
+    "backup": ("database.maintenance", ["backup"], "copy the live database to a file"),
+    "maintenance": ("database.maintenance", [], "rebuild counters or the search index"),
+}
+
+REPORTS = {
+    "list": ("reports.lists", "one day's (or a range's) appointment or follow-up list"),
+    "schedules": ("reports.schedules", "per-doctor schedule packs, zipped"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cli", description="Clinic jobs that run without the GUI.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(
+            f"  {name:<12} {help}" for name, (_, _, help) in COMMANDS.items()
+        ) + "\n\nRun 'python -m cli <command> --help' for a command's options.",
+    )
+    parser.add_argument("--db", help="path to clinic.db (default: $CLINIC_DB or ./clinic.db)")
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    module, prefix, _ = COMMANDS[args.command]
+    rest = args.args
+    if module is None:
+        if not rest or rest[0] not in REPORTS:
+            parser.exit(2, "usage: python -m cli reports {%s} ...\n" % ",".join(REPORTS)
+                        + "".join(f"  {name:<10} {help}\n" for name, (_, help) in REPORTS.items()))
+        module, _ = REPORTS[rest[0]]
+        rest = rest[1:]
+    # every subcommand's main() takes --db itself
+    db = ["--db", args.db] if args.db else []
+    return importlib.import_module(module).main(db + prefix + rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
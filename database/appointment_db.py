@@ -1,47 +1,50 @@
-import sqlite3
+from database import events
+from database.connection import get_connection
+from database.days import day_number, minute_of_day
+from database.search import fts_query, like_pattern
+from database.streaming import DEFAULT_BATCH_SIZE, iter_rows
 
 
 class AppointmentDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        self.create_table()
-
-    def create_table(self):
-        self.conn.execute("""
-        CREATE TABLE IF NOT EXISTS appointments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            patient_id INTEGER,
-            doctor_id INTEGER,
-            date TEXT NOT NULL,
-            time TEXT NOT NULL,
-            reason TEXT,
-            status_id INTEGER,
-            FOREIGN KEY(patient_id) REFERENCES patients(id) ON DELETE SET NULL,
-            FOREIGN KEY(doctor_id) REFERENCES doctors(id) ON DELETE SET NULL,
-            FOREIGN KEY(status_id) REFERENCES statuses(id) ON DELETE SET NULL
-        )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
 
     def insert(self, patient_id, doctor_id, date, time, reason, status_id):
-        self.conn.execute("""
-            INSERT INTO appointments (patient_id, doctor_id, date, time, reason, status_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (patient_id, doctor_id, date, time, reason, status_id))
+        cursor = self.conn.execute("""
+            INSERT INTO appointments (patient_id, doctor_id, date, time, reason, status_id, day, minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (patient_id, doctor_id, date, time, reason, status_id, day_number(date),
+              minute_of_day(time)))
         self.conn.commit()
+        events.changed(events.APPOINTMENT, events.INSERT, cursor.lastrowid, [date], [patient_id])
+        return cursor.lastrowid
 
     def update(self, appointment_id, patient_id, doctor_id, date, time, reason, status_id):
+        old_date, old_patient = self._date_and_patient(appointment_id)
         self.conn.execute("""
             UPDATE appointments
-            SET patient_id = ?, doctor_id = ?, date = ?, time = ?, reason = ?, status_id = ?
+            SET patient_id = ?, doctor_id = ?, date = ?, time = ?, reason = ?, status_id = ?,
+                day = ?, minute = ?
             WHERE id = ?
-        """, (patient_id, doctor_id, date, time, reason, status_id, appointment_id))
+        """, (patient_id, doctor_id, date, time, reason, status_id, day_number(date),
+              minute_of_day(time), appointment_id))
         self.conn.commit()
+        events.changed(events.APPOINTMENT, events.UPDATE, appointment_id,
+                       [old_date, date], [old_patient, patient_id])
+        return appointment_id
 
     def delete(self, appointment_id):
+        old_date, old_patient = self._date_and_patient(appointment_id)
         self.conn.execute("DELETE FROM appointments WHERE id = ?", (appointment_id,))
         self.conn.commit()
+        events.changed(events.APPOINTMENT, events.DELETE, appointment_id, [old_date], [old_patient])
+        return appointment_id
+
+    def _date_and_patient(self, appointment_id):
+        row = self.conn.execute(
+            "SELECT date, patient_id FROM appointments WHERE id = ?", (appointment_id,)
+        ).fetchone()
+        return row or (None, None)
 
     def get_all(self):
         return self.conn.execute("""
@@ -53,6 +56,113 @@ class AppointmentDB:
             LEFT JOIN statuses s ON a.status_id = s.id
         """).fetchall()
 
+    def iter_all(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Stream the get_all rows in id order without materialising the table."""
+        cursor = self.conn.execute("""
+            SELECT a.id, p.name AS patient, p.phone_number, d.name AS doctor, a.date, a.time,
+                a.reason, s.name AS status
+            FROM appointments a
+            LEFT JOIN patients p ON a.patient_id = p.id
+            LEFT JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN statuses s ON a.status_id = s.id
+            ORDER BY a.id
+        """)
+        return iter_rows(cursor, batch_size)
+
+    def get_schedule_page(self, after=None, limit=200, start=None, end=None, doctor_id=None):
+        """Keyset page of get_all rows in (date, time, id) order.
+
+        after is the (date, time, id) of the last row already seen; start
+        and end optionally bound the dates (inclusive) and doctor_id the
+        doctor. Times that don't parse have a NULL minute and sort first
+        within their day.
+        """
+        conditions, params = [], []
+        if after:
+            day, minute = day_number(after[0]), minute_of_day(after[1])
+            # spelled out rather than (day, minute, id) > (...): a NULL minute
+            # on either side would make that comparison NULL and skip rows
+            if minute is None:
+                conditions.append("a.day >= ? AND (a.day > ? OR a.minute IS NOT NULL OR a.id > ?)")
+                params += [day, day, after[2]]
+            else:
+                conditions.append("a.day >= ? AND (a.day > ? OR (a.minute, a.id) > (?, ?))")
+                params += [day, day, minute, after[2]]
+        elif start:
+            conditions.append("a.day >= ?")
+            params.append(day_number(start))
+        if end:
+            conditions.append("a.day <= ?")
+            params.append(day_number(end))
+        if doctor_id is not None:
+            conditions.append("a.doctor_id = ?")
+            params.append(doctor_id)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.conn.execute(f"""
+            SELECT a.id, p.name AS patient, p.phone_number, d.name AS doctor, a.date, a.time,
+                a.reason, s.name AS status
+            FROM appointments a
+            LEFT JOIN patients p ON a.patient_id = p.id
+            LEFT JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN statuses s ON a.status_id = s.id
+            {where}
+            ORDER BY a.day, a.minute, a.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def count_between(self, start, end, doctor_id=None):
+        days = (day_number(start), day_number(end))
+        if doctor_id is None:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM appointments WHERE day BETWEEN ? AND ?", days
+            ).fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM appointments WHERE doctor_id = ? AND day BETWEEN ? AND ?",
+            (doctor_id, *days)
+        ).fetchone()[0]
+
+    def count_by_day(self, start, end):
+        """(day, status_id, count) rows for start..end; day is a database.days day number."""
+        return self.conn.execute("""
+            SELECT day, status_id, COUNT(*) FROM appointments
+            WHERE day BETWEEN ? AND ?
+            GROUP BY day, status_id
+        """, (day_number(start), day_number(end))).fetchall()
+
+    def get_page(self, after_id=None, limit=200, keyword=""):
+        """One keyset page of get_all (plus patient_id, doctor_id, minute), filtered by keyword."""
+        params = [after_id or 0]
+        where = "a.id > ?"
+        match = fts_query(keyword)
+        if match:
+            # Patient name/phone and reason via FTS; doctors and statuses are tiny
+            # lookup tables. "+" keeps the planner driving from the matched ids.
+            where = """+a.id > ? AND a.id IN (
+                SELECT m.id FROM appointments m WHERE m.patient_id IN (
+                    SELECT rowid FROM patients_fts WHERE patients_fts MATCH ?)
+                UNION SELECT rowid FROM appointments_fts WHERE appointments_fts MATCH ?
+                UNION SELECT m.id FROM appointments m WHERE m.doctor_id IN (
+                    SELECT id FROM doctors WHERE name LIKE ? ESCAPE '\\')
+                UNION SELECT m.id FROM appointments m WHERE m.status_id IN (
+                    SELECT id FROM statuses WHERE name LIKE ? ESCAPE '\\'))"""
+            params += [match, match, like_pattern(keyword), like_pattern(keyword)]
+        return self.conn.execute(f"""
+            SELECT a.id, p.name AS patient, p.phone_number, d.name AS doctor, a.date, a.time,
+                a.reason, s.name AS status, a.patient_id, a.doctor_id, a.minute
+            FROM appointments a
+            LEFT JOIN patients p ON a.patient_id = p.id
+            LEFT JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN statuses s ON a.status_id = s.id
+            WHERE {where}
+            ORDER BY a.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def get_row(self, appointment_id, keyword=""):
+        """The get_page row for one appointment, or None if missing/filtered out."""
+        rows = self.get_page(appointment_id - 1, 1, keyword)
+        return rows[0] if rows and rows[0][0] == appointment_id else None
+
     def get_by_date(self, date_str):
         return self.conn.execute("""
             SELECT a.date,a.time,a.reason,p.name, d.name, s.name
@@ -60,8 +170,36 @@ class AppointmentDB:
             JOIN patients p ON a.patient_id = p.id
             JOIN doctors d ON a.doctor_id = d.id
             LEFT JOIN statuses s ON a.status_id = s.id
-            WHERE a.date = ?
-        """, (date_str,)).fetchall()
+            WHERE a.day = ?
+        """, (day_number(date_str),)).fetchall()
+
+    def get_by_date_with_patient(self, date_str):
+        """Rows for one day with patient id/phone, so callers need no extra lookups."""
+        return self.get_by_date_range(date_str, date_str)
+
+    def get_by_date_range(self, start, end, doctor=None, status=None):
+        """get_by_date_with_patient rows for start..end (inclusive) in schedule order.
+
+        doctor and status optionally narrow the rows to one doctor id and
+        one status id.
+        """
+        conditions, params = ["a.day BETWEEN ? AND ?"], [day_number(start), day_number(end)]
+        if doctor is not None:
+            conditions.append("a.doctor_id = ?")
+            params.append(doctor)
+        if status is not None:
+            conditions.append("a.status_id = ?")
+            params.append(status)
+        return self.conn.execute(f"""
+            SELECT a.id, a.date, a.time, a.reason, a.patient_id, p.name, p.phone_number,
+                a.doctor_id, d.name, s.name
+            FROM appointments a
+            JOIN patients p ON a.patient_id = p.id
+            JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN statuses s ON a.status_id = s.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY a.day, a.minute, a.id
+        """, params).fetchall()
 
     def get_all_joined(self):
         return self.conn.execute("""
@@ -1,34 +1,54 @@
-import sqlite3
+from database import events
+from database.connection import get_connection
+from database.search import fts_query
+from database.streaming import DEFAULT_BATCH_SIZE, iter_rows
 
 class PatientDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.create_table()
-    def create_table(self):
-        self.conn.execute("""
-        CREATE TABLE IF NOT EXISTS patients(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            gender TEXT,
-            age TEXT,
-            phone_number TEXT,
-            address TEXT
-        )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
     def insert_patient(self,name,gender,age,phone_number,address):
-        self.conn.execute("INSERT INTO patients (name,gender,age,phone_number,address) values (?,?,?,?,?)",(name,gender,age,phone_number,address))
+        cursor = self.conn.execute("INSERT INTO patients (name,gender,age,phone_number,address) values (?,?,?,?,?)",(name,gender,age,phone_number,address))
         self.conn.commit()
+        events.changed(events.PATIENT, events.INSERT, cursor.lastrowid)
+        return cursor.lastrowid
     def get_all_patients(self):
         return self.conn.execute("SELECT * FROM patients").fetchall()
     def delete_patient(self,id):
-        self.conn.execute("DELETE FROM patients WHERE id=?",(id,))
-        self.conn.commit()
+        with self.conn:
+            # rows left pointing at the patient change too, without events of their own
+            orphaned = [
+                entity for entity, table in ((events.APPOINTMENT, "appointments"), (events.FOLLOWUP, "followups"))
+                if self.conn.execute(f"SELECT 1 FROM {table} WHERE patient_id=? LIMIT 1", (id,)).fetchone()
+            ]
+            self.conn.execute("DELETE FROM patients WHERE id=?",(id,))
+        events.changed(events.PATIENT, events.DELETE, id)
+        for entity in orphaned:
+            events.changed(entity, events.RELOAD)
+        return id
     def update_patient(self,id,name,gender,age,phone_number,address):
         self.conn.execute("UPDATE patients set name=?,gender=?,age=?,phone_number=?,address=? WHERE id=?",(name,gender,age,phone_number,address,id))
+        self.conn.commit()
+        events.changed(events.PATIENT, events.UPDATE, id)
+        return id
     def get_all(self):
         return self.conn.execute("SELECT id, name,phone_number FROM patients").fetchall()
 
+    def search(self, keyword="", limit=100):
+        """(id, name, phone) for the patient pickers, best FTS matches first."""
+        match = fts_query(keyword)
+        if not match:
+            return self.conn.execute(
+                "SELECT id, name, phone_number FROM patients ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return self.conn.execute("""
+            SELECT p.id, p.name, p.phone_number
+            FROM patients_fts
+            JOIN patients p ON p.id = patients_fts.rowid
+            WHERE patients_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (match, limit)).fetchall()
+
     def get_phone_by_patient_name(self, patient_name):
         cursor = self.conn.execute(
             "SELECT phone_number FROM patients WHERE name = ?",
@@ -41,19 +61,61 @@ class PatientDB:
         return self.conn.execute("""
             SELECT 
                 p.id, p.name, p.gender, p.age, p.phone_number, p.address,
-                IFNULL(appt.total_appointments, 0) as appointments,
-                IFNULL(fup.total_followups, 0) as followups
+                IFNULL(pc.appointments, 0) as appointments,
+                IFNULL(pc.followups, 0) as followups
             FROM patients p
-            LEFT JOIN (
-                SELECT patient_id, COUNT(*) as total_appointments
-                FROM appointments
-                GROUP BY patient_id
-            ) appt ON p.id = appt.patient_id
-            LEFT JOIN (
-                SELECT patient_id, COUNT(*) as total_followups
-                FROM followups
-                GROUP BY patient_id
-            ) fup ON p.id = fup.patient_id
+            LEFT JOIN patient_counts pc ON p.id = pc.patient_id
         """).fetchall()
-    
 
+    def iter_all_with_summary(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Stream get_all_with_summary rows in id order."""
+        cursor = self.conn.execute("""
+            SELECT
+                p.id, p.name, p.gender, p.age, p.phone_number, p.address,
+                IFNULL(pc.appointments, 0) as appointments,
+                IFNULL(pc.followups, 0) as followups
+            FROM patients p
+            LEFT JOIN patient_counts pc ON p.id = pc.patient_id
+            ORDER BY p.id
+        """)
+        return iter_rows(cursor, batch_size)
+
+    def get_summary_page(self, after_id=None, limit=200, keyword=""):
+        """One keyset page of get_all_with_summary, filtered by name/phone/address prefix."""
+        params = [after_id or 0]
+        where = "p.id > ?"
+        match = fts_query(keyword)
+        if match:
+            # "+" keeps the planner driving from the FTS hits, not the id range
+            where = "+p.id > ? AND p.id IN (SELECT rowid FROM patients_fts WHERE patients_fts MATCH ?)"
+            params.append(match)
+        return self.conn.execute(f"""
+            SELECT
+                p.id, p.name, p.gender, p.age, p.phone_number, p.address,
+                IFNULL(pc.appointments, 0) as appointments,
+                IFNULL(pc.followups, 0) as followups
+            FROM patients p
+            LEFT JOIN patient_counts pc ON p.id = pc.patient_id
+            WHERE {where}
+            ORDER BY p.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def get_summary_row(self, patient_id, keyword=""):
+        """The get_summary_page row for one patient, or None if missing/filtered out."""
+        rows = self.get_summary_page(patient_id - 1, 1, keyword)
+        return rows[0] if rows and rows[0][0] == patient_id else None
+
+    def get_counts(self, patient_ids):
+        """{patient_id: (appointments, followups)} from the maintained counters."""
+        patient_ids = list(patient_ids)
+        if not patient_ids:
+            return {}
+        marks = ",".join("?" * len(patient_ids))
+        return {
+            pid: (appointments, followups)
+            for pid, appointments, followups in self.conn.execute(
+                f"SELECT patient_id, appointments, followups FROM patient_counts WHERE patient_id IN ({marks})",
+                patient_ids,
+            )
+        }
@@ -0,0 +1,92 @@
+import atexit
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from database.migrations import migrate, repair_fts_triggers
+from database.tracing import TracedConnection
+
+# database/connection.py
+#
+# One shared connection per process. Every DB class borrows it instead of
+# opening its own, so a whole clinic day runs on a single file handle.
+
+DEFAULT_PATH = os.environ.get("CLINIC_DB", "clinic.db")
+
+BUSY_TIMEOUT = 5.0
+CACHED_STATEMENTS = 256
+CACHE_SIZE_KB = 16000
+MMAP_SIZE = 256 * 1024 * 1024
+
+_path = DEFAULT_PATH
+_conn = None
+_local = threading.local()
+
+
+def configure(path):
+    """Point the shared connection at another database file."""
+    global _path
+    close_connection()
+    _path = path
+
+
+def get_path():
+    return _path
+
+
+def open_connection(path=None, read_only=False):
+    """Open a new tuned connection (for worker threads and processes)."""
+    path = path or _path
+    if read_only:
+        conn = sqlite3.connect(
+            Path(path).resolve().as_uri() + "?mode=ro", uri=True,
+            timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS,
+            check_same_thread=False, factory=TracedConnection,
+        )
+    else:
+        conn = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS,
+            factory=TracedConnection,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def get_connection():
+    """Return the process-wide connection, migrating it on first use."""
+    global _conn
+    if _conn is None:
+        _conn = open_connection()
+        migrate(_conn)
+        repair_fts_triggers(_conn)
+    return _conn
+
+
+def get_read_connection():
+    """Read-only connection owned by the calling (worker) thread."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != _path:
+        conn = _local.conn = open_connection(read_only=True)
+        _local.path = _path
+    return conn
+
+
+def close_connection():
+    global _conn
+    if _conn is None:
+        return
+    try:
+        _conn.execute("PRAGMA optimize")
+        _conn.commit()
+    finally:
+        _conn.close()
+        _conn = None
+
+
+atexit.register(close_connection)
@@ -0,0 +1,110 @@
+# database/day_cache.py
+#
+# LRU cache of one day's rows at a time (e.g. get_by_date_with_patient),
+# so that stepping through a calendar is a dictionary lookup once the
+# days around the current one have been prefetched. The owner passes
+# every ChangeEvent to on_change, before it re-reads anything, and the
+# cache drops the days the write touched.
+#
+# CLINIC_PREFETCH_DAYS sets how many days either side of the shown day
+# are prefetched, CLINIC_DAY_CACHE_SIZE how many days are kept.
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from database import events
+from database.connection import get_connection
+
+PREFETCH_DAYS = int(os.environ.get("CLINIC_PREFETCH_DAYS", 3))
+CACHE_SIZE = int(os.environ.get("CLINIC_DAY_CACHE_SIZE", 32))
+
+
+def around(date_str, days):
+    """date_str's neighbours out to days either side, nearest first."""
+    center = date.fromisoformat(date_str)
+    return [(center + timedelta(days=sign * offset)).isoformat()
+            for offset in range(1, days + 1) for sign in (1, -1)]
+
+
+class DayCache:
+    """date ("yyyy-MM-dd") -> rows from load(conn, date) for one entity.
+
+    patient_column is the index of the patient id in a row when rows carry
+    per-patient counts that a write on another day can change, as the
+    follow-up rows do.
+    """
+
+    def __init__(self, entity, load, size=CACHE_SIZE, patient_column=None):
+        self.entity = entity
+        self.load = load
+        self.size = size
+        self.patient_column = patient_column
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = set()
+        self._generation = 0  # bumped by every eviction, so a prefetch can tell it raced one
+
+    def get(self, date_str, conn=None):
+        """The rows for date_str, from the cache or else read through conn now."""
+        with self._lock:
+            rows = self._rows.get(date_str)
+            if rows is not None:
+                self._rows.move_to_end(date_str)
+                return rows
+            generation = self._generation
+        rows = self.load(conn or get_connection(), date_str)
+        self._store(date_str, rows, generation)
+        return rows
+
+    def missing(self, dates):
+        """The dates that are neither cached nor being prefetched."""
+        with self._lock:
+            return [d for d in dates if d not in self._rows and d not in self._loading]
+
+    def prefetch(self, dates, conn):
+        """Read and cache every missing date in dates; meant for a worker thread."""
+        with self._lock:
+            dates = [d for d in dates if d not in self._rows and d not in self._loading]
+            self._loading.update(dates)
+        try:
+            for date_str in dates:
+                with self._lock:
+                    generation = self._generation
+                self._store(date_str, self.load(conn, date_str), generation)
+        finally:
+            with self._lock:
+                self._loading.difference_update(dates)
+
+    def _store(self, date_str, rows, generation):
+        with self._lock:
+            if generation != self._generation:
+                return  # a write landed while we were reading; these rows may predate it
+            self._rows[date_str] = rows
+            self._rows.move_to_end(date_str)
+            while len(self._rows) > self.size:
+                self._rows.popitem(last=False)
+
+    def evict(self, dates=None):
+        """Forget dates, or every day when dates is None."""
+        with self._lock:
+            self._generation += 1
+            if dates is None:
+                self._rows.clear()
+            for date_str in dates or ():
+                self._rows.pop(date_str, None)
+
+    def on_change(self, event):
+        if event.op == events.RELOAD or event.entity == events.STATUS:
+            self.evict()
+        elif event.entity == self.entity:
+            self.evict(event.dates)
+            if self.patient_column is not None and event.patient_ids:
+                # other days' rows for these patients carry counts that just moved
+                with self._lock:
+                    stale = [d for d, rows in self._rows.items()
+                             if any(row[self.patient_column] in event.patient_ids for row in rows)]
+                self.evict(stale)
+        elif event.entity in (events.PATIENT, events.DOCTOR) and event.op != events.INSERT:
+            self.evict()  # names and phones appear on every day's rows
@@ -0,0 +1,41 @@
+# database/days.py
+#
+# Integer forms of the stored date and time text. Appointments and
+# follow-ups keep "YYYY-MM-DD" / "HH:MM" for display and export, plus
+# day (days since 1970-01-01) and minute (minutes since midnight)
+# columns that range queries and sorting use. These match the SQL
+# expressions in DAY_SQL / MINUTE_SQL used by the backfill migration.
+
+from datetime import date, timedelta
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+# SQL for the same values, with {0} standing for the column
+DAY_SQL = "CAST(julianday({0}) - 2440587.5 AS INTEGER)"
+MINUTE_SQL = ("CASE WHEN instr({0}, ':') > 1 THEN CAST(substr({0}, 1, instr({0}, ':') - 1) AS INTEGER) * 60"
+              " + CAST(substr({0}, instr({0}, ':') + 1, 2) AS INTEGER) END")
+
+
+def day_number(value):
+    """"2025-07-01" (or a date) -> 20270; None for anything unparseable."""
+    if isinstance(value, date):
+        return value.toordinal() - _EPOCH_ORDINAL
+    try:
+        return date.fromisoformat(value).toordinal() - _EPOCH_ORDINAL
+    except (TypeError, ValueError):
+        return None
+
+
+def minute_of_day(value):
+    """"14:05" -> 845; None for anything unparseable."""
+    try:
+        hour, minute = value.split(":")[:2]
+        return int(hour) * 60 + int(minute)
+    except (AttributeError, ValueError):
+        return None
+
+
+def iso_date(day):
+    """20270 -> "2025-07-01"."""
+    return (EPOCH + timedelta(days=day)).isoformat()
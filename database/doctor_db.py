@@ -1,28 +1,19 @@
-import sqlite3
+from database import events
+from database.connection import get_connection
+from database.search import like_pattern
 
 class DoctorDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        self.create_table()
-
-    def create_table(self):
-        self.conn.execute("""
-        CREATE TABLE IF NOT EXISTS doctors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            specialization_id INTEGER,
-            FOREIGN KEY(specialization_id) REFERENCES specializations(id) ON DELETE SET NULL
-        )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
 
     def insert(self, name, specialization_id):
-        self.conn.execute(
+        cursor = self.conn.execute(
             "INSERT INTO doctors (name, specialization_id) VALUES (?, ?)",
             (name, specialization_id)
         )
         self.conn.commit()
+        events.changed(events.DOCTOR, events.INSERT, cursor.lastrowid)
+        return cursor.lastrowid
 
     def get_all(self):
         return self.conn.execute("""
@@ -31,9 +22,37 @@ class DoctorDB:
             LEFT JOIN specializations s ON d.specialization_id = s.id
         """).fetchall()
 
+    def get_page(self, after_id=None, limit=200, keyword=""):
+        params = [after_id or 0]
+        where = "d.id > ?"
+        if keyword:
+            where += " AND (d.name LIKE ? ESCAPE '\\' OR s.name LIKE ? ESCAPE '\\')"
+            params += [like_pattern(keyword)] * 2
+        return self.conn.execute(f"""
+            SELECT d.id, d.name, s.name AS specialization
+            FROM doctors d
+            LEFT JOIN specializations s ON d.specialization_id = s.id
+            WHERE {where}
+            ORDER BY d.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def get_row(self, doctor_id, keyword=""):
+        rows = self.get_page(doctor_id - 1, 1, keyword)
+        return rows[0] if rows and rows[0][0] == doctor_id else None
+
     def delete(self, doctor_id):
-        self.conn.execute("DELETE FROM doctors WHERE id = ?", (doctor_id,))
-        self.conn.commit()
+        with self.conn:
+            # appointments and follow-ups lose the doctor without events of their own
+            orphaned = [
+                entity for entity, table in ((events.APPOINTMENT, "appointments"), (events.FOLLOWUP, "followups"))
+                if self.conn.execute(f"SELECT 1 FROM {table} WHERE doctor_id=? LIMIT 1", (doctor_id,)).fetchone()
+            ]
+            self.conn.execute("DELETE FROM doctors WHERE id = ?", (doctor_id,))
+        events.changed(events.DOCTOR, events.DELETE, doctor_id)
+        for entity in orphaned:
+            events.changed(entity, events.RELOAD)
+        return doctor_id
 
     def update(self, doctor_id, name, specialization_id):
         self.conn.execute(
@@ -41,5 +60,5 @@ class DoctorDB:
             (name, specialization_id, doctor_id)
         )
         self.conn.commit()
-    def get_all(self):
-        return self.conn.execute("SELECT id, name FROM doctors").fetchall()
\ No newline at end of file
+        events.changed(events.DOCTOR, events.UPDATE, doctor_id)
+        return doctor_id
@@ -0,0 +1,82 @@
+# database/events.py
+#
+# In-process change notifications. The DB classes publish a ChangeEvent
+# after every committed write; views and caches subscribe and update only
+# what the event touched. Kept free of Qt so scripts and the CLI can use
+# the DB layer without it -- ui/events.py bridges this onto a Qt signal.
+
+import threading
+from collections import namedtuple
+
+# entities
+PATIENT = "patient"
+DOCTOR = "doctor"
+APPOINTMENT = "appointment"
+FOLLOWUP = "followup"
+SPECIALIZATION = "specialization"
+STATUS = "status"
+
+# operations
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+RELOAD = "reload"  # anything may have changed (bulk import, manual refresh)
+
+# dates: the "yyyy-MM-dd" days the row was on before and after the write.
+# patient_ids: patients whose appointment/follow-up counts may have moved.
+ChangeEvent = namedtuple(
+    "ChangeEvent", ["entity", "op", "id", "dates", "patient_ids"], defaults=(None, (), ())
+)
+
+_subscribers = []
+_versions = {}
+_lock = threading.Lock()
+
+
+def version(entity):
+    """Number of events published so far for entity; caches compare against it."""
+    return _versions.get(entity, 0)
+
+
+def subscribe(callback, *entities, first=False):
+    """Call callback(event) after writes to any of entities (all if none given).
+
+    RELOAD events are delivered to every subscriber. Callbacks run on the
+    publishing thread, in subscription order; first=True puts callback
+    ahead of the others, for caches that views read from while handling
+    the same event. Returns a function that removes the subscription.
+    """
+    entry = (callback, frozenset(entities))
+    with _lock:
+        if first:
+            _subscribers.insert(0, entry)
+        else:
+            _subscribers.append(entry)
+
+    def unsubscribe():
+        with _lock:
+            if entry in _subscribers:
+                _subscribers.remove(entry)
+
+    return unsubscribe
+
+
+def publish(event):
+    with _lock:
+        # bumped before anyone is notified, so a subscriber reading a cache
+        # never sees data older than the event it is handling
+        if event.entity is not None:
+            _versions[event.entity] = _versions.get(event.entity, 0) + 1
+        subscribers = list(_subscribers)
+    for callback, entities in subscribers:
+        if not entities or event.entity in entities or event.op == RELOAD:
+            callback(event)
+
+
+def changed(entity, op, id=None, dates=(), patient_ids=()):
+    """Publish a ChangeEvent, dropping empty and duplicate dates/patient ids."""
+    publish(ChangeEvent(
+        entity, op, id,
+        tuple(sorted({d for d in dates if d})),
+        tuple(sorted({p for p in patient_ids if p is not None})),
+    ))
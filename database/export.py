@@ -0,0 +1,122 @@
+# database/export.py
+#
+# Streams a list page's rows -- with the same search filter the page uses --
+# to CSV or JSONL. Rows are read in keyset pages, so memory stays flat and
+# no read transaction is held open for the whole export. Run as:
+#
+#     python -m database.export appointments visits.csv --search "ram"
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.connection import configure, get_connection
+from database.doctor_db import DoctorDB
+from database.followup_db import FollowUpDB
+from database.streaming import DEFAULT_BATCH_SIZE, iter_pages
+
+_Export = namedtuple("_Export", ["columns", "fetch_page"])
+
+# Column names follow database.importer's field names where they overlap,
+# so an export can be imported again.
+EXPORTS = {
+    "patients": _Export(
+        ["id", "name", "gender", "age", "phone_number", "address", "appointments", "followups"],
+        lambda conn: PatientDB(conn).get_summary_page,
+    ),
+    "doctors": _Export(
+        ["id", "name", "specialization"],
+        lambda conn: DoctorDB(conn).get_page,
+    ),
+    "appointments": _Export(
+        ["id", "patient_name", "patient_phone", "doctor", "date", "time", "reason", "status",
+         "patient_id", "doctor_id"],
+        lambda conn: AppointmentDB(conn).get_page,
+    ),
+    "followups": _Export(
+        ["id", "patient_name", "patient_phone", "doctor", "date", "remarks", "status",
+         "followup_count", "patient_id", "doctor_id"],
+        lambda conn: FollowUpDB(conn).get_page,
+    ),
+}
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def format_for(path, format=None):
+    return format or ("jsonl" if Path(path).suffix.lower() in (".jsonl", ".ndjson") else "csv")
+
+
+def export_rows(entity, path, keyword="", format=None, conn=None, page_size=DEFAULT_BATCH_SIZE,
+                progress=None, is_cancelled=None):
+    """Write entity's rows matching keyword to path; returns the row count.
+
+    The file is written next to path and moved into place only when
+    complete. progress(rows_written) runs after every page; if
+    is_cancelled() turns true the partial file is removed and
+    ExportCancelled raised.
+    """
+    spec = EXPORTS[entity]
+    fetch_page = spec.fetch_page(conn or get_connection())
+    format = format_for(path, format)
+    partial = f"{path}.part"
+    count = 0
+    try:
+        with open(partial, "w", newline="", encoding="utf-8") as fh:
+            # page rows may grow columns only the UI uses; write the declared ones
+            width = len(spec.columns)
+            if format == "csv":
+                writer = csv.writer(fh)
+                writer.writerow(spec.columns)
+
+                def write(rows):
+                    writer.writerows(row[:width] for row in rows)
+            else:
+                def write(rows):
+                    fh.writelines(
+                        json.dumps(dict(zip(spec.columns, row)), ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+            for rows in iter_pages(lambda after, limit: fetch_page(after, limit, keyword),
+                                   page_size=page_size):
+                if is_cancelled and is_cancelled():
+                    raise ExportCancelled()
+                write(rows)
+                count += len(rows)
+                if progress:
+                    progress(count)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.export")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file suffix")
+    parser.add_argument("--search", default="", help="same filter as the page's search box")
+    parser.add_argument("entity", choices=sorted(EXPORTS))
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        configure(args.db)
+    count = export_rows(args.entity, args.path, args.search, args.format,
+                        progress=lambda n: print(f"\r{n} rows", end="", file=sys.stderr))
+    print(file=sys.stderr)
+    print(f"Exported {count} {args.entity} to {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,175 @@
-import sqlite3
+from database import events
+from database.connection import get_connection
+from database.days import day_number
+from database.search import fts_query, like_pattern
+from database.streaming import DEFAULT_BATCH_SIZE, iter_rows
 class FollowUpDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS followups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                patient_id INTEGER,
-                doctor_id INTEGER,
-                date TEXT,
-                remarks TEXT,
-                status_id INTEGER,
-                FOREIGN KEY (patient_id) REFERENCES patients(id),
-                FOREIGN KEY (doctor_id) REFERENCES doctors(id),
-                FOREIGN KEY (status_id) REFERENCES statuses(id)
-            )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
 
     def insert(self, patient_id, doctor_id, date, remarks, status_id):
-        self.conn.execute("""
-            INSERT INTO followups (patient_id, doctor_id, date, remarks, status_id)
-            VALUES (?, ?, ?, ?, ?)
-        """, (patient_id, doctor_id, date, remarks, status_id))
+        cursor = self.conn.execute("""
+            INSERT INTO followups (patient_id, doctor_id, date, remarks, status_id, day)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (patient_id, doctor_id, date, remarks, status_id, day_number(date)))
         self.conn.commit()
+        events.changed(events.FOLLOWUP, events.INSERT, cursor.lastrowid, [date], [patient_id])
+        return cursor.lastrowid
 
     def update(self, id, patient_id, doctor_id, date, remarks, status_id):
+        old_date, old_patient = self._date_and_patient(id)
         self.conn.execute("""
             UPDATE followups
-            SET patient_id=?, doctor_id=?, date=?, remarks=?, status_id=?
+            SET patient_id=?, doctor_id=?, date=?, remarks=?, status_id=?, day=?
             WHERE id=?
-        """, (patient_id, doctor_id, date, remarks, status_id, id))
+        """, (patient_id, doctor_id, date, remarks, status_id, day_number(date), id))
         self.conn.commit()
+        events.changed(events.FOLLOWUP, events.UPDATE, id, [old_date, date], [old_patient, patient_id])
+        return id
 
     def delete(self, id):
+        old_date, old_patient = self._date_and_patient(id)
         self.conn.execute("DELETE FROM followups WHERE id=?", (id,))
         self.conn.commit()
+        events.changed(events.FOLLOWUP, events.DELETE, id, [old_date], [old_patient])
+        return id
+
+    def _date_and_patient(self, id):
+        row = self.conn.execute("SELECT date, patient_id FROM followups WHERE id=?", (id,)).fetchone()
+        return row or (None, None)
 
     def get_all(self):
         return self.conn.execute("""
             SELECT f.id, p.name, p.phone_number, d.name AS doctor_name, f.date,
                    f.remarks, s.name AS status,
-                   (SELECT COUNT(*) FROM followups WHERE patient_id = f.patient_id) AS followup_count
+                   IFNULL(pc.followups, 0) AS followup_count
             FROM followups f
             LEFT JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
             LEFT JOIN doctors d ON f.doctor_id = d.id
             LEFT JOIN statuses s ON f.status_id = s.id
         """).fetchall()
 
 
+    def iter_all(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Stream the get_all rows in id order without materialising the table."""
+        cursor = self.conn.execute("""
+            SELECT f.id, p.name, p.phone_number, d.name AS doctor_name, f.date,
+                   f.remarks, s.name AS status,
+                   IFNULL(pc.followups, 0) AS followup_count
+            FROM followups f
+            LEFT JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN doctors d ON f.doctor_id = d.id
+            LEFT JOIN statuses s ON f.status_id = s.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
+            ORDER BY f.id
+        """)
+        return iter_rows(cursor, batch_size)
+
+    def get_schedule_page(self, after=None, limit=200, start=None, end=None, doctor_id=None):
+        """Keyset page of get_all rows in (date, id) order; after is (date, id).
+
+        start and end optionally bound the dates (inclusive) and doctor_id
+        the doctor.
+        """
+        conditions, params = [], []
+        if after:
+            conditions.append("(f.day, f.id) > (?, ?)")
+            params += [day_number(after[0]), after[1]]
+        elif start:
+            conditions.append("f.day >= ?")
+            params.append(day_number(start))
+        if end:
+            conditions.append("f.day <= ?")
+            params.append(day_number(end))
+        if doctor_id is not None:
+            conditions.append("f.doctor_id = ?")
+            params.append(doctor_id)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.conn.execute(f"""
+            SELECT f.id, p.name, p.phone_number, d.name AS doctor_name, f.date,
+                   f.remarks, s.name AS status,
+                   IFNULL(pc.followups, 0) AS followup_count
+            FROM followups f
+            LEFT JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN doctors d ON f.doctor_id = d.id
+            LEFT JOIN statuses s ON f.status_id = s.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
+            {where}
+            ORDER BY f.day, f.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def count_between(self, start, end, doctor_id=None):
+        days = (day_number(start), day_number(end))
+        if doctor_id is None:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM followups WHERE day BETWEEN ? AND ?", days
+            ).fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM followups WHERE doctor_id = ? AND day BETWEEN ? AND ?",
+            (doctor_id, *days)
+        ).fetchone()[0]
+
+    def count_by_day(self, start, end):
+        """(day, status_id, count) rows for start..end; day is a database.days day number."""
+        return self.conn.execute("""
+            SELECT day, status_id, COUNT(*) FROM followups
+            WHERE day BETWEEN ? AND ?
+            GROUP BY day, status_id
+        """, (day_number(start), day_number(end))).fetchall()
+
+    def get_page(self, after_id=None, limit=200, keyword=""):
+        """One keyset page of get_all (plus patient_id, doctor_id), filtered by keyword."""
+        params = [after_id or 0]
+        where = "f.id > ?"
+        match = fts_query(keyword)
+        if match:
+            # "+" keeps the planner driving from the matched ids, not the id range
+            where = """+f.id > ? AND f.id IN (
+                SELECT m.id FROM followups m WHERE m.patient_id IN (
+                    SELECT rowid FROM patients_fts WHERE patients_fts MATCH ?)
+                UNION SELECT rowid FROM followups_fts WHERE followups_fts MATCH ?
+                UNION SELECT m.id FROM followups m WHERE m.doctor_id IN (
+                    SELECT id FROM doctors WHERE name LIKE ? ESCAPE '\\')
+                UNION SELECT m.id FROM followups m WHERE m.status_id IN (
+                    SELECT id FROM statuses WHERE name LIKE ? ESCAPE '\\'))"""
+            params += [match, match, like_pattern(keyword), like_pattern(keyword)]
+        return self.conn.execute(f"""
+            SELECT f.id, p.name, p.phone_number, d.name AS doctor_name, f.date,
+                   f.remarks, s.name AS status,
+                   IFNULL(pc.followups, 0) AS followup_count,
+                   f.patient_id, f.doctor_id
+            FROM followups f
+            LEFT JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN doctors d ON f.doctor_id = d.id
+            LEFT JOIN statuses s ON f.status_id = s.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
+            WHERE {where}
+            ORDER BY f.id
+            LIMIT ?
+        """, params + [limit]).fetchall()
+
+    def get_row(self, id, keyword=""):
+        """The get_page row for one follow-up, or None if missing/filtered out."""
+        rows = self.get_page(id - 1, 1, keyword)
+        return rows[0] if rows and rows[0][0] == id else None
+
     def get_patient_followup_counts(self):
         return self.conn.execute("""
-            SELECT p.name, COUNT(f.id) as count
+            SELECT p.name, IFNULL(pc.followups, 0) as count
             FROM patients p
-            LEFT JOIN followups f ON p.id = f.patient_id
-            GROUP BY p.id
+            LEFT JOIN patient_counts pc ON p.id = pc.patient_id
         """).fetchall()
 
     def get_all_sorted_by_count(self, descending=True):
         order = "DESC" if descending else "ASC"
         return self.conn.execute(f"""
             SELECT f.id, p.name, f.date, f.remarks, s.name AS status,
-                (SELECT COUNT(*) FROM followups WHERE patient_id = f.patient_id) AS followup_count
+                IFNULL(pc.followups, 0) AS followup_count
             FROM followups f
             LEFT JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
             LEFT JOIN statuses s ON f.status_id = s.id
             ORDER BY followup_count {order}
         """).fetchall()
@@ -81,15 +188,46 @@ class FollowUpDB:
             SELECT f.date, p.name,d.name,f.remarks, s.name
             FROM followups f
             JOIN patients p ON f.patient_id = p.id
+            JOIN doctors d ON f.doctor_id = d.id
             JOIN statuses s ON f.status_id = s.id
         """).fetchall()
 
     def get_by_date(self, date_str):
         return self.conn.execute("""
-            SELECT f.date, p.name,d.name,(SELECT COUNT(*) FROM followups WHERE patient_id = f.patient_id) AS followup_count,f.remarks, s.name
+            SELECT f.date, p.name,d.name,IFNULL(pc.followups, 0) AS followup_count,f.remarks, s.name
+            FROM followups f
+            JOIN patients p ON f.patient_id = p.id
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
+            JOIN doctors d ON f.doctor_id = d.id
+            JOIN statuses s ON f.status_id = s.id
+            WHERE f.day = ?
+        """, (day_number(date_str),)).fetchall()
+
+    def get_by_date_with_patient(self, date_str):
+        """Rows for one day with patient id/phone, so callers need no extra lookups."""
+        return self.get_by_date_range(date_str, date_str)
+
+    def get_by_date_range(self, start, end, doctor=None, status=None):
+        """get_by_date_with_patient rows for start..end (inclusive) in (date, id) order.
+
+        doctor and status optionally narrow the rows to one doctor id and
+        one status id.
+        """
+        conditions, params = ["f.day BETWEEN ? AND ?"], [day_number(start), day_number(end)]
+        if doctor is not None:
+            conditions.append("f.doctor_id = ?")
+            params.append(doctor)
+        if status is not None:
+            conditions.append("f.status_id = ?")
+            params.append(status)
+        return self.conn.execute(f"""
+            SELECT f.id, f.date, f.patient_id, p.name, p.phone_number, f.doctor_id, d.name,
+                IFNULL(pc.followups, 0) AS followup_count, f.remarks, s.name
             FROM followups f
             JOIN patients p ON f.patient_id = p.id
             JOIN doctors d ON f.doctor_id = d.id
             JOIN statuses s ON f.status_id = s.id
-            WHERE f.date = ?
-        """, (date_str,)).fetchall()
+            LEFT JOIN patient_counts pc ON f.patient_id = pc.patient_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY f.day, f.id
+        """, params).fetchall()
@@ -0,0 +1,351 @@
+# database/importer.py
+#
+# Bulk import of patients, appointments and follow-ups from CSV or JSONL,
+# e.g. when moving a clinic over from spreadsheets. Run as:
+#
+#     python -m database.importer appointments visits.csv --rejects bad.csv
+#
+# Rows are validated, their doctor/status/patient references resolved in
+# batches, and inserted with executemany in one transaction per chunk.
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from collections import namedtuple
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+from database import events
+from database.connection import configure, get_connection
+from database.days import day_number, minute_of_day
+
+CHUNK_SIZE = 5000
+LOOKUP_BATCH = 500  # ids per IN (...) query, well under SQLite's parameter limit
+DEFAULT_STATUS = "Pending"
+TIME_RE = re.compile(r"(\d{1,2}):(\d{2})(?::\d{2})?\s*([AaPp][Mm])?")
+GENDERS = {"male": "Male", "female": "Female", "others": "Others", "other": "Others"}
+
+# Alternative column names accepted in input files.
+ALIASES = {
+    "phone": "phone_number",
+    "patient": "patient_name",
+    "doctor_name": "doctor",
+    "status_name": "status",
+}
+
+Rejected = namedtuple("Rejected", ["line", "reason", "record"])
+ImportResult = namedtuple("ImportResult", ["entity", "read", "imported", "rejected", "seconds"])
+
+
+def read_records(path, format=None):
+    """Yield (line, record, error) from a CSV (with header) or JSONL file.
+
+    record is a dict of raw field values; error is a message when the line
+    could not be parsed at all. format defaults from the file suffix.
+    """
+    path = Path(path)
+    format = format or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        if format == "csv":
+            reader = csv.DictReader(fh)
+            for record in reader:
+                yield reader.line_num, record, None
+            return
+        for line, text in enumerate(fh, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                yield line, {"raw": text.rstrip("\n")}, f"invalid JSON: {exc}"
+                continue
+            if isinstance(record, dict):
+                yield line, record, None
+            else:
+                yield line, {"raw": text.rstrip("\n")}, "expected a JSON object"
+
+
+def _clean(record):
+    """Lower-case keys (resolving aliases) and stripped string values, blanks dropped."""
+    cleaned = {}
+    for key, value in record.items():
+        if key is None or value is None:
+            continue
+        key = str(key).strip().lower()
+        value = str(value).strip()
+        if value:
+            cleaned[ALIASES.get(key, key)] = value
+    return cleaned
+
+
+def _required(record, field):
+    if field not in record:
+        raise ValueError(f"missing {field}")
+    return record[field]
+
+
+# strptime is the slowest step of an import by far; these avoid it.
+def _date(record, field="date"):
+    value = _required(record, field)
+    try:
+        if len(value) != 10:
+            raise ValueError
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"bad {field} {value!r}, expected YYYY-MM-DD") from None
+
+
+def _time(record, field="time"):
+    """HH:MM, accepting seconds and 12-hour times such as "9:30 am"."""
+    value = _required(record, field)
+    match = TIME_RE.fullmatch(value)
+    if match:
+        hour, minute, meridiem = int(match[1]), int(match[2]), (match[3] or "").upper()
+        if meridiem and 1 <= hour <= 12:
+            hour = hour % 12 + (12 if meridiem == "PM" else 0)
+        elif meridiem:
+            hour = 99
+        if hour < 24 and minute < 60:
+            return f"{hour:02d}:{minute:02d}"
+    raise ValueError(f"bad {field} {value!r}, expected HH:MM")
+
+
+def _int(value, field):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"bad {field} {value!r}") from None
+
+
+def _batches(values, size=LOOKUP_BATCH):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class References:
+    """Resolves doctor, status and patient references for one import.
+
+    Doctors and statuses are small and read once. Patients are looked up
+    per chunk with a few batched IN (...) queries rather than one query
+    per row.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.doctor_ids, self.doctors = self._lookup("doctors")
+        self.status_ids, self.statuses = self._lookup("statuses")
+        self.patient_ids = set()
+        self.by_phone = {}
+        self.by_name = {}
+
+    def _lookup(self, table):
+        rows = self.conn.execute(f"SELECT id, name FROM {table}").fetchall()
+        by_name = {}
+        for item_id, name in rows:
+            by_name.setdefault(name.casefold(), []).append(item_id)
+        return {item_id for item_id, _ in rows}, by_name
+
+    def _by_name(self, record, id_field, name_field, ids, names, label, default=None):
+        if id_field in record:
+            item_id = _int(record[id_field], id_field)
+            if item_id not in ids:
+                raise ValueError(f"unknown {label} id {item_id}")
+            return item_id
+        name = record.get(name_field, default)
+        if name is None:
+            raise ValueError(f"missing {label}")
+        matches = names.get(name.casefold(), [])
+        if len(matches) != 1:
+            raise ValueError(f"{'ambiguous' if matches else 'unknown'} {label} {name!r}")
+        return matches[0]
+
+    def doctor(self, record, required=True):
+        if not required and "doctor_id" not in record and "doctor" not in record:
+            return None
+        return self._by_name(record, "doctor_id", "doctor", self.doctor_ids, self.doctors, "doctor")
+
+    def status(self, record):
+        return self._by_name(record, "status_id", "status", self.status_ids, self.statuses,
+                             "status", default=DEFAULT_STATUS)
+
+    def load_patients(self, records):
+        """Fetch every patient the chunk refers to, in batches."""
+        self.patient_ids, self.by_phone, self.by_name = set(), {}, {}
+        ids = {r["patient_id"] for r in records if r.get("patient_id", "").isdigit()}
+        phones = {r["patient_phone"] for r in records if "patient_phone" in r}
+        names = {r["patient_name"] for r in records
+                 if "patient_name" in r and "patient_phone" not in r and "patient_id" not in r}
+        for batch in _batches(ids):
+            marks = ",".join("?" * len(batch))
+            self.patient_ids.update(
+                pid for (pid,) in self.conn.execute(f"SELECT id FROM patients WHERE id IN ({marks})", batch)
+            )
+        for field, values, index in (("phone_number", phones, self.by_phone), ("name", names, self.by_name)):
+            for batch in _batches(values):
+                marks = ",".join("?" * len(batch))
+                for pid, name, phone in self.conn.execute(
+                    f"SELECT id, name, phone_number FROM patients WHERE {field} IN ({marks})", batch
+                ):
+                    index.setdefault(phone if field == "phone_number" else name, []).append((pid, name))
+
+    def patient(self, record):
+        if "patient_id" in record:
+            pid = _int(record["patient_id"], "patient_id")
+            if pid not in self.patient_ids:
+                raise ValueError(f"unknown patient id {pid}")
+            return pid
+        name = record.get("patient_name")
+        if "patient_phone" in record:
+            matches = self.by_phone.get(record["patient_phone"], [])
+            if name:
+                matches = [m for m in matches if m[1].casefold() == name.casefold()]
+            label = record["patient_phone"] if not name else f"{name} ({record['patient_phone']})"
+        elif name:
+            matches = self.by_name.get(name, [])
+            label = name
+        else:
+            raise ValueError("missing patient_id, patient_phone or patient_name")
+        if len(matches) != 1:
+            raise ValueError(f"{'ambiguous' if matches else 'unknown'} patient {label!r}")
+        return matches[0][0]
+
+
+def _patient_row(record, refs):
+    gender = record.get("gender", "")
+    if gender and gender.casefold() not in GENDERS:
+        raise ValueError(f"bad gender {gender!r}")
+    age = record.get("age", "")
+    if age and not age.isdigit():
+        raise ValueError(f"bad age {age!r}")
+    return (_required(record, "name"), GENDERS.get(gender.casefold(), ""), age,
+            _required(record, "phone_number"), record.get("address", ""))
+
+
+def _appointment_row(record, refs):
+    date_str, time_str = _date(record), _time(record)
+    return (refs.patient(record), refs.doctor(record), date_str, time_str, record.get("reason", ""),
+            refs.status(record), day_number(date_str), minute_of_day(time_str))
+
+
+def _followup_row(record, refs):
+    date_str = _date(record)
+    return (refs.patient(record), refs.doctor(record, required=False), date_str,
+            record.get("remarks", ""), refs.status(record), day_number(date_str))
+
+
+_Entity = namedtuple("_Entity", ["event", "table", "prepare", "uses_patients", "sql"])
+
+ENTITIES = {
+    "patients": _Entity(
+        events.PATIENT, "patients", _patient_row, False,
+        "INSERT INTO patients (name, gender, age, phone_number, address) VALUES (?, ?, ?, ?, ?)",
+    ),
+    "appointments": _Entity(
+        events.APPOINTMENT, "appointments", _appointment_row, True,
+        """INSERT INTO appointments (patient_id, doctor_id, date, time, reason, status_id, day, minute)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    ),
+    "followups": _Entity(
+        events.FOLLOWUP, "followups", _followup_row, True,
+        """INSERT INTO followups (patient_id, doctor_id, date, remarks, status_id, day)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+    ),
+}
+
+
+def import_records(entity, records, conn=None, chunk_size=CHUNK_SIZE, progress=None, on_reject=None):
+    """Import (line, record, error) triples into entity ("patients", ...).
+
+    Each chunk is validated and inserted in its own transaction, so a
+    failure part way keeps the chunks already committed. progress(read,
+    imported, rejected) is called after every chunk and on_reject(Rejected)
+    for every row that was skipped.
+    """
+    spec = ENTITIES[entity]
+    conn = conn or get_connection()
+    refs = References(conn)
+    read = imported = rejected = 0
+    started = time.perf_counter()
+    records = iter(records)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        cleaned = [(line, _clean(record), record, error) for line, record, error in chunk]
+        if spec.uses_patients:
+            refs.load_patients([record for _, record, _, error in cleaned if not error])
+        rows = []
+        for line, record, raw, error in cleaned:
+            try:
+                if error:
+                    raise ValueError(error)
+                rows.append(spec.prepare(record, refs))
+            except ValueError as exc:
+                rejected += 1
+                if on_reject:
+                    on_reject(Rejected(line, str(exc), raw))
+        with conn:
+            conn.executemany(spec.sql, rows)
+        read += len(chunk)
+        imported += len(rows)
+        if progress:
+            progress(read, imported, rejected)
+
+    if imported:
+        events.changed(spec.event, events.RELOAD)
+    return ImportResult(entity, read, imported, rejected, time.perf_counter() - started)
+
+
+def import_file(entity, path, format=None, **kwargs):
+    """Stream a CSV/JSONL file into entity; see import_records for kwargs."""
+    return import_records(entity, read_records(path, format), **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.importer")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file suffix")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--rejects", help="write rejected rows (line, reason, record) to this CSV")
+    parser.add_argument("entity", choices=sorted(ENTITIES))
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        configure(args.db)
+
+    rejects_file = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    writer = csv.writer(rejects_file) if rejects_file else None
+    if writer:
+        writer.writerow(["line", "reason", "record"])
+
+    def on_reject(rejected):
+        if writer:
+            writer.writerow([rejected.line, rejected.reason, json.dumps(rejected.record)])
+        else:
+            print(f"line {rejected.line}: {rejected.reason}", file=sys.stderr)
+
+    def progress(read, imported, rejected):
+        print(f"\r{read} read, {imported} imported, {rejected} rejected", end="", file=sys.stderr)
+
+    try:
+        result = import_file(args.entity, args.path, args.format, chunk_size=args.chunk_size,
+                             progress=progress, on_reject=on_reject)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    print(file=sys.stderr)
+    rate = result.read / result.seconds if result.seconds else 0
+    print(f"Imported {result.imported} of {result.read} {result.entity} "
+          f"({result.rejected} rejected) in {result.seconds:.1f}s, {rate:.0f} rows/s.")
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from database.connection import configure, get_connection
+from database.migrations import FTS_COLUMNS, REBUILD_PATIENT_COUNTS, fts_statements
+
+# database/maintenance.py
+#
+# One-shot repair jobs and backups. Run as:
+#
+#     python -m database.maintenance rebuild-counts   (or rebuild-search)
+#     python -m database.maintenance backup clinic-2025-07-03.db
+
+
+def rebuild_patient_counts(conn=None):
+    """Recompute patient_counts from the appointments and followups tables."""
+    conn = conn or get_connection()
+    with conn:
+        for statement in REBUILD_PATIENT_COUNTS:
+            conn.execute(statement)
+    return conn.execute("SELECT COUNT(*) FROM patient_counts").fetchone()[0]
+
+
+def rebuild_search_index(conn=None):
+    """Rebuild the external-content FTS tables from their source tables."""
+    conn = conn or get_connection()
+    with conn:
+        for table in FTS_COLUMNS:
+            conn.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+@contextmanager
+def bulk_load(conn=None, tables=tuple(FTS_COLUMNS)):
+    """Insert many rows in one transaction with per-row FTS maintenance suspended.
+
+    Row-by-row FTS inserts get slower as the index grows; indexing all the
+    new rows in one statement at the end is an order of magnitude cheaper.
+    The FTS insert triggers are dropped and recreated inside the same
+    write transaction, so other connections never see them missing (they
+    wait on the write lock instead) and a failure or crash rolls the drop
+    back with everything else. Do not commit, update or delete inside.
+    """
+    conn = conn or get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        last_ids = {
+            table: conn.execute(f"SELECT IFNULL(MAX(id), 0) FROM {table}").fetchone()[0]
+            for table in tables
+        }
+        for table in tables:
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_fts_ins")
+        yield conn
+        for table, last_id in last_ids.items():
+            for statement in fts_statements(table, rebuild=False):
+                conn.execute(statement)
+            cols = ", ".join(FTS_COLUMNS[table])
+            conn.execute(
+                f"INSERT INTO {table}_fts(rowid, {cols}) SELECT id, {cols} FROM {table} WHERE id > ?",
+                (last_id,),
+            )
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def backup(path, conn=None, pages=1024, progress=None):
+    """Copy the live database to path with SQLite's online backup API.
+
+    The copy is consistent even while the clinic keeps writing; it is
+    made next to path and moved into place when complete.
+    progress(remaining, total) runs after every pages pages.
+    """
+    conn = conn or get_connection()
+    partial = f"{path}.part"
+    target = sqlite3.connect(partial)
+    try:
+        with target:
+            conn.backup(target, pages=pages,
+                        progress=progress and (lambda status, remaining, total: progress(remaining, total)))
+        target.close()
+        os.replace(partial, path)
+    except BaseException:
+        target.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.maintenance")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("command", choices=["rebuild-counts", "rebuild-search", "backup"])
+    parser.add_argument("path", nargs="?", help="backup destination")
+    args = parser.parse_args(argv)
+    if args.command == "backup" and not args.path:
+        parser.error("backup needs a destination path")
+
+    if args.db:
+        configure(args.db)
+    if args.command == "rebuild-counts":
+        print(f"Rebuilt counters for {rebuild_patient_counts()} patients.")
+    elif args.command == "rebuild-search":
+        rebuild_search_index()
+        print("Rebuilt search index.")
+    elif args.command == "backup":
+        backup(args.path)
+        print(f"Backed up to {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# database/migrations.py
+#
+# Numbered schema migrations. PRAGMA user_version records the last one
+# applied; everything pending runs in a single transaction at startup.
+
+from database.days import DAY_SQL, MINUTE_SQL
+
+# Recomputes patient_counts from scratch; the triggers keep it exact after.
+REBUILD_PATIENT_COUNTS = [
+    "DELETE FROM patient_counts",
+    """
+    INSERT INTO patient_counts (patient_id, appointments, followups)
+    SELECT p.id, IFNULL(appt.total, 0), IFNULL(fup.total, 0)
+    FROM patients p
+    LEFT JOIN (
+        SELECT patient_id, COUNT(*) AS total FROM appointments GROUP BY patient_id
+    ) appt ON p.id = appt.patient_id
+    LEFT JOIN (
+        SELECT patient_id, COUNT(*) AS total FROM followups GROUP BY patient_id
+    ) fup ON p.id = fup.patient_id
+    """,
+]
+
+# Source table -> columns indexed by its external-content {table}_fts table.
+FTS_COLUMNS = {
+    "patients": ["name", "phone_number", "address"],
+    "appointments": ["reason"],
+    "followups": ["remarks"],
+}
+
+
+def _fts_statements(table, columns):
+    """External-content FTS5 table over table(columns) plus its sync triggers."""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='id', prefix='1 2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_ins AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_del AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_upd AFTER UPDATE OF {cols} ON {table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+MIGRATIONS = [
+    # 1: baseline schema and default statuses
+    [
+        """
+        CREATE TABLE IF NOT EXISTS patients(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            gender TEXT,
+            age TEXT,
+            phone_number TEXT,
+            address TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS specializations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS statuses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS doctors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            specialization_id INTEGER,
+            FOREIGN KEY(specialization_id) REFERENCES specializations(id) ON DELETE SET NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS appointments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_id INTEGER,
+            doctor_id INTEGER,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            reason TEXT,
+            status_id INTEGER,
+            FOREIGN KEY(patient_id) REFERENCES patients(id) ON DELETE SET NULL,
+            FOREIGN KEY(doctor_id) REFERENCES doctors(id) ON DELETE SET NULL,
+            FOREIGN KEY(status_id) REFERENCES statuses(id) ON DELETE SET NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS followups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_id INTEGER,
+            doctor_id INTEGER,
+            date TEXT,
+            remarks TEXT,
+            status_id INTEGER,
+            FOREIGN KEY (patient_id) REFERENCES patients(id),
+            FOREIGN KEY (doctor_id) REFERENCES doctors(id),
+            FOREIGN KEY (status_id) REFERENCES statuses(id)
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO statuses (name)
+        VALUES ('Pending'), ('Completed'), ('Cancelled')
+        """,
+    ],
+    # 2: secondary indexes for the date, status and lookup queries
+    [
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date ON appointments(date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date ON appointments(doctor_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_date ON followups(date)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_patient ON followups(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_status_date ON followups(status_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_phone ON patients(phone_number)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_name ON patients(name)",
+    ],
+    # 3: per-patient appointment/follow-up counters kept exact by triggers
+    [
+        """
+        CREATE TABLE IF NOT EXISTS patient_counts (
+            patient_id INTEGER PRIMARY KEY,
+            appointments INTEGER NOT NULL DEFAULT 0,
+            followups INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_patients_counts_ins AFTER INSERT ON patients
+        BEGIN
+            INSERT OR IGNORE INTO patient_counts (patient_id) VALUES (NEW.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_patients_counts_del AFTER DELETE ON patients
+        BEGIN
+            DELETE FROM patient_counts WHERE patient_id = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_counts_ins AFTER INSERT ON appointments
+        WHEN NEW.patient_id IS NOT NULL
+        BEGIN
+            INSERT INTO patient_counts (patient_id, appointments) VALUES (NEW.patient_id, 1)
+            ON CONFLICT(patient_id) DO UPDATE SET appointments = appointments + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_counts_del AFTER DELETE ON appointments
+        WHEN OLD.patient_id IS NOT NULL
+        BEGIN
+            UPDATE patient_counts SET appointments = appointments - 1
+            WHERE patient_id = OLD.patient_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_counts_upd AFTER UPDATE OF patient_id ON appointments
+        WHEN OLD.patient_id IS NOT NEW.patient_id
+        BEGIN
+            UPDATE patient_counts SET appointments = appointments - 1
+            WHERE patient_id = OLD.patient_id;
+            INSERT INTO patient_counts (patient_id, appointments)
+            SELECT NEW.patient_id, 1 WHERE NEW.patient_id IS NOT NULL
+            ON CONFLICT(patient_id) DO UPDATE SET appointments = appointments + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_followups_counts_ins AFTER INSERT ON followups
+        WHEN NEW.patient_id IS NOT NULL
+        BEGIN
+            INSERT INTO patient_counts (patient_id, followups) VALUES (NEW.patient_id, 1)
+            ON CONFLICT(patient_id) DO UPDATE SET followups = followups + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_followups_counts_del AFTER DELETE ON followups
+        WHEN OLD.patient_id IS NOT NULL
+        BEGIN
+            UPDATE patient_counts SET followups = followups - 1
+            WHERE patient_id = OLD.patient_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_followups_counts_upd AFTER UPDATE OF patient_id ON followups
+        WHEN OLD.patient_id IS NOT NEW.patient_id
+        BEGIN
+            UPDATE patient_counts SET followups = followups - 1
+            WHERE patient_id = OLD.patient_id;
+            INSERT INTO patient_counts (patient_id, followups)
+            SELECT NEW.patient_id, 1 WHERE NEW.patient_id IS NOT NULL
+            ON CONFLICT(patient_id) DO UPDATE SET followups = followups + 1;
+        END
+        """,
+        *REBUILD_PATIENT_COUNTS,
+    ],
+    # 4: trigger-maintained row totals for the dashboard headline numbers
+    [
+        """
+        CREATE TABLE IF NOT EXISTS table_counts (
+            name TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        "INSERT OR REPLACE INTO table_counts VALUES ('patients', (SELECT COUNT(*) FROM patients))",
+        "INSERT OR REPLACE INTO table_counts VALUES ('doctors', (SELECT COUNT(*) FROM doctors))",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_patients_total_ins AFTER INSERT ON patients
+        BEGIN
+            UPDATE table_counts SET total = total + 1 WHERE name = 'patients';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_patients_total_del AFTER DELETE ON patients
+        BEGIN
+            UPDATE table_counts SET total = total - 1 WHERE name = 'patients';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_doctors_total_ins AFTER INSERT ON doctors
+        BEGIN
+            UPDATE table_counts SET total = total + 1 WHERE name = 'doctors';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_doctors_total_del AFTER DELETE ON doctors
+        BEGIN
+            UPDATE table_counts SET total = total - 1 WHERE name = 'doctors';
+        END
+        """,
+    ],
+    # 5: full-text search over patients, appointment reasons and follow-up remarks
+    [
+        "CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status ON appointments(status_id)",
+        *[stmt for table, cols in FTS_COLUMNS.items() for stmt in _fts_statements(table, cols)],
+    ],
+    # 6: (date, time) index so schedule-ordered keyset pages are index walks
+    [
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date_time ON appointments(date, time)",
+        "DROP INDEX IF EXISTS idx_appointments_date",
+    ],
+    # 7: per-doctor follow-up schedules
+    [
+        "CREATE INDEX IF NOT EXISTS idx_followups_doctor_date ON followups(doctor_id, date)",
+    ],
+    # 8: integer day / minute-of-day columns (see database.days) for range scans;
+    # every date query moves to them, so the text date indexes go. The DB
+    # classes and the importer fill them in; the triggers catch any other
+    # writer that only sets the text columns.
+    [
+        "ALTER TABLE appointments ADD COLUMN day INTEGER",
+        "ALTER TABLE appointments ADD COLUMN minute INTEGER",
+        "ALTER TABLE followups ADD COLUMN day INTEGER",
+        f"UPDATE appointments SET day = {DAY_SQL.format('date')}, minute = {MINUTE_SQL.format('time')}",
+        f"UPDATE followups SET day = {DAY_SQL.format('date')}",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_day ON appointments(day, minute)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_day ON appointments(doctor_id, day)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status_day ON appointments(status_id, day)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_day ON followups(day)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_doctor_day ON followups(doctor_id, day)",
+        "CREATE INDEX IF NOT EXISTS idx_followups_status_day ON followups(status_id, day)",
+        "DROP INDEX IF EXISTS idx_appointments_date_time",
+        "DROP INDEX IF EXISTS idx_appointments_doctor_date",
+        "DROP INDEX IF EXISTS idx_followups_date",
+        "DROP INDEX IF EXISTS idx_followups_doctor_date",
+        "DROP INDEX IF EXISTS idx_followups_status_date",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_day_ins AFTER INSERT ON appointments
+        WHEN NEW.day IS NULL OR NEW.minute IS NULL
+        BEGIN
+            UPDATE appointments SET day = {DAY_SQL.format('NEW.date')}, minute = {MINUTE_SQL.format('NEW.time')}
+            WHERE id = NEW.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_day_upd AFTER UPDATE OF date, time ON appointments
+        WHEN (NEW.date IS NOT OLD.date AND NEW.day IS OLD.day)
+            OR (NEW.time IS NOT OLD.time AND NEW.minute IS OLD.minute)
+        BEGIN
+            UPDATE appointments SET day = {DAY_SQL.format('NEW.date')}, minute = {MINUTE_SQL.format('NEW.time')}
+            WHERE id = NEW.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_followups_day_ins AFTER INSERT ON followups
+        WHEN NEW.day IS NULL
+        BEGIN
+            UPDATE followups SET day = {DAY_SQL.format('NEW.date')} WHERE id = NEW.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_followups_day_upd AFTER UPDATE OF date ON followups
+        WHEN NEW.date IS NOT OLD.date AND NEW.day IS OLD.day
+        BEGIN
+            UPDATE followups SET day = {DAY_SQL.format('NEW.date')} WHERE id = NEW.id;
+        END
+        """,
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def fts_statements(table, rebuild=True):
+    """CREATE statements for table's FTS index and triggers, then (optionally) a rebuild."""
+    statements = _fts_statements(table, FTS_COLUMNS[table])
+    return statements if rebuild else statements[:-1]
+
+
+def repair_fts_triggers(conn):
+    """Recreate any missing FTS sync trigger and reindex its table.
+
+    Returns the tables that were repaired. Cheap when nothing is missing:
+    one read of sqlite_master.
+    """
+    if not _missing_fts_triggers(conn):
+        return []
+
+    # DDL doesn't open a transaction by itself; take the write lock so the
+    # drops, creates and rebuilds land together or not at all
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # another process may have repaired them while we waited for the lock
+        broken = _missing_fts_triggers(conn)
+        for table in broken:
+            # rows written while a trigger was missing are not indexed; rebuild
+            for statement in fts_statements(table):
+                conn.execute(statement)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return broken
+
+
+def _missing_fts_triggers(conn):
+    """Tables with at least one FTS sync trigger missing."""
+    present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return [
+        table for table in FTS_COLUMNS
+        if any(f"trg_{table}_fts_{op}" not in present for op in ("ins", "del", "upd"))
+    ]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply every migration newer than the database's user_version."""
+    current = get_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # another process may have migrated while we waited for the lock
+        current = get_version(conn)
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            for statement in MIGRATIONS[version - 1]:
+                conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    conn.execute("ANALYZE")
+    return SCHEMA_VERSION
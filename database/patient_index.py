@@ -0,0 +1,145 @@
+# database/patient_index.py
+#
+# In-memory index of patients for lookups that must not hit the database:
+# by id, by normalized phone number and by name. Loaded on first use and
+# then patched one row at a time from PATIENT events: the event only
+# marks the row stale, and the next lookup re-reads the stale rows on its
+# own thread's read connection.
+
+import re
+import threading
+
+from database import events
+from database.connection import get_path, get_read_connection
+from database.streaming import iter_rows
+
+
+def normalize_phone(phone):
+    """Digits only, so "98-1234 5678" and "9812345678" match."""
+    return re.sub(r"\D", "", phone or "")
+
+
+def normalize_name(name):
+    return " ".join((name or "").split()).casefold()
+
+
+class PatientRecord:
+    __slots__ = ("id", "name", "phone")
+
+    def __init__(self, id, name, phone):
+        self.id = id
+        self.name = name
+        self.phone = phone
+
+    def label(self):
+        """The "Name (phone)" text the patient pickers show."""
+        return f"{self.name} ({self.phone})"
+
+    def __repr__(self):
+        return f"PatientRecord({self.id!r}, {self.name!r}, {self.phone!r})"
+
+
+class PatientIndex:
+    """Patients by id, with secondary maps by normalized phone and by name.
+
+    Names and phone numbers are not unique (families share a phone), so
+    the secondary maps hold lists of ids.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_id = None
+        self._by_phone = {}
+        self._by_name = {}
+        self._stale = set()
+        self._version = None
+        # ahead of the UI bridge, so pages handling the same event find it applied
+        events.subscribe(self._on_change, events.PATIENT, first=True)
+
+    def _current(self):
+        version = (events.version(events.PATIENT), get_path())
+        with self._lock:
+            if self._by_id is None or self._version != version:
+                self._load(version)
+            elif self._stale:
+                self._reread()
+        return self
+
+    def _load(self, version):
+        self._by_id, self._by_phone, self._by_name, self._stale = {}, {}, {}, set()
+        cursor = get_read_connection().execute("SELECT id, name, phone_number FROM patients")
+        for row in iter_rows(cursor):
+            self._add(PatientRecord(*row))
+        self._version = version
+
+    def _reread(self):
+        ids = sorted(self._stale)
+        self._stale = set()
+        marks = ",".join("?" * len(ids))
+        for row in get_read_connection().execute(
+            f"SELECT id, name, phone_number FROM patients WHERE id IN ({marks})", ids
+        ):
+            self._add(PatientRecord(*row))
+
+    def _add(self, record):
+        self._by_id[record.id] = record
+        self._by_phone.setdefault(normalize_phone(record.phone), []).append(record.id)
+        self._by_name.setdefault(normalize_name(record.name), []).append(record.id)
+
+    def _remove(self, patient_id):
+        record = self._by_id.pop(patient_id, None)
+        if record is None:
+            return
+        for index, key in ((self._by_phone, normalize_phone(record.phone)),
+                           (self._by_name, normalize_name(record.name))):
+            ids = index.get(key, [])
+            if patient_id in ids:
+                ids.remove(patient_id)
+            if not ids:
+                index.pop(key, None)
+
+    def _on_change(self, event):
+        with self._lock:
+            if self._by_id is None:
+                return  # not loaded yet; the first lookup reads everything
+            if event.op == events.RELOAD and event.entity not in (None, events.PATIENT):
+                return  # appointment/follow-up reloads leave patients as they were
+            if event.op == events.RELOAD or self._version[1] != get_path():
+                self._by_id = None  # reread everything on the next lookup
+                return
+            self._remove(event.id)
+            if event.op == events.DELETE:
+                self._stale.discard(event.id)
+            else:
+                self._stale.add(event.id)
+            self._version = (events.version(events.PATIENT), get_path())
+
+    def get(self, patient_id):
+        """The PatientRecord for patient_id, or None."""
+        with self._lock:
+            return self._current()._by_id.get(patient_id)
+
+    def by_phone(self, phone):
+        with self._lock:
+            index = self._current()
+            return [index._by_id[pid] for pid in index._by_phone.get(normalize_phone(phone), ())]
+
+    def by_name(self, name):
+        with self._lock:
+            index = self._current()
+            return [index._by_id[pid] for pid in index._by_name.get(normalize_name(name), ())]
+
+    def find(self, name, phone):
+        """The patient with this name and phone, or None if there is not exactly one."""
+        with self._lock:
+            index = self._current()
+            ids = (set(index._by_phone.get(normalize_phone(phone), ()))
+                   & set(index._by_name.get(normalize_name(name), ())))
+            return index._by_id[ids.pop()] if len(ids) == 1 else None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._current()._by_id)
+
+
+patients = PatientIndex()
@@ -0,0 +1,71 @@
+# database/reference.py
+#
+# In-process cache of the small lookup tables (doctors, statuses,
+# specializations). Each table is read once and then served from memory
+# until a write to it is published on database.events; the next access
+# after that reloads it. A manual refresh (RELOAD without an entity)
+# drops them all, since another process may have written to them.
+
+import threading
+
+from database import events
+from database.connection import get_connection, get_path
+
+
+class LookupTable:
+    """(id, name) rows of one lookup table with id->name and name->id maps."""
+
+    def __init__(self, entity, sql):
+        self.entity = entity
+        self.sql = sql
+        self._lock = threading.Lock()
+        self._version = None
+        self._items = ()
+        self._names = {}
+        self._ids = {}
+
+    def _current(self):
+        version = (events.version(self.entity), get_path())
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    items = tuple(get_connection().execute(self.sql).fetchall())
+                    self._names = dict(items)
+                    self._ids = {name: item_id for item_id, name in items}
+                    self._items = items
+                    self._version = version
+        return self
+
+    def items(self):
+        """All (id, name) rows in id order."""
+        return self._current()._items
+
+    def name(self, item_id, default=None):
+        return self._current()._names.get(item_id, default)
+
+    def id(self, name, default=None):
+        return self._current()._ids.get(name, default)
+
+    def invalidate(self):
+        self._version = None
+
+
+doctors = LookupTable(events.DOCTOR, "SELECT id, name FROM doctors ORDER BY id")
+statuses = LookupTable(events.STATUS, "SELECT id, name FROM statuses ORDER BY id")
+specializations = LookupTable(events.SPECIALIZATION, "SELECT id, name FROM specializations ORDER BY id")
+
+TABLES = {table.entity: table for table in (doctors, statuses, specializations)}
+
+
+def invalidate_all():
+    """Forget every cached table (writes made by another process go unseen)."""
+    for table in TABLES.values():
+        table.invalidate()
+
+
+def _on_change(event):
+    if event.op == events.RELOAD and event.entity is None:
+        invalidate_all()
+
+
+events.subscribe(_on_change, *TABLES, first=True)
@@ -0,0 +1,26 @@
+import re
+
+# database/search.py
+
+_TOKEN = re.compile(r"\w+")
+
+
+def fts_query(keyword):
+    """Turn free text typed in a search box into an FTS5 prefix query.
+
+    Every word must match the start of some token ("sar shr" finds
+    "SARASWOTI SHRESTHA"). Returns None when there is nothing to search.
+    """
+    tokens = _TOKEN.findall(keyword or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def like_pattern(keyword):
+    """Substring pattern for keyword, for use with LIKE ? ESCAPE '\\'.
+
+    "%" and "_" typed in a search box are matched literally.
+    """
+    escaped = re.sub(r"([\\%_])", r"\\\1", keyword)
+    return f"%{escaped}%"
@@ -1,60 +1,53 @@
-import sqlite3
+from database import events
+from database.connection import get_connection
 
 # database/db.py
 
 class SpecializationDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.create_table()
-
-    def create_table(self):
-        self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS specializations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
 
     def insert(self, name):
-        self.conn.execute("INSERT OR IGNORE INTO specializations (name) VALUES (?)", (name,))
+        cursor = self.conn.execute("INSERT OR IGNORE INTO specializations (name) VALUES (?)", (name,))
         self.conn.commit()
+        if not cursor.rowcount:
+            return None
+        events.changed(events.SPECIALIZATION, events.INSERT, cursor.lastrowid)
+        return cursor.lastrowid
 
     def get_all(self):
         return self.conn.execute("SELECT * FROM specializations").fetchall()
 
     def delete(self, id):
-        self.conn.execute("DELETE FROM specializations WHERE id=?", (id,))
-        self.conn.commit()
+        with self.conn:
+            orphaned = self.conn.execute(
+                "SELECT 1 FROM doctors WHERE specialization_id=? LIMIT 1", (id,)
+            ).fetchone()
+            self.conn.execute("DELETE FROM specializations WHERE id=?", (id,))
+        events.changed(events.SPECIALIZATION, events.DELETE, id)
+        if orphaned:
+            # ON DELETE SET NULL cleared those doctors' specialization
+            events.changed(events.DOCTOR, events.RELOAD)
+        return id
 
 
 class StatusDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("clinic.db")
-        self.create_table()
-        self.seed_statuses()
-
-    def create_table(self):
-        self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS statuses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        """)
-        self.conn.commit()
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
 
     def insert(self, name):
-        self.conn.execute("INSERT OR IGNORE INTO statuses (name) VALUES (?)", (name,))
+        cursor = self.conn.execute("INSERT OR IGNORE INTO statuses (name) VALUES (?)", (name,))
         self.conn.commit()
-
-    def seed_statuses(self):
-        default_statuses = ["Pending", "Completed", "Cancelled"]
-        for status in default_statuses:
-            self.insert(status)
+        if not cursor.rowcount:
+            return None
+        events.changed(events.STATUS, events.INSERT, cursor.lastrowid)
+        return cursor.lastrowid
 
     def get_all(self):
         return self.conn.execute("SELECT * FROM statuses").fetchall()
 
     def delete(self, id):
-        self.conn.execute("DELETE FROM statuses WHERE id=?", (id,))
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute("DELETE FROM statuses WHERE id=?", (id,))
+        events.changed(events.STATUS, events.DELETE, id)
+        return id
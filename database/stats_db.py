@@ -0,0 +1,80 @@
+import argparse
+from collections import namedtuple
+from datetime import date
+
+from database.connection import configure, get_connection
+from database.days import day_number
+
+# database/stats_db.py
+
+Summary = namedtuple("Summary", [
+    "patients", "doctors", "today_appointments", "today_by_status",
+    "pending_followups", "overdue_followups",
+])
+
+
+class StatsDB:
+    def __init__(self, conn=None):
+        self.conn = conn or get_connection()
+
+    def get_summary(self, today, pending_status="Pending"):
+        """Headline numbers for the dashboard; cost does not grow with table size."""
+        totals = dict(self.conn.execute("SELECT name, total FROM table_counts"))
+
+        today_by_status = {}
+        for status, count in self.conn.execute("""
+            SELECT s.name, COUNT(*)
+            FROM appointments a
+            LEFT JOIN statuses s ON a.status_id = s.id
+            WHERE a.day = ?
+            GROUP BY a.status_id
+        """, (day_number(today),)):
+            today_by_status[status] = count
+
+        # both are range counts on idx_followups_status_day (status_id, day)
+        status_id = self.conn.execute(
+            "SELECT id FROM statuses WHERE name = ?", (pending_status,)
+        ).fetchone()
+        status_id = status_id[0] if status_id else None
+        pending = self.conn.execute(
+            "SELECT COUNT(*) FROM followups WHERE status_id = ?", (status_id,)
+        ).fetchone()[0]
+        overdue = self.conn.execute(
+            "SELECT COUNT(*) FROM followups WHERE status_id = ? AND day < ?",
+            (status_id, day_number(today)),
+        ).fetchone()[0]
+
+        return Summary(
+            patients=totals.get("patients", 0),
+            doctors=totals.get("doctors", 0),
+            today_appointments=sum(today_by_status.values()),
+            today_by_status=today_by_status,
+            pending_followups=pending,
+            overdue_followups=overdue,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.stats_db")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("--date", default=date.today().isoformat(), help="YYYY-MM-DD, default today")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        configure(args.db)
+    summary = StatsDB().get_summary(args.date)
+    lines = [
+        ("Patients", summary.patients),
+        ("Doctors", summary.doctors),
+        (f"Appointments on {args.date}", summary.today_appointments),
+        *((f"  {status or '(no status)'}", count)
+          for status, count in sorted(summary.today_by_status.items(), key=lambda item: str(item[0]))),
+        ("Pending follow-ups", summary.pending_followups),
+        ("Overdue follow-ups", summary.overdue_followups),
+    ]
+    width = max(len(label) for label, _ in lines) + 1
+    for label, value in lines:
+        print(f"{label + ':':<{width}} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# database/streaming.py
+#
+# Helpers for walking large result sets with bounded memory.
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_rows(cursor, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield rows from an executed cursor, batch_size at a time via fetchmany."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def iter_pages(fetch_page, key=lambda row: row[0], page_size=DEFAULT_BATCH_SIZE):
+    """Yield keyset pages from fetch_page(after_key, limit) until it runs dry.
+
+    Unlike iter_rows this does not hold a read transaction open between
+    pages, so it is the one to use for long-running exports and reports.
+    """
+    after = None
+    while True:
+        rows = fetch_page(after, page_size)
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        after = key(rows[-1])
@@ -0,0 +1,247 @@
+# database/tracing.py
+#
+# Opt-in query tracing. Every connection opened by database.connection is
+# a TracedConnection; while tracing is enabled (CLINIC_TRACE=1, or from
+# Settings > Diagnostics) each statement is recorded with the DB method
+# that issued it, its normalised SQL, row count and wall time. Statements
+# slower than the threshold are kept, with their EXPLAIN QUERY PLAN, for
+# the Diagnostics panel, and appended to a JSON-lines slow-query log when
+# CLINIC_SLOW_LOG names one.
+#
+# Row counts and times cover execute() and the fetchone/fetchmany/fetchall
+# calls on its cursor; rows read by iterating a cursor directly are not
+# counted. When tracing is off a statement costs one extra Python call.
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+enabled = os.environ.get("CLINIC_TRACE", "") not in ("", "0")
+slow_ms = float(os.environ.get("CLINIC_SLOW_MS", 100))
+SLOW_LOG = os.environ.get("CLINIC_SLOW_LOG")  # None: slow queries stay in memory
+
+WINDOW = 10000  # samples kept for summary() and histogram()
+SLOW_KEPT = 100  # slow queries kept in memory for the Diagnostics panel
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+Sample = namedtuple("Sample", ["method", "fingerprint", "ms", "rows"])
+SlowQuery = namedtuple("SlowQuery", ["at", "method", "fingerprint", "params", "ms", "rows", "plan"])
+QueryStats = namedtuple("QueryStats", ["method", "fingerprint", "calls", "total_ms", "p50_ms",
+                                       "p95_ms", "max_ms", "rows"])
+
+_samples = deque(maxlen=WINDOW)
+_slow = deque(maxlen=SLOW_KEPT)
+_log_lock = threading.Lock()
+_fingerprints = {}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+_PLACEHOLDERS = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def set_threshold(ms):
+    global slow_ms
+    slow_ms = ms
+
+
+def reset():
+    _samples.clear()
+    _slow.clear()
+
+
+def fingerprint(sql):
+    """sql with literals replaced by ? and whitespace collapsed, so that
+    statements differing only in their values group together."""
+    result = _fingerprints.get(sql)
+    if result is None:
+        result = _STRING.sub("?", sql)
+        result = _NUMBER.sub("?", result)
+        result = _SPACE.sub(" ", result).strip()
+        result = _PLACEHOLDERS.sub("?, ...", result)
+        if len(_fingerprints) > 2048:
+            _fingerprints.clear()
+        _fingerprints[sql] = result
+    return result
+
+
+def params_shape(params):
+    """Type names of params, e.g. "(int, str)"; values never leave the process."""
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+
+def _caller():
+    """Qualified name of the function that called into the connection."""
+    frame = sys._getframe(2)
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    if "." not in name:
+        name = f"{frame.f_globals.get('__name__', '?').rsplit('.', 1)[-1]}.{name}"
+    return name
+
+
+class _Trace:
+    __slots__ = ("conn", "method", "sql", "params", "seconds", "rows")
+
+    def __init__(self, conn, method, sql, params):
+        self.conn = conn
+        self.method = method
+        self.sql = sql
+        self.params = params
+        self.seconds = 0.0
+        self.rows = 0
+
+    def finish(self):
+        ms = self.seconds * 1000
+        sample = Sample(self.method, fingerprint(self.sql), ms, self.rows)
+        _samples.append(sample)
+        if ms >= slow_ms:
+            _log_slow(self.conn, sample, self.sql, self.params)
+
+
+def _log_slow(conn, sample, sql, params):
+    try:
+        plan = [row[3] for row in sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params)]
+    except sqlite3.Error as exc:
+        plan = [f"(no plan: {exc})"]
+    slow = SlowQuery(datetime.now().isoformat(timespec="seconds"), sample.method, sample.fingerprint,
+                     params_shape(params), round(sample.ms, 2), sample.rows, plan)
+    _slow.append(slow)
+    if not SLOW_LOG:
+        return
+    with _log_lock:
+        try:
+            with open(SLOW_LOG, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(slow._asdict()) + "\n")
+        except OSError:
+            pass  # tracing must never break the query it observes
+
+
+class TracedCursor(sqlite3.Cursor):
+    _trace = None
+
+    def _timed(self, fetch, *args):
+        trace = self._trace
+        if trace is None:
+            return fetch(self, *args)
+        start = time.perf_counter()
+        result = fetch(self, *args)
+        trace.seconds += time.perf_counter() - start
+        return result
+
+    def fetchone(self):
+        row = self._timed(sqlite3.Cursor.fetchone)
+        if self._trace is not None:
+            self._trace.rows += row is not None
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(sqlite3.Cursor.fetchmany, size)
+        if self._trace is not None:
+            self._trace.rows += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(sqlite3.Cursor.fetchall)
+        if self._trace is not None:
+            self._trace.rows += len(rows)
+            self._finish()
+        return rows
+
+    def _finish(self):
+        trace, self._trace = self._trace, None
+        if trace is not None:
+            trace.finish()
+
+    def __del__(self):
+        self._finish()
+
+
+class TracedConnection(sqlite3.Connection):
+    """sqlite3 connection factory that records statements while tracing is enabled."""
+
+    def execute(self, sql, parameters=()):
+        if not enabled:
+            return sqlite3.Connection.execute(self, sql, parameters)
+        trace = _Trace(self, _caller(), sql, parameters)
+        cursor = self.cursor(TracedCursor)
+        start = time.perf_counter()
+        try:
+            cursor.execute(sql, parameters)
+        finally:
+            trace.seconds = time.perf_counter() - start
+        if cursor.description is None:
+            # not a query: nothing to fetch, the statement is complete
+            trace.rows = max(cursor.rowcount, 0)
+            trace.finish()
+        else:
+            cursor._trace = trace
+        return cursor
+
+    def executemany(self, sql, seq_of_parameters):
+        if not enabled:
+            return sqlite3.Connection.executemany(self, sql, seq_of_parameters)
+        trace = _Trace(self, _caller(), sql, ())
+        start = time.perf_counter()
+        try:
+            cursor = sqlite3.Connection.executemany(self, sql, seq_of_parameters)
+        finally:
+            trace.seconds = time.perf_counter() - start
+        trace.rows = max(cursor.rowcount, 0)
+        # the plan does not depend on the values, so a slow batch is explained with NULLs
+        trace.params = (None,) * sql.count("?")
+        trace.finish()
+        return cursor
+
+
+def _percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def summary():
+    """QueryStats per (method, fingerprint) over the recent window, slowest total first."""
+    groups = {}
+    for sample in list(_samples):
+        groups.setdefault((sample.method, sample.fingerprint), []).append(sample)
+    stats = []
+    for (method, fp), samples in groups.items():
+        times = sorted(sample.ms for sample in samples)
+        stats.append(QueryStats(
+            method, fp, len(samples), sum(times), _percentile(times, 0.5), _percentile(times, 0.95),
+            times[-1], sum(sample.rows for sample in samples) / len(samples),
+        ))
+    stats.sort(key=lambda stat: stat.total_ms, reverse=True)
+    return stats
+
+
+def histogram():
+    """[(upper bound in ms or None for the overflow bucket, count)] over the recent window."""
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for sample in list(_samples):
+        index = 0
+        while index < len(BUCKETS_MS) and sample.ms > BUCKETS_MS[index]:
+            index += 1
+        counts[index] += 1
+    return list(zip(BUCKETS_MS + (None,), counts))
+
+
+def slow_queries():
+    """The most recent slow queries, newest first."""
+    return list(reversed(_slow))
@@ -0,0 +1,118 @@
+# reports/lists.py
+#
+# The daily (or date-range) appointment and follow-up lists as PDF. Rows
+# are streamed from the database in keyset pages. Run as:
+#
+#     python -m reports.lists appointments 2025-07-03
+#     python -m reports.lists followups 2025-07-01 --to 2025-07-31 -o july.pdf
+
+import argparse
+import sys
+from collections import namedtuple
+
+from database.appointment_db import AppointmentDB
+from database.connection import configure, get_connection
+from database.followup_db import FollowUpDB
+from database.streaming import iter_pages
+from reports.pdf import CLINIC_NAME, Column, Section, render_sections
+
+PAGE_SIZE = 500
+
+
+def format_time(value):
+    """"14:05" -> "02:05 PM", as the appointment page shows it."""
+    try:
+        hour, minute = (int(part) for part in (value or "").split(":")[:2])
+    except ValueError:
+        return value
+    return f"{hour % 12 or 12:02d}:{minute:02d} {'PM' if hour >= 12 else 'AM'}"
+
+
+_List = namedtuple("_List", ["title", "pages", "key", "count", "day", "range"])
+_Layout = namedtuple("_Layout", ["columns", "row"])
+
+LISTS = {
+    # get_schedule_page rows: id, patient, phone, doctor, date, time, reason, status
+    "appointments": _List(
+        "Appointments",
+        lambda conn: AppointmentDB(conn).get_schedule_page,
+        lambda row: (row[4], row[5], row[0]),
+        lambda conn: AppointmentDB(conn).count_between,
+        _Layout(
+            [Column("Time", 20), Column("Patient", 45), Column("Phone", 28), Column("Doctor", 38),
+             Column("Reason", 37), Column("Status", 22)],
+            lambda row: (format_time(row[5]), row[1], row[2], row[3], row[6], row[7]),
+        ),
+        _Layout(
+            [Column("Date", 22), Column("Time", 20), Column("Patient", 42), Column("Phone", 26),
+             Column("Doctor", 32), Column("Reason", 26), Column("Status", 22)],
+            lambda row: (row[4], format_time(row[5]), row[1], row[2], row[3], row[6], row[7]),
+        ),
+    ),
+    # get_schedule_page rows: id, patient, phone, doctor, date, remarks, status, followup_count
+    "followups": _List(
+        "Follow-Ups",
+        lambda conn: FollowUpDB(conn).get_schedule_page,
+        lambda row: (row[4], row[0]),
+        lambda conn: FollowUpDB(conn).count_between,
+        _Layout(
+            [Column("ID", 14), Column("Patient", 42), Column("Phone", 28), Column("Doctor", 34),
+             Column("Remarks", 34), Column("Status", 22), Column("Count", 16, "R")],
+            lambda row: (row[0], row[1], row[2], row[3], row[5], row[6], row[7]),
+        ),
+        _Layout(
+            [Column("Date", 22), Column("Patient", 40), Column("Phone", 26), Column("Doctor", 30),
+             Column("Remarks", 34), Column("Status", 22), Column("Count", 16, "R")],
+            lambda row: (row[4], row[1], row[2], row[3], row[5], row[6], row[7]),
+        ),
+    ),
+}
+
+
+def list_section(kind, conn, start, end=None, doctor_id=None, title=None):
+    """A reports.pdf.Section for the kind list over start..end (inclusive).
+
+    A single day leaves out the date column.
+    """
+    spec = LISTS[kind]
+    end = end or start
+    layout = spec.day if start == end else spec.range
+    fetch_page = spec.pages(conn)
+    batches = (
+        [layout.row(row) for row in rows]
+        for rows in iter_pages(lambda after, limit: fetch_page(after, limit, start, end, doctor_id),
+                               key=spec.key, page_size=PAGE_SIZE)
+    )
+    if title is None:
+        title = f"{spec.title} - {start}" if start == end else f"{spec.title} - {start} to {end}"
+    return Section(title, layout.columns, batches, spec.count(conn)(start, end, doctor_id))
+
+
+def render_list(kind, path, start, end=None, conn=None, progress=None, is_cancelled=None):
+    """Write the appointment or follow-up list for start..end to path; returns the row count."""
+    section = list_section(kind, conn or get_connection(), start, end)
+    return render_sections(path, [section], CLINIC_NAME, progress, is_cancelled)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reports.lists")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("kind", choices=sorted(LISTS))
+    parser.add_argument("start", help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="last day of a date range (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", help="default: <kind>-<dates>.pdf")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        configure(args.db)
+    path = args.output or f"{args.kind}-{args.start}{'_' + args.end if args.end else ''}.pdf"
+    count = render_list(
+        args.kind, path, args.start, args.end,
+        progress=lambda done, total: print(f"\r{done}/{total} rows", end="", file=sys.stderr),
+    )
+    print(file=sys.stderr)
+    print(f"Wrote {count} {args.kind} to {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# reports/pdf.py
+#
+# Shared layout for the printable lists: A4 portrait, a title block and a
+# bordered table whose header row repeats on every page -- the layout of
+# the hand-made samples (followup_1.pdf, july-03.pdf). Built on fpdf 1.7.2.
+
+import os
+import tempfile
+import zlib
+from collections import namedtuple
+from datetime import date
+
+from fpdf import FPDF
+
+CLINIC_NAME = "Subhekta Polyclinic Pvt. Ltd."
+FONT = "Arial"
+# A TrueType font with Devanagari/other glyphs; without one, text outside
+# Latin-1 is printed as "?" by the built-in Arial.
+UNICODE_FONT = os.environ.get("CLINIC_REPORT_FONT")
+FONT_SIZE = 10
+ROW_HEIGHT = 8
+MARGIN = 10
+FOOTER_HEIGHT = 12
+
+Column = namedtuple("Column", ["title", "width", "align"], defaults=("L",))
+# batches is an iterable of row lists; total (if known) feeds the progress
+Section = namedtuple("Section", ["title", "columns", "batches", "total", "empty"],
+                     defaults=(None, "No records."))
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+class _FileBuffer:
+    """Stand-in for FPDF.buffer that writes straight to a file.
+
+    fpdf 1.7.2 builds the whole document in a str with `+=`, which both
+    holds it in memory and gets quadratically slower; it only ever appends
+    to it and asks for its length (for the xref offsets).
+    """
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.length = 0
+
+    def __iadd__(self, text):
+        data = text.encode("latin1")
+        self.fh.write(data)
+        self.length += len(data)
+        return self
+
+    def __len__(self):
+        return self.length
+
+
+class TableReport(FPDF):
+    """A one-table PDF that is written out page by page.
+
+    Each finished page is compressed and spooled to a temporary file, and
+    the document itself is written directly to disk, so memory does not
+    grow with the number of pages. That rules out the {nb} total-pages
+    alias, which fpdf substitutes at the very end.
+    """
+
+    def __init__(self, title, columns, subtitle=""):
+        super().__init__("P", "mm", "A4")
+        self.report_title = title
+        self.subtitle = subtitle
+        self.columns = columns
+        self.set_margins(MARGIN, MARGIN, MARGIN)
+        self.set_auto_page_break(False)  # rows are paginated by add_row()
+        self.set_compression(True)
+        self.font_family_name = FONT
+        if UNICODE_FONT:
+            self.add_font("Report", "", UNICODE_FONT, uni=True)
+            self.add_font("Report", "B", UNICODE_FONT, uni=True)
+            self.font_family_name = "Report"
+        self._spool = tempfile.TemporaryFile()
+        self._spooled = {}
+        self.rows_on_page = 0
+        # title (8) + subtitle (6) + gap (4) + header row
+        self.table_top = MARGIN + 18 + ROW_HEIGHT
+        self.rows_per_page = int((self.h - self.table_top - FOOTER_HEIGHT) // ROW_HEIGHT)
+
+    # --- page furniture ---
+    def header(self):
+        self.set_font(self.font_family_name, "B", 14)
+        self.cell(0, 8, self.text(self.report_title), 0, 1, "L")
+        self.set_font(self.font_family_name, "", 9)
+        self.cell(0, 6, self.text(self.subtitle), 0, 1, "L")
+        self.ln(4)
+        self.set_font(self.font_family_name, "B", FONT_SIZE)
+        self.set_fill_color(230, 230, 230)
+        for column in self.columns:
+            self.cell(column.width, ROW_HEIGHT, self.text(column.title), 1, 0, "L", True)
+        self.ln()
+        self.set_font(self.font_family_name, "", FONT_SIZE)
+        self.rows_on_page = 0
+
+    def footer(self):
+        self.set_y(-FOOTER_HEIGHT + 2)
+        self.set_font(self.font_family_name, "", 8)
+        self.cell(0, 6, f"{CLINIC_NAME}  -  printed {date.today().isoformat()}", 0, 0, "L")
+        self.set_x(MARGIN)
+        self.cell(0, 6, f"Page {self.page_no()}", 0, 0, "R")
+
+    # --- table ---
+    def text(self, value):
+        value = "" if value is None else str(value)
+        if self.font_family_name == FONT:
+            value = value.encode("latin-1", "replace").decode("latin-1")
+        return value
+
+    def fit(self, value, width):
+        """Cut value with "..." so it fits in a cell of width mm."""
+        value = self.text(value)
+        room = width - 2 * self.c_margin
+        if self.get_string_width(value) <= room:
+            return value
+        while value and self.get_string_width(value + "...") > room:
+            value = value[:-1]
+        return value + "..."
+
+    def start_table(self, title, columns):
+        """Begin another table, with its own title and header, on a new page."""
+        self.report_title = title
+        self.columns = columns
+        self.add_page()
+
+    def add_row(self, values):
+        if self.page == 0 or self.rows_on_page >= self.rows_per_page:
+            self.add_page()
+        for column, value in zip(self.columns, values):
+            self.cell(column.width, ROW_HEIGHT, self.fit(value, column.width), 1, 0, column.align)
+        self.ln()
+        self.rows_on_page += 1
+
+    def add_note(self, text):
+        if self.page == 0:
+            self.add_page()
+        self.cell(0, ROW_HEIGHT, self.text(text), 0, 1, "L")
+
+    # --- bounded-memory output (fpdf 1.7.2 internals) ---
+    def _endpage(self):
+        super()._endpage()
+        data = zlib.compress(self.pages[self.page].encode("latin1"))
+        self._spooled[self.page] = (self._spool.tell(), len(data))
+        self._spool.write(data)
+        self.pages[self.page] = ""
+
+    def _putpages(self):
+        for n in range(1, self.page + 1):
+            self._newobj()
+            self._out("<</Type /Page")
+            self._out("/Parent 1 0 R")
+            self._out("/Resources 2 0 R")
+            self._out(f"/Contents {self.n + 1} 0 R>>")
+            self._out("endobj")
+            offset, length = self._spooled[n]
+            self._spool.seek(offset)
+            data = self._spool.read(length)
+            self._newobj()
+            self._out(f"<</Filter /FlateDecode /Length {length}>>")
+            self._putstream(data)
+            self._out("endobj")
+        self.offsets[1] = len(self.buffer)
+        self._out("1 0 obj")
+        self._out("<</Type /Pages")
+        self._out("/Kids [" + "".join(f"{3 + 2 * i} 0 R " for i in range(self.page)) + "]")
+        self._out(f"/Count {self.page}")
+        self._out("/MediaBox [0 0 %.2f %.2f]" % (self.fw_pt, self.fh_pt))
+        self._out(">>")
+        self._out("endobj")
+
+    def save(self, path):
+        """Finish the document and write it to path (atomically)."""
+        partial = f"{path}.part"
+        try:
+            with open(partial, "wb") as fh:
+                self.buffer = _FileBuffer(fh)
+                self.close()
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        finally:
+            self._spool.close()
+
+
+def render_table(path, title, columns, batches, total=None, subtitle="", empty="No records.",
+                 progress=None, is_cancelled=None):
+    """Write batches (an iterable of row lists) as a table report to path.
+
+    progress(done, total) runs after every batch; when is_cancelled()
+    turns true nothing is written and ReportCancelled is raised.
+    Returns the number of rows written.
+    """
+    return render_sections(path, [Section(title, columns, batches, total, empty)], subtitle,
+                           progress, is_cancelled)
+
+
+def render_sections(path, sections, subtitle="", progress=None, is_cancelled=None):
+    """Like render_table, with each Section as its own table starting on a new page."""
+    pdf = TableReport(sections[0].title, sections[0].columns, subtitle)
+    total = sum(section.total or 0 for section in sections)
+    done = 0
+    try:
+        for section in sections:
+            pdf.start_table(section.title, section.columns)
+            count = 0
+            for rows in section.batches:
+                if is_cancelled and is_cancelled():
+                    raise ReportCancelled()
+                for row in rows:
+                    pdf.add_row(row)
+                count += len(rows)
+                if progress:
+                    progress(done + count, max(total, done + count))
+            if not count:
+                pdf.add_note(section.empty)
+            done += count
+    except BaseException:
+        pdf._spool.close()
+        raise
+    pdf.save(path)
+    return done
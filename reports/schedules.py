@@ -0,0 +1,149 @@
+# reports/schedules.py
+#
+# The morning schedule packs: one PDF per doctor with their appointments
+# and follow-ups for the coming days, bundled into a zip. Doctors are
+# rendered in parallel worker processes, each with its own read-only
+# connection. Run as:
+#
+#     python -m reports.schedules --from 2025-07-03 --days 3 -o schedules.zip
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+
+from database.appointment_db import AppointmentDB
+from database.connection import configure, get_connection, get_path, open_connection
+from database.doctor_db import DoctorDB
+from database.followup_db import FollowUpDB
+from reports.lists import list_section
+from reports.pdf import CLINIC_NAME, ReportCancelled, render_sections
+
+DEFAULT_DAYS = 3
+
+# the worker process's connection, opened once by _init_worker
+_worker_conn = None
+
+
+def _init_worker(db_path):
+    global _worker_conn
+    _worker_conn = open_connection(db_path, read_only=True)
+
+
+def render_pack(path, doctor_id, doctor_name, start, end, conn=None):
+    """Write one doctor's schedule (appointments, then follow-ups) to path.
+
+    Returns the number of rows.
+    """
+    conn = conn or _worker_conn or get_connection()
+    days = start if start == end else f"{start} to {end}"
+    sections = [
+        list_section("appointments", conn, start, end, doctor_id,
+                     title=f"{doctor_name} - Appointments - {days}"),
+        list_section("followups", conn, start, end, doctor_id,
+                     title=f"{doctor_name} - Follow-Ups - {days}"),
+    ]
+    return render_sections(path, sections, CLINIC_NAME)
+
+
+def _file_name(doctor_id, doctor_name):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", doctor_name).strip("-").lower() or "doctor"
+    return f"{doctor_id:03d}-{slug}.pdf"
+
+
+def scheduled_doctors(start, end, conn=None):
+    """(id, name) of every doctor with an appointment or follow-up in start..end."""
+    conn = conn or get_connection()
+    appointments, followups = AppointmentDB(conn), FollowUpDB(conn)
+    return [
+        (doctor_id, name) for doctor_id, name, _ in DoctorDB(conn).get_all()
+        if appointments.count_between(start, end, doctor_id)
+        or followups.count_between(start, end, doctor_id)
+    ]
+
+
+def build_packs(path, start, end=None, doctors=None, workers=None, conn=None, progress=None,
+                is_cancelled=None):
+    """Render every scheduled doctor's pack in parallel and zip them into path.
+
+    doctors is a list of (id, name); by default, those scheduled_doctors()
+    finds through conn.
+    progress(done, total) runs as each doctor finishes; when is_cancelled()
+    turns true the pending renders are dropped, nothing is written and
+    ReportCancelled is raised. Returns the number of packs.
+    """
+    end = end or start
+    db_path = get_path()
+    if doctors is None:
+        # get_connection() also migrates, so the workers can open read-only
+        doctors = scheduled_doctors(start, end, conn)
+    workers = min(workers or os.cpu_count() or 1, max(len(doctors), 1))
+    partial = f"{path}.part"
+
+    with tempfile.TemporaryDirectory() as scratch, ProcessPoolExecutor(
+        workers,
+        # spawn, not fork: the GUI process has Qt and SQLite state a fork would copy
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(db_path,),
+    ) as pool:
+        pending = {
+            pool.submit(render_pack, os.path.join(scratch, _file_name(doctor_id, name)),
+                        doctor_id, name, start, end): _file_name(doctor_id, name)
+            for doctor_id, name in doctors
+        }
+        try:
+            with zipfile.ZipFile(partial, "w", zipfile.ZIP_STORED) as archive:
+                done = 0
+                while pending:
+                    finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    if is_cancelled and is_cancelled():
+                        raise ReportCancelled()
+                    for future in finished:
+                        name = pending.pop(future)
+                        future.result()
+                        # PDFs are already compressed, so they are stored as is
+                        archive.write(os.path.join(scratch, name), name)
+                        os.remove(os.path.join(scratch, name))
+                        done += 1
+                        if progress:
+                            progress(done, len(doctors))
+            os.replace(partial, path)
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+    return len(doctors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reports.schedules")
+    parser.add_argument("--db", help="path to clinic.db")
+    parser.add_argument("--from", dest="start", default=date.today().isoformat(),
+                        help="first day (YYYY-MM-DD), default today")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS,
+                        help=f"number of days covered, default {DEFAULT_DAYS}")
+    parser.add_argument("--workers", type=int, help="worker processes, default one per core")
+    parser.add_argument("-o", "--output", help="default: schedules-<from>.zip")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        configure(args.db)
+    end = (date.fromisoformat(args.start) + timedelta(days=max(args.days, 1) - 1)).isoformat()
+    path = args.output or f"schedules-{args.start}.zip"
+    count = build_packs(
+        path, args.start, end, workers=args.workers,
+        progress=lambda done, total: print(f"\r{done}/{total} doctors", end="", file=sys.stderr),
+    )
+    print(file=sys.stderr)
+    print(f"Wrote {count} schedules ({args.start} to {end}) to {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import pytest
+
+from database import connection
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh, migrated database as the shared connection's target."""
+    path = str(tmp_path / "clinic.db")
+    connection.configure(path)
+    connection.get_connection()
+    yield path
+    connection.close_connection()
+
+
+@pytest.fixture
+def conn(db_path):
+    return connection.get_connection()
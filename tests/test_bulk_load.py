@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from database import connection
+from database.maintenance import bulk_load
+from database import migrations
+from database.migrations import FTS_COLUMNS, repair_fts_triggers
+
+PATIENT_SQL = "INSERT INTO patients (name, gender, age, phone_number, address) VALUES (?, ?, ?, ?, ?)"
+
+
+def fts_triggers(conn):
+    return {name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg\\_%\\_fts\\_%' ESCAPE '\\'"
+    )}
+
+
+def check_index(conn, table="patients"):
+    conn.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('integrity-check')")
+
+
+def patients(count, name="Patient"):
+    return [(f"{name} {i}", "Female", "30", f"98{i:08d}", "Pokhara") for i in range(count)]
+
+
+def test_all_triggers_exist(conn):
+    assert len(fts_triggers(conn)) == 3 * len(FTS_COLUMNS)
+
+
+def test_indexes_loaded_rows(conn):
+    triggers = fts_triggers(conn)
+    with bulk_load(conn):
+        conn.executemany(PATIENT_SQL, patients(50))
+
+    assert fts_triggers(conn) == triggers
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM patients_fts WHERE patients_fts MATCH 'pokhara'").fetchone()[0] == 50
+    check_index(conn)
+
+
+def test_failure_rolls_back_and_keeps_triggers(conn):
+    triggers = fts_triggers(conn)
+    with pytest.raises(RuntimeError):
+        with bulk_load(conn):
+            conn.executemany(PATIENT_SQL, patients(5))
+            raise RuntimeError("import failed")
+
+    assert fts_triggers(conn) == triggers
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM patients").fetchone()[0] == 0
+
+
+def test_other_connections_never_see_triggers_missing(conn, db_path):
+    other = connection.open_connection(db_path)
+    other.execute("PRAGMA busy_timeout = 0")
+    triggers = fts_triggers(conn)
+    with bulk_load(conn):
+        conn.executemany(PATIENT_SQL, patients(10))
+        assert fts_triggers(other) == triggers
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute(PATIENT_SQL, patients(1, "Walk-in")[0])
+        other.rollback()
+
+    # rows written before, during and after the load all stay indexed through updates
+    with other:
+        other.execute(PATIENT_SQL, patients(1, "Walk-in")[0])
+        other.execute("UPDATE patients SET address = 'Bhaktapur'")
+    check_index(other)
+    assert other.execute("SELECT COUNT(*) FROM patients_fts WHERE patients_fts MATCH 'bhaktapur'").fetchone()[0] == 11
+    other.close()
+
+
+def test_missing_trigger_is_repaired_on_connect(conn, db_path):
+    with conn:
+        conn.execute("DROP TRIGGER trg_patients_fts_ins")
+        conn.execute(PATIENT_SQL, patients(1)[0])
+    connection.close_connection()
+
+    conn = connection.get_connection()
+    assert len(fts_triggers(conn)) == 3 * len(FTS_COLUMNS)
+    check_index(conn)
+    assert conn.execute("SELECT COUNT(*) FROM patients_fts WHERE patients_fts MATCH 'pokhara'").fetchone()[0] == 1
+
+
+def test_failed_repair_rolls_back(conn, monkeypatch):
+    with conn:
+        conn.execute("DROP TRIGGER trg_patients_fts_ins")
+    statements = migrations.fts_statements("patients")
+
+    def failing(table, rebuild=True):
+        return statements[:-1] + ["SELECT no_such_function()"]
+
+    monkeypatch.setattr(migrations, "fts_statements", failing)
+    with pytest.raises(sqlite3.OperationalError):
+        repair_fts_triggers(conn)
+
+    assert not conn.in_transaction
+    assert "trg_patients_fts_ins" not in fts_triggers(conn)
+    monkeypatch.undo()
+    assert repair_fts_triggers(conn) == ["patients"]
+    assert not conn.in_transaction
+    assert len(fts_triggers(conn)) == 3 * len(FTS_COLUMNS)
+    assert repair_fts_triggers(conn) == []
@@ -0,0 +1,76 @@
+from database.maintenance import rebuild_patient_counts
+
+
+def add_patient(conn, name):
+    return conn.execute(
+        "INSERT INTO patients (name, gender, age, phone_number, address) VALUES (?, 'Female', '30', '98', 'Dharan')",
+        (name,),
+    ).lastrowid
+
+
+def add_appointment(conn, patient_id):
+    return conn.execute(
+        "INSERT INTO appointments (patient_id, date, time, reason) VALUES (?, '2025-07-01', '10:00', '')",
+        (patient_id,),
+    ).lastrowid
+
+
+def add_followup(conn, patient_id):
+    return conn.execute(
+        "INSERT INTO followups (patient_id, date, remarks) VALUES (?, '2025-07-08', '')", (patient_id,)
+    ).lastrowid
+
+
+def counts(conn):
+    return dict((pid, (appointments, followups)) for pid, appointments, followups in conn.execute(
+        "SELECT patient_id, appointments, followups FROM patient_counts"
+    ))
+
+
+def test_new_patient_starts_at_zero(conn):
+    with conn:
+        ram = add_patient(conn, "Ram")
+    assert counts(conn) == {ram: (0, 0)}
+
+
+def test_triggers_follow_inserts_moves_and_deletes(conn):
+    with conn:
+        ram, sita = add_patient(conn, "Ram"), add_patient(conn, "Sita")
+        first = add_appointment(conn, ram)
+        add_appointment(conn, ram)
+        add_followup(conn, ram)
+        followup = add_followup(conn, sita)
+    assert counts(conn) == {ram: (2, 1), sita: (0, 1)}
+
+    with conn:
+        conn.execute("UPDATE appointments SET patient_id = ? WHERE id = ?", (sita, first))
+        conn.execute("UPDATE followups SET patient_id = NULL WHERE id = ?", (followup,))
+    assert counts(conn) == {ram: (1, 1), sita: (1, 0)}
+
+    with conn:
+        conn.execute("DELETE FROM appointments WHERE id = ?", (first,))
+    assert counts(conn) == {ram: (1, 1), sita: (0, 0)}
+
+
+def test_deleting_a_patient_drops_its_counts(conn):
+    with conn:
+        ram, sita = add_patient(conn, "Ram"), add_patient(conn, "Sita")
+        add_appointment(conn, ram)
+        add_followup(conn, sita)
+        conn.execute("DELETE FROM patients WHERE id = ?", (ram,))
+    assert counts(conn) == {sita: (0, 1)}
+
+
+def test_rebuild_matches_triggers(conn):
+    with conn:
+        patients = [add_patient(conn, f"Patient {i}") for i in range(5)]
+        for i in range(20):
+            add_appointment(conn, patients[i % 5])
+            if i % 3 == 0:
+                add_followup(conn, patients[i % 4])
+        conn.execute("DELETE FROM appointments WHERE id % 4 = 0")
+    kept = counts(conn)
+    with conn:
+        conn.execute("UPDATE patient_counts SET appointments = 99")
+    assert rebuild_patient_counts(conn) == len(patients)
+    assert counts(conn) == kept
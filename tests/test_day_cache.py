@@ -0,0 +1,82 @@
+from database import events
+from database.day_cache import DayCache, around
+
+
+class Loader:
+    """load(conn, date) returning (id, patient_id) rows from a dict, counting reads."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = []
+        self.during = None  # called in the middle of a read
+
+    def __call__(self, conn, date_str):
+        self.reads.append(date_str)
+        rows = list(self.rows.get(date_str, ()))
+        if self.during:
+            self.during()
+        return rows
+
+
+def cache_of(rows, **kwargs):
+    loader = Loader(rows)
+    return DayCache(events.FOLLOWUP, loader, **kwargs), loader
+
+
+def test_around_is_nearest_first():
+    assert around("2025-07-01", 2) == ["2025-07-02", "2025-06-30", "2025-07-03", "2025-06-29"]
+
+
+def test_get_reads_once_and_keeps_the_most_recent_days():
+    cache, loader = cache_of({"2025-07-01": [(1, 10)]}, size=2)
+    assert cache.get("2025-07-01", conn=object()) == [(1, 10)]
+    assert cache.get("2025-07-01", conn=object()) == [(1, 10)]
+    cache.get("2025-07-02", conn=object())
+    cache.get("2025-07-01", conn=object())  # most recently used again
+    cache.get("2025-07-03", conn=object())  # pushes out 07-02
+
+    assert loader.reads == ["2025-07-01", "2025-07-02", "2025-07-03"]
+    assert cache.missing(["2025-07-01", "2025-07-02", "2025-07-03"]) == ["2025-07-02"]
+
+
+def test_prefetch_skips_cached_days():
+    cache, loader = cache_of({})
+    cache.get("2025-07-01", conn=object())
+    cache.prefetch(around("2025-07-01", 1) + ["2025-07-01"], conn=object())
+    assert loader.reads == ["2025-07-01", "2025-07-02", "2025-06-30"]
+    assert cache.missing(around("2025-07-01", 1)) == []
+
+
+def test_read_racing_an_eviction_is_not_stored():
+    cache, loader = cache_of({"2025-07-01": [(1, 10)]})
+    loader.during = lambda: cache.evict(["2025-07-01"])
+    cache.prefetch(["2025-07-01"], conn=object())
+    assert cache.missing(["2025-07-01"]) == ["2025-07-01"]
+
+    loader.during = None
+    cache.prefetch(["2025-07-01"], conn=object())
+    assert cache.missing(["2025-07-01"]) == []
+
+
+def test_on_change_evicts_what_the_write_touched():
+    rows = {"2025-07-01": [(1, 10)], "2025-07-02": [(2, 20)], "2025-07-03": [(3, 10)]}
+    cache, _ = cache_of(rows, patient_column=1)
+    days = sorted(rows)
+    cache.prefetch(days, conn=object())
+
+    cache.on_change(events.ChangeEvent(events.APPOINTMENT, events.UPDATE, 9, ("2025-07-02",), (20,)))
+    assert cache.missing(days) == []
+
+    # a follow-up on 07-02 for patient 10 moves the count shown on 07-01 and 07-03
+    cache.on_change(events.ChangeEvent(events.FOLLOWUP, events.INSERT, 4, ("2025-07-02",), (10,)))
+    assert cache.missing(days) == days
+
+    cache.prefetch(days, conn=object())
+    cache.on_change(events.ChangeEvent(events.PATIENT, events.INSERT, 30))
+    assert cache.missing(days) == []
+    cache.on_change(events.ChangeEvent(events.DOCTOR, events.UPDATE, 1))
+    assert cache.missing(days) == days
+
+    cache.prefetch(days, conn=object())
+    cache.on_change(events.ChangeEvent(None, events.RELOAD))
+    assert cache.missing(days) == days
@@ -0,0 +1,105 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.days import DAY_SQL, MINUTE_SQL, day_number, iso_date, minute_of_day
+from database.doctor_db import DoctorDB
+from ui.appointment import format_minute
+
+
+def sql_value(expression, value):
+    sql = f"SELECT {expression.format(':value')}"
+    return sqlite3.connect(":memory:").execute(sql, {"value": value}).fetchone()[0]
+
+
+@pytest.mark.parametrize("value", ["1970-01-01", "2025-07-01", "2024-02-29", "1969-12-31", "2000-03-01"])
+def test_day_number_matches_sql(value):
+    assert day_number(value) == sql_value(DAY_SQL, value)
+    assert iso_date(day_number(value)) == value
+
+
+def test_day_number_known_values():
+    assert day_number("1970-01-01") == 0
+    assert day_number("2025-07-01") == 20270
+    assert day_number(date(2025, 7, 1)) == 20270
+
+
+@pytest.mark.parametrize("value", ["", "2025-13-01", "not a date", None])
+def test_day_number_unparseable(value):
+    assert day_number(value) is None
+    assert sql_value(DAY_SQL, value) is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("00:00", 0), ("09:05", 545), ("9:05", 545), ("14:05", 845), ("14:05:30", 845), ("23:59", 1439),
+])
+def test_minute_of_day_matches_sql(value, expected):
+    assert minute_of_day(value) == expected
+    assert sql_value(MINUTE_SQL, value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "1400", None])
+def test_minute_of_day_unparseable(value):
+    assert minute_of_day(value) is None
+    assert sql_value(MINUTE_SQL, value) is None
+
+
+def test_columns_follow_writes(conn):
+    appointments = AppointmentDB(conn)
+    first = appointments.insert(None, None, "2025-07-02", "14:05", "", None)
+    with conn:
+        second = conn.execute(
+            "INSERT INTO appointments (date, time, reason) VALUES ('2025-07-01', '9:30', '')"
+        ).lastrowid
+    assert day_and_minute(conn, first) == (20271, 845)
+    assert day_and_minute(conn, second) == (20270, 570)
+
+    appointments.update(first, None, None, "2025-07-01", "08:00", "", None)
+    with conn:
+        conn.execute("UPDATE appointments SET date = '2025-07-03', time = '10:00' WHERE id = ?", (second,))
+    assert day_and_minute(conn, first) == (20270, 480)
+    assert day_and_minute(conn, second) == (20272, 600)
+
+
+def test_date_range_is_in_schedule_order(conn):
+    PatientDB(conn).insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    appointments = AppointmentDB(conn)
+    late = appointments.insert(1, 1, "2025-07-01", "16:00", "", None)
+    early = appointments.insert(1, 1, "2025-07-01", "9:00", "", None)
+    next_day = appointments.insert(1, 1, "2025-07-02", "08:00", "", None)
+    appointments.insert(1, 1, "2025-07-03", "08:00", "", None)
+
+    rows = appointments.get_by_date_range("2025-07-01", "2025-07-02")
+    assert [row[0] for row in rows] == [early, late, next_day]
+
+
+def test_schedule_pages_keep_rows_without_a_time(conn):
+    PatientDB(conn).insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    appointments = AppointmentDB(conn)
+    expected = [
+        appointments.insert(1, 1, "2025-07-01", "10:00", "", None),
+        appointments.insert(1, 1, "2025-07-02", "soon", "", None),
+        appointments.insert(1, 1, "2025-07-02", "later", "", None),
+        appointments.insert(1, 1, "2025-07-02", "08:00", "", None),
+        appointments.insert(1, 1, "2025-07-03", "whenever", "", None),
+    ]
+
+    seen, after = [], None
+    while page := appointments.get_schedule_page(after, 1):
+        seen.append(page[0][0])
+        after = (page[0][4], page[0][5], page[0][0])
+    assert seen == expected
+
+
+@pytest.mark.parametrize("minute", [None, -1, 1440])
+def test_format_minute_out_of_range(minute):
+    assert format_minute(minute) == ""
+
+
+def day_and_minute(conn, appointment_id):
+    return conn.execute("SELECT day, minute FROM appointments WHERE id = ?", (appointment_id,)).fetchone()
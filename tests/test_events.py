@@ -0,0 +1,105 @@
+import pytest
+
+from database import connection, events
+from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.setting_db import SpecializationDB
+
+
+@pytest.fixture
+def published():
+    """Every event published while the test runs."""
+    seen = []
+    unsubscribe = events.subscribe(seen.append)
+    yield seen
+    unsubscribe()
+
+
+def test_appointment_writes_carry_dates_and_patients(conn, published):
+    patients = PatientDB(conn)
+    patients.insert_patient("Ram", "Male", "40", "9800000001", "Kathmandu")
+    patients.insert_patient("Sita", "Female", "35", "9800000002", "Lalitpur")
+    appointments = AppointmentDB(conn)
+    del published[:]
+
+    appointment_id = appointments.insert(1, None, "2025-07-01", "09:30", "Fever", None)
+    appointments.update(appointment_id, 2, None, "2025-07-03", "10:00", "Fever", None)
+    appointments.delete(appointment_id)
+
+    assert published == [
+        events.ChangeEvent(events.APPOINTMENT, events.INSERT, appointment_id, ("2025-07-01",), (1,)),
+        events.ChangeEvent(events.APPOINTMENT, events.UPDATE, appointment_id,
+                           ("2025-07-01", "2025-07-03"), (1, 2)),
+        events.ChangeEvent(events.APPOINTMENT, events.DELETE, appointment_id, ("2025-07-03",), (2,)),
+    ]
+
+
+def test_events_are_published_after_commit(conn, db_path):
+    other = connection.open_connection(db_path)
+    visible = []
+    unsubscribe = events.subscribe(
+        lambda event: visible.append(other.execute("SELECT COUNT(*) FROM patients").fetchone()[0])
+    )
+    try:
+        PatientDB(conn).insert_patient("Ram", "Male", "40", "9800000001", "Kathmandu")
+    finally:
+        unsubscribe()
+        other.close()
+    assert visible == [1]
+
+
+def test_subscribers_get_only_their_entities_and_reload():
+    seen = []
+    unsubscribe = events.subscribe(seen.append, events.DOCTOR)
+    try:
+        events.changed(events.PATIENT, events.UPDATE, 1)
+        events.changed(events.DOCTOR, events.DELETE, 2)
+        events.changed(None, events.RELOAD)
+    finally:
+        unsubscribe()
+    events.changed(events.DOCTOR, events.UPDATE, 3)
+
+    assert [(event.entity, event.op) for event in seen] == [
+        (events.DOCTOR, events.DELETE), (None, events.RELOAD),
+    ]
+
+
+def test_changed_drops_empty_and_duplicate_keys(published):
+    events.changed(events.FOLLOWUP, events.UPDATE, 7, ["2025-07-02", None, "2025-07-01", "2025-07-02"],
+                   [3, None, 3])
+    assert published == [
+        events.ChangeEvent(events.FOLLOWUP, events.UPDATE, 7, ("2025-07-01", "2025-07-02"), (3,)),
+    ]
+
+
+def test_duplicate_insert_publishes_nothing(conn, published):
+    specializations = SpecializationDB(conn)
+    assert specializations.insert("Cardiology") is not None
+    assert specializations.insert("Cardiology") is None
+    assert [event.op for event in published] == [events.INSERT]
+
+
+def test_cascading_deletes_reload_the_rows_they_change(conn, published):
+    from database.doctor_db import DoctorDB
+
+    patients = PatientDB(conn)
+    patient_id = patients.insert_patient("Ram", "Male", "40", "9800000001", "Kathmandu")
+    lonely_id = patients.insert_patient("Sita", "Female", "35", "9800000002", "Lalitpur")
+    specializations = SpecializationDB(conn)
+    spec_id = specializations.insert("Cardiology")
+    doctors = DoctorDB(conn)
+    doctor_id = doctors.insert("Dr. Shrestha", spec_id)
+    AppointmentDB(conn).insert(patient_id, doctor_id, "2025-07-01", "09:30", "Fever", None)
+    del published[:]
+
+    patients.delete_patient(lonely_id)
+    patients.delete_patient(patient_id)
+    specializations.delete(spec_id)
+    doctors.delete(doctor_id)
+
+    assert [(event.entity, event.op) for event in published] == [
+        (events.PATIENT, events.DELETE),
+        (events.PATIENT, events.DELETE), (events.APPOINTMENT, events.RELOAD),
+        (events.SPECIALIZATION, events.DELETE), (events.DOCTOR, events.RELOAD),
+        (events.DOCTOR, events.DELETE), (events.APPOINTMENT, events.RELOAD),
+    ]
@@ -0,0 +1,58 @@
+import csv
+
+import pytest
+
+from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.doctor_db import DoctorDB
+from database.export import EXPORTS, export_rows
+from database.followup_db import FollowUpDB
+from database.importer import import_file
+
+APPOINTMENT_COLUMNS = "patient_id, doctor_id, date, time, reason, status_id, day, minute"
+FOLLOWUP_COLUMNS = "patient_id, doctor_id, date, remarks, status_id, day"
+
+
+@pytest.fixture
+def clinic(conn):
+    patients = PatientDB(conn)
+    patients.insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    patients.insert_patient("Sita Rai", "Female", "35", "9800000002", "Lalitpur")
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    appointments = AppointmentDB(conn)
+    appointments.insert(1, 1, "2025-07-01", "09:30", "Fever, cough", 1)
+    appointments.insert(2, 1, "2025-07-01", "14:05", "Check up", 2)
+    appointments.insert(2, 1, "2025-07-02", "10:00", "", 1)
+    followups = FollowUpDB(conn)
+    followups.insert(1, 1, "2025-07-08", "Review \"blood\" report", 1)
+    followups.insert(2, None, "2025-07-09", "", 3)
+    return conn
+
+
+def rows(conn, table, columns):
+    return sorted(conn.execute(f"SELECT {columns} FROM {table}").fetchall(), key=repr)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+@pytest.mark.parametrize("entity, columns", [
+    ("appointments", APPOINTMENT_COLUMNS),
+    ("followups", FOLLOWUP_COLUMNS),
+])
+def test_round_trip(clinic, tmp_path, suffix, entity, columns):
+    before = rows(clinic, entity, columns)
+    path = tmp_path / f"{entity}{suffix}"
+
+    assert export_rows(entity, str(path), conn=clinic) == len(before)
+    result = import_file(entity, str(path), conn=clinic)
+
+    assert (result.read, result.imported, result.rejected) == (len(before), len(before), 0)
+    assert rows(clinic, entity, columns) == sorted(before * 2, key=repr)
+
+
+def test_csv_rows_have_declared_width(clinic, tmp_path):
+    path = tmp_path / "appointments.csv"
+    export_rows("appointments", str(path), conn=clinic)
+    with open(path, newline="", encoding="utf-8") as fh:
+        widths = {len(row) for row in csv.reader(fh)}
+    assert widths == {len(EXPORTS["appointments"].columns)}
+
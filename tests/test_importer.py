@@ -0,0 +1,74 @@
+from database import events
+from database.doctor_db import DoctorDB
+from database.importer import import_file
+
+PATIENTS_CSV = """\
+Name,Gender,Age,Phone,Address
+Ram Thapa,male,40,9800000001,Kathmandu
+Sita Rai,female,35,9800000002,Lalitpur
+,Female,20,9800000003,Pokhara
+Hari KC,robot,50,9800000004,Dharan
+"""
+
+APPOINTMENTS_JSONL = """\
+{"patient_phone": "9800000001", "doctor": "Dr. Shrestha", "date": "2025-07-01", "time": "9:30 pm", "reason": "Fever"}
+{"patient_phone": "9800000002", "patient_name": "sita rai", "doctor_id": 1, "date": "2025-07-02", "time": "10:00:00"}
+{"patient_phone": "9899999999", "doctor": "Dr. Shrestha", "date": "2025-07-01", "time": "10:00"}
+{"patient_phone": "9800000001", "doctor": "Dr. Shrestha", "date": "01/07/2025", "time": "10:00"}
+not json
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_import_validates_and_reports_rejects(conn, tmp_path):
+    rejected = []
+    result = import_file("patients", write(tmp_path, "patients.csv", PATIENTS_CSV), conn=conn,
+                         on_reject=rejected.append)
+
+    assert (result.read, result.imported, result.rejected) == (4, 2, 2)
+    assert [(r.line, r.reason) for r in rejected] == [(4, "missing name"), (5, "bad gender 'robot'")]
+    assert conn.execute("SELECT name, gender FROM patients ORDER BY id").fetchall() == [
+        ("Ram Thapa", "Male"), ("Sita Rai", "Female"),
+    ]
+
+
+def test_import_resolves_references(conn, tmp_path):
+    import_file("patients", write(tmp_path, "patients.csv", PATIENTS_CSV), conn=conn)
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    rejected = []
+    result = import_file("appointments", write(tmp_path, "appointments.jsonl", APPOINTMENTS_JSONL),
+                         conn=conn, chunk_size=2, on_reject=rejected.append)
+
+    assert (result.read, result.imported, result.rejected) == (5, 2, 3)
+    assert [r.line for r in rejected] == [3, 4, 5]
+    assert conn.execute("""
+        SELECT p.name, a.doctor_id, a.date, a.time, s.name FROM appointments a
+        JOIN patients p ON p.id = a.patient_id JOIN statuses s ON s.id = a.status_id ORDER BY a.id
+    """).fetchall() == [
+        ("Ram Thapa", 1, "2025-07-01", "21:30", "Pending"),
+        ("Sita Rai", 1, "2025-07-02", "10:00", "Pending"),
+    ]
+
+
+def test_imported_rows_are_searchable(conn, tmp_path):
+    import_file("patients", write(tmp_path, "patients.csv", PATIENTS_CSV), conn=conn)
+
+    assert conn.execute(
+        "SELECT rowid FROM patients_fts WHERE patients_fts MATCH 'lalitpur'"
+    ).fetchall() == [(2,)]
+    conn.execute("INSERT INTO patients_fts(patients_fts) VALUES ('integrity-check')")
+
+
+def test_import_publishes_one_reload(conn, tmp_path):
+    seen = []
+    unsubscribe = events.subscribe(seen.append)
+    try:
+        import_file("patients", write(tmp_path, "patients.csv", PATIENTS_CSV), conn=conn)
+    finally:
+        unsubscribe()
+    assert seen == [events.ChangeEvent(events.PATIENT, events.RELOAD)]
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QDate  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from database import events, reference  # noqa: E402
+from database.appointment_db import AppointmentDB  # noqa: E402
+from database.days import day_number  # noqa: E402
+from database.followup_db import FollowUpDB  # noqa: E402
+from ui.events import bridge  # noqa: E402
+from ui.load_calendar import LoadCalendar  # noqa: E402
+
+
+# kept for the whole session: the event bridge outlives this module's tests
+app = QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def statuses(conn):
+    return reference.statuses.id("Pending"), reference.statuses.id("Completed")
+
+
+def test_count_by_day(conn, statuses):
+    pending, completed = statuses
+    appointments, followups = AppointmentDB(conn), FollowUpDB(conn)
+    for date, status in [("2025-07-01", pending), ("2025-07-01", pending), ("2025-07-01", completed),
+                         ("2025-07-03", pending), ("2025-08-01", pending)]:
+        appointments.insert(None, None, date, "10:00", "", status)
+    followups.insert(None, None, "2025-07-02", "", completed)
+
+    assert sorted(appointments.count_by_day("2025-07-01", "2025-07-31")) == [
+        (day_number("2025-07-01"), pending, 2),
+        (day_number("2025-07-01"), completed, 1),
+        (day_number("2025-07-03"), pending, 1),
+    ]
+    assert followups.count_by_day("2025-07-01", "2025-07-31") == [(day_number("2025-07-02"), completed, 1)]
+
+
+def test_calendar_reads_each_page_once_until_a_write_touches_it(conn, statuses, request):
+    pending, _ = statuses
+    appointments = AppointmentDB(conn)
+    appointments.insert(None, None, "2025-07-01", "10:00", "", pending)
+    reads = []
+
+    def count_by_day(start, end):
+        reads.append((start, end))
+        return appointments.count_by_day(start, end)
+
+    calendar = LoadCalendar(events.APPOINTMENT, count_by_day)
+    request.addfinalizer(lambda: bridge().changed.disconnect(calendar.on_change))
+    calendar.setCurrentPage(2025, 7)
+    assert calendar.day_counts(QDate(2025, 7, 1)) == {pending: 1}
+    assert calendar.day_counts(QDate(2025, 7, 2)) == {}
+    assert len(reads) == 1
+
+    appointments.insert(None, None, "2025-09-15", "10:00", "", pending)  # another page
+    calendar.day_counts(QDate(2025, 7, 1))
+    assert len(reads) == 1
+
+    appointments.insert(None, None, "2025-07-01", "11:00", "", pending)
+    assert calendar.day_counts(QDate(2025, 7, 1)) == {pending: 2}
+    assert len(reads) == 2
+
+    events.changed(None, events.RELOAD)
+    calendar.day_counts(QDate(2025, 7, 1))
+    assert len(reads) == 3
@@ -0,0 +1,77 @@
+from database import connection, events
+from database.clinic_db import PatientDB
+from database.patient_index import PatientIndex, normalize_phone, patients
+
+
+def test_normalize_phone():
+    assert normalize_phone("98-1234 5678") == normalize_phone("9812345678") == "9812345678"
+    assert normalize_phone(None) == ""
+
+
+def test_lookups(conn):
+    db = PatientDB(conn)
+    db.insert_patient("Ram Thapa", "Male", "40", "98-0000 0001", "Kathmandu")
+    db.insert_patient("Sita Thapa", "Female", "38", "9800000001", "Kathmandu")
+    db.insert_patient("ram  thapa", "Male", "12", "9800000002", "Pokhara")
+
+    assert patients.get(1).label() == "Ram Thapa (98-0000 0001)"
+    assert patients.get(99) is None
+    assert len(patients) == 3
+    assert [p.id for p in patients.by_phone("980 000 0001")] == [1, 2]
+    assert [p.id for p in patients.by_name("RAM THAPA")] == [1, 3]
+    assert patients.find("Sita Thapa", "9800000001").id == 2
+    assert patients.find("Hari", "9800000001") is None
+
+
+def test_follows_published_writes(conn):
+    db = PatientDB(conn)
+    db.insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    assert patients.get(1).name == "Ram Thapa"
+
+    db.update_patient(1, "Ram Bahadur Thapa", "Male", "40", "9800000009", "Kathmandu")
+    assert patients.get(1).phone == "9800000009"
+    assert patients.by_phone("9800000001") == []
+    assert [p.id for p in patients.by_name("ram bahadur thapa")] == [1]
+
+    db.insert_patient("Sita Thapa", "Female", "38", "9800000002", "Kathmandu")
+    db.delete_patient(1)
+    assert patients.get(1) is None
+    assert [p.name for p in patients.by_phone("9800000002")] == ["Sita Thapa"]
+
+
+def test_reload_rereads_other_writers(conn, db_path):
+    PatientDB(conn).insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    assert len(patients) == 1
+
+    other = connection.open_connection(db_path)
+    with other:
+        other.execute("INSERT INTO patients (name, phone_number) VALUES ('Hari', '9800000003')")
+    other.close()
+    assert len(patients) == 1
+
+    events.changed(None, events.RELOAD)
+    assert patients.get(2).name == "Hari"
+
+
+def test_writes_patch_the_index_without_reloading(conn, monkeypatch):
+    db = PatientDB(conn)
+    db.insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    # a page subscribed before the index, reading it while handling the event
+    seen = []
+    unsubscribe = events.subscribe(lambda event: seen.append(index.get(event.id)), events.PATIENT)
+    index = PatientIndex()
+    try:
+        assert index.get(1).name == "Ram Thapa"
+        loads = []
+        load = index._load
+        monkeypatch.setattr(index, "_load", lambda version: (loads.append(version), load(version)))
+
+        for age in ("41", "42", "43"):
+            db.update_patient(1, "Ram Thapa", "Male", age, "9800000001", "Kathmandu")
+        db.insert_patient("Sita Thapa", "Female", "38", "9800000002", "Kathmandu")
+
+        assert loads == []
+        assert [record.name for record in seen[-4:]] == ["Ram Thapa"] * 3 + ["Sita Thapa"]
+        assert index.find("sita  thapa", "98-0000-0002").id == 2
+    finally:
+        unsubscribe()
@@ -0,0 +1,59 @@
+from database import connection, events, reference
+from database.doctor_db import DoctorDB
+from database.setting_db import StatusDB
+
+
+def write_elsewhere(db_path, sql, params=()):
+    """A write by another process: nothing is published for it."""
+    other = connection.open_connection(db_path)
+    with other:
+        other.execute(sql, params)
+    other.close()
+
+
+def test_maps_ids_and_names(conn):
+    pending = reference.statuses.id("Pending")
+    assert pending is not None
+    assert reference.statuses.name(pending) == "Pending"
+    assert reference.statuses.name(-1, "?") == "?"
+    assert [name for _, name in reference.statuses.items()] == ["Pending", "Completed", "Cancelled"]
+
+
+def test_served_from_memory_until_a_write_is_published(conn, db_path):
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    assert [name for _, name in reference.doctors.items()] == ["Dr. Shrestha"]
+
+    write_elsewhere(db_path, "INSERT INTO doctors (name) VALUES ('Dr. Karki')")
+    assert [name for _, name in reference.doctors.items()] == ["Dr. Shrestha"]
+
+    DoctorDB(conn).insert("Dr. Adhikari", None)
+    assert [name for _, name in reference.doctors.items()] == ["Dr. Shrestha", "Dr. Karki", "Dr. Adhikari"]
+
+
+def test_writes_to_one_table_leave_the_others_cached(conn, db_path):
+    reference.doctors.items()
+    write_elsewhere(db_path, "INSERT INTO doctors (name) VALUES ('Dr. Karki')")
+    StatusDB(conn).insert("No show")
+
+    assert "No show" in dict(reference.statuses.items()).values()
+    assert reference.doctors.items() == ()
+
+
+def test_manual_refresh_reloads_every_table(conn, db_path):
+    reference.doctors.items()
+    reference.statuses.items()
+    write_elsewhere(db_path, "INSERT INTO doctors (name) VALUES ('Dr. Karki')")
+    write_elsewhere(db_path, "INSERT INTO statuses (name) VALUES ('No show')")
+
+    events.changed(None, events.RELOAD)
+
+    assert [name for _, name in reference.doctors.items()] == ["Dr. Karki"]
+    assert reference.statuses.id("No show") is not None
+
+
+def test_switching_databases_reloads(conn, tmp_path):
+    DoctorDB(conn).insert("Dr. Shrestha", None)
+    assert len(reference.doctors.items()) == 1
+
+    connection.configure(str(tmp_path / "other.db"))
+    assert reference.doctors.items() == ()
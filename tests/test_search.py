@@ -0,0 +1,29 @@
+from database.clinic_db import PatientDB
+from database.doctor_db import DoctorDB
+from database.followup_db import FollowUpDB
+from database.search import like_pattern
+
+
+def test_like_pattern_matches_wildcards_literally():
+    assert like_pattern("a_b%c\\d") == "%a\\_b\\%c\\\\d%"
+
+
+def test_doctor_search_treats_wildcards_literally(conn):
+    doctors = DoctorDB(conn)
+    literal = doctors.insert("Dr. 100% Bhandari", None)
+    doctors.insert("Dr. 1000 Bhandari", None)
+    doctors.insert("Dr_Karki", None)
+
+    assert [row[0] for row in doctors.get_page(keyword="100%")] == [literal]
+    assert [row[1] for row in doctors.get_page(keyword="r_K")] == ["Dr_Karki"]
+
+
+def test_followup_search_matches_status(conn):
+    PatientDB(conn).insert_patient("Ram Thapa", "Male", "40", "9800000001", "Kathmandu")
+    pending, completed = (conn.execute("SELECT id FROM statuses WHERE name = ?", (name,)).fetchone()[0]
+                          for name in ("Pending", "Completed"))
+    followups = FollowUpDB(conn)
+    done = followups.insert(1, None, "2025-07-01", "", completed)
+    followups.insert(1, None, "2025-07-02", "", pending)
+
+    assert [row[0] for row in followups.get_page(keyword="complet")] == [done]
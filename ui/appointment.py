@@ -1,17 +1,22 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QComboBox, QDateEdit, QTimeEdit, QPushButton, QTableWidget,
-    QTableWidgetItem, QMessageBox, QListWidget, QListWidgetItem, QSizePolicy,QFormLayout,QFrame
+    QComboBox, QDateEdit, QTimeEdit, QPushButton, QTableView,
+    QMessageBox, QListWidget, QListWidgetItem, QSizePolicy,QFormLayout,QFrame
 )
 from PyQt6.QtCore import QDate, QTime, QDateTime, Qt
 
 from database.appointment_db import AppointmentDB
+from database import events, reference
 from database.clinic_db import PatientDB
-from database.doctor_db import DoctorDB
-from database.setting_db import StatusDB
+from database.patient_index import patients
 
 from PyQt6.QtCore import QDate, Qt
-from PyQt6.QtGui import QFont,QColor
+from PyQt6.QtGui import QFont
+from ui.events import bridge
+from ui.export import export_view
+from ui.reference_models import doctor_model, status_model
+from ui.search_controller import SearchController
+from ui.table_model import PAGE_SIZE, PagedTableModel
 
 
 class AppointmentBooking(QWidget):
@@ -22,8 +27,10 @@ class AppointmentBooking(QWidget):
         self.db = AppointmentDB()
         self.patient_db = PatientDB()
         self.selected_id = None
+        self.keyword = ""
         self.selected_patient_id = None  # For searchable patient selection
         self.initUI()
+        bridge().changed.connect(self.on_change)
 
     def initUI(self):
         main_layout = QHBoxLayout()
@@ -41,7 +48,10 @@ class AppointmentBooking(QWidget):
         self.patient_search_input.setFont(input_font)
         self.patient_search_input.setMinimumWidth(400)
         self.patient_search_input.setMinimumHeight(35)
-        self.patient_search_input.textChanged.connect(self.on_patient_search)
+        self.patient_search = SearchController(
+            self.patient_search_input, lambda conn, text: PatientDB(conn).search(text)
+        )
+        self.patient_search.results_ready.connect(self.show_patient_matches)
 
         self.patient_list_widget = QListWidget()
         self.patient_list_widget.setMaximumHeight(100)
@@ -49,6 +59,7 @@ class AppointmentBooking(QWidget):
 
         # Doctor dropdown
         self.doctor_input = QComboBox()
+        self.doctor_input.setModel(doctor_model())
         self.doctor_input.setFont(input_font)
         self.doctor_input.setMinimumWidth(400)
         self.doctor_input.setMinimumHeight(35)
@@ -77,6 +88,7 @@ class AppointmentBooking(QWidget):
 
         # Status dropdown
         self.status_input = QComboBox()
+        self.status_input.setModel(status_model())
         self.status_input.setFont(input_font)
         self.status_input.setMinimumWidth(400)
         self.status_input.setMinimumHeight(35)
@@ -118,13 +130,15 @@ class AppointmentBooking(QWidget):
         self.update_btn = styled_button("🔄 Update", "#007bff")
         self.delete_btn = styled_button("🗑️ Delete", "#dc3545")
         self.clear_btn = styled_button("🧹 Clear", "#6c757d")
+        self.export_btn = styled_button("📤 Export", "#17a2b8")
 
         self.add_btn.clicked.connect(self.add_appointment)
         self.update_btn.clicked.connect(self.update_appointment)
         self.delete_btn.clicked.connect(self.delete_appointment)
         self.clear_btn.clicked.connect(self.clear_form)
+        self.export_btn.clicked.connect(self.export)
 
-        for btn in [self.add_btn, self.update_btn, self.delete_btn, self.clear_btn]:
+        for btn in [self.add_btn, self.update_btn, self.delete_btn, self.clear_btn, self.export_btn]:
             button_layout.addWidget(btn)
 
         button_layout.addStretch()
@@ -150,16 +164,28 @@ class AppointmentBooking(QWidget):
         self.search_input.setFont(input_font)
         self.search_input.setMinimumHeight(40)
         self.search_input.setStyleSheet("padding: 6px;")
-        self.search_input.textChanged.connect(self.refresh_table)
+        self.search = SearchController(
+            self.search_input,
+            lambda conn, text: AppointmentDB(conn).get_page(None, PAGE_SIZE, text),
+        )
+        self.search.results_ready.connect(self.on_search_results)
         overall_layout.addWidget(self.search_input)
 
         # Appointment table
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["ID", "Patient", "Phone", "Doctor", "Date", "Time", "Reason", "Status"])
+        # rows: [id, patient, phone, doctor, date, time, reason, status, patient_id, doctor_id,
+        #        minute]; the Time column shows the minute of day
+        self.model = PagedTableModel(
+            ["ID", "Patient", "Phone", "Doctor", "Date", "Time", "Reason", "Status"],
+            fetch_page=self.fetch_page,
+            columns=[0, 1, 2, 3, 4, 10, 6, 7],
+            status_index=7,
+            formatters={5: format_minute},
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setFont(QFont("Arial", 11))
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ccc;
                 background-color: #f9f9f9;
             }
@@ -172,8 +198,8 @@ class AppointmentBooking(QWidget):
         """)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.cellClicked.connect(self.table_clicked)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.clicked.connect(self.table_clicked)
 
         overall_layout.addWidget(self.table)
 
@@ -184,35 +210,23 @@ class AppointmentBooking(QWidget):
 
 
     def refresh_dropdowns(self):
-        # Populate doctor dropdown
-        self.doctor_input.clear()
-        for did, name in DoctorDB().get_all():
-            self.doctor_input.addItem(name, did)
-
-        # # Populate status dropdown
-        self.status_input.clear()
-        for sid, name in StatusDB().get_all():
-            self.status_input.addItem(name, sid)
-
-        # Populate full patient list initially
+        # Doctors and statuses come from the shared reference models
         self.load_patient_list()
 
     def load_patient_list(self, filter_text=""):
+        self.show_patient_matches(filter_text, self.patient_db.search(filter_text))
+
+    def show_patient_matches(self, _text, patients):
         self.patient_list_widget.clear()
-        patients = self.patient_db.get_all()
-        filter_text = filter_text.lower()
         for pid, name, phone in patients:
-            if filter_text in name.lower() or filter_text in phone.lower():
-                item = QListWidgetItem(f"{name} ({phone})")
-                item.setData(Qt.ItemDataRole.UserRole, pid)
-                self.patient_list_widget.addItem(item)
-
-    def on_patient_search(self, text):
-        self.load_patient_list(text)
+            item = QListWidgetItem(f"{name} ({phone})")
+            item.setData(Qt.ItemDataRole.UserRole, pid)
+            self.patient_list_widget.addItem(item)
 
     def on_patient_selected(self, item):
         self.selected_patient_id = item.data(Qt.ItemDataRole.UserRole)
         self.patient_search_input.setText(item.text())
+        self.patient_search.cancel()
         # Optionally clear the patient list to reduce clutter
         self.patient_list_widget.clear()
 
@@ -248,7 +262,6 @@ class AppointmentBooking(QWidget):
 
         if patient_id and doctor_id and status_id:
             self.db.insert(patient_id, doctor_id, date, time, reason, status_id)
-            self.refresh_table()
             self.clear_form()
         else:
             QMessageBox.warning(self, "Validation", "All fields must be selected.")
@@ -264,7 +277,6 @@ class AppointmentBooking(QWidget):
         reason = self.reason_input.text().strip()
 
         self.db.update(self.selected_id, patient_id, doctor_id, date, time, reason, status_id)
-        self.refresh_table()
         self.clear_form()
 
     def delete_appointment(self):
@@ -272,77 +284,84 @@ class AppointmentBooking(QWidget):
             QMessageBox.warning(self, "No Selection", "Select an appointment to delete.")
             return
         self.db.delete(self.selected_id)
-        self.refresh_table()
         self.clear_form()
 
-    def table_clicked(self, row, col):
-        self.selected_id = int(self.table.item(row, 0).text())
-        patient_name = self.table.item(row, 1).text()
-        patient_phone = self.table.item(row, 2).text()
+    def table_clicked(self, index):
+        row = self.model.row_at(index.row())
+        self.selected_id = row[0]
 
-        self.selected_patient_id = None
-        for pid, name, phone in self.patient_db.get_all():
-            if name == patient_name and phone == patient_phone:
-                self.selected_patient_id = pid
-                self.patient_search_input.setText(f"{name} ({phone})")
-                break
+        # rows carry the patient id, so this is a dictionary lookup
+        self.selected_patient_id = row[8]
+        patient = patients.get(row[8])
+        self.patient_search_input.setText(patient.label() if patient else "")
+        self.patient_search.cancel()
 
-        self.doctor_input.setCurrentText(self.table.item(row, 3).text())
-        self.date_input.setDate(QDate.fromString(self.table.item(row, 4).text(), "yyyy-MM-dd"))
-        self.time_input.setTime(QTime.fromString(self.table.item(row, 5).text(), "hh:mm AP"))
-        self.reason_input.setText(self.table.item(row, 6).text())
-        self.status_input.setCurrentText(self.table.item(row, 7).text())
+        self.doctor_input.setCurrentIndex(self.doctor_input.findData(row[9]))
+        self.date_input.setDate(QDate.fromString(row[4], "yyyy-MM-dd"))
+        if row[10] is not None:
+            self.time_input.setTime(QTime(row[10] // 60, row[10] % 60))
+        self.reason_input.setText(row[6] or "")
+        self.status_input.setCurrentText(row[7] or "")
 
+    def on_search_results(self, text, rows):
+        self.keyword = text
+        self.model.load_first_page(rows)
 
+    def fetch_page(self, after_id, limit):
+        return self.db.get_page(after_id, limit, self.keyword)
 
     def refresh_table(self):
-        keyword = self.search_input.text().lower()
-        self.table.setRowCount(0)
-
-        for row in self.db.get_all():
-            # row = [id, patient_name, patient_phone, doctor_name, date, time, reason, status]
-            if keyword:
-                if not (
-                    keyword in str(row[1]).lower()
-                    or keyword in str(row[2]).lower()
-                    or keyword in str(row[3]).lower()
-                    or keyword in str(row[7]).lower()
-                ):
-                    continue
-
-            row_index = self.table.rowCount()
-            self.table.insertRow(row_index)
-
-            status = str(row[7]).lower()
-
-            if status == "pending":
-                background_color = QColor("#FFFACD")
-            elif status == "cancelled":
-                background_color = QColor("#F08080")
-            elif status == "completed":
-                background_color = QColor("#90EE90")
-            else:
-                background_color = QColor("white")
-
-            for col, val in enumerate(row):
-                if col == 5:  # Time formatting
-                    try:
-                        time_obj = QTime.fromString(val, "HH:mm")
-                        val = time_obj.toString("hh:mm AP")
-                    except Exception:
-                        pass
-
-                item = QTableWidgetItem(str(val))
-                item.setBackground(background_color)
-                self.table.setItem(row_index, col, item)
+        self.keyword = self.search_input.text().strip()
+        self.model.reload()
+
+    def on_change(self, event):
+        """Patch the table and pickers for one database write."""
+        if event.op == events.RELOAD:
+            self.refresh_dropdowns()
+            self.refresh_table()
+        elif event.entity == events.APPOINTMENT:
+            self.model.patch_row(event.id, self.db.get_row(event.id, self.keyword))
+        elif event.entity == events.PATIENT:
+            if self.selected_patient_id is None:
+                self.patient_search.trigger()
+            patient = patients.get(event.id) if event.op == events.UPDATE else None
+            if patient:
+                self.model.update_rows(
+                    lambda row: row[8] == event.id,
+                    lambda row: (row[0], patient.name, patient.phone) + row[3:],
+                )
+        elif event.entity == events.DOCTOR:
+            name = reference.doctors.name(event.id) if event.op == events.UPDATE else None
+            if name:
+                self.model.update_rows(
+                    lambda row: row[9] == event.id,
+                    lambda row: row[:3] + (name,) + row[4:],
+                )
+
+    def export(self):
+        """Export every appointment matching the current search, not just the loaded rows."""
+        export_view(self, "appointments", self.keyword)
 
     def clear_form(self):
         self.selected_id = None
         self.selected_patient_id = None
         self.patient_search_input.clear()
+        self.patient_search.cancel()
         self.patient_list_widget.clear()
         self.doctor_input.setCurrentIndex(0)
         self.date_input.setDate(QDate.currentDate())
         self.time_input.setTime(QTime.currentTime())
         self.reason_input.clear()
         self.status_input.setCurrentIndex(0)
+
+
+# minute of day -> "hh:mm AM", built once instead of parsing every cell on every paint
+TIME_LABELS = tuple(f"{hour % 12 or 12:02d}:{minute:02d} {'PM' if hour >= 12 else 'AM'}"
+                    for hour in range(24) for minute in range(60))
+
+
+def format_minute(minute):
+    # minute_of_day takes "25:70" at face value; such times get no label
+    if minute is None or not 0 <= minute < len(TIME_LABELS):
+        return ""
+    return TIME_LABELS[minute]
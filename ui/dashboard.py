@@ -1,25 +1,71 @@
+import sqlite3
+
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
-    QTableWidget, QTableWidgetItem, QGroupBox, QCalendarWidget,
-    QTabWidget
+    QTableView, QGroupBox,
+    QTabWidget, QPushButton
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import QDate, QRunnable, QThreadPool, QTimer
 from PyQt6.QtGui import QColor
-from database.clinic_db import PatientDB
-from database.doctor_db import DoctorDB
+from database import events
 from database.appointment_db import AppointmentDB
+from database.clinic_db import PatientDB
+from database.connection import get_read_connection
+from database.day_cache import PREFETCH_DAYS, DayCache, around
 from database.followup_db import FollowUpDB
+from database.stats_db import StatsDB
+from ui.events import bridge
+from ui.load_calendar import LoadCalendar
+from ui.table_model import PagedTableModel
+
+PREFETCH_DELAY_MS = 150  # read ahead once the user pauses, not while the table is painting
+
+DASHBOARD_STATUS_COLORS = {
+    "pending": QColor("#fff3cd"),
+    "cancelled": QColor("#f8d7da"),
+    "completed": QColor("#d4edda"),
+}
+
+
+class _PrefetchTask(QRunnable):
+    def __init__(self, cache, dates):
+        super().__init__()
+        self.cache = cache
+        self.dates = dates
+
+    def run(self):
+        try:
+            self.cache.prefetch(self.dates, get_read_connection())
+        except sqlite3.Error:
+            pass  # best effort: a day that failed is simply read when it is shown
 
 
 class Dashboard(QWidget):
-    def __init__(self):
+    def __init__(self, prefetch_days=PREFETCH_DAYS):
         super().__init__()
-        self.patient_db = PatientDB()
-        self.doctor_db = DoctorDB()
         self.appointment_db = AppointmentDB()
         self.followup_db = FollowUpDB()
+        self.stats_db = StatsDB()
+        self.patient_db = PatientDB()
+
+        # one day's table rows per date; the days either side of the shown
+        # one are read ahead on the thread pool
+        self.prefetch_days = prefetch_days
+        self.appt_days = DayCache(
+            events.APPOINTMENT, lambda conn, day: AppointmentDB(conn).get_by_date_with_patient(day)
+        )
+        self.fup_days = DayCache(
+            events.FOLLOWUP, lambda conn, day: FollowUpDB(conn).get_by_date_with_patient(day),
+            patient_column=2,
+        )
+        self._prefetch_around = {}  # cache -> date whose neighbours to read next
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self._prefetch_timer.timeout.connect(self._start_prefetch)
 
         self.initUI()
+        bridge().changed.connect(self.on_change)
 
     def initUI(self):
         main_layout = QVBoxLayout()
@@ -30,8 +76,10 @@ class Dashboard(QWidget):
         self.total_doctors = QLabel("Doctors: 0")
         self.today_appts = QLabel("Today Appointments: 0")
         self.pending_followups = QLabel("Pending Follow-Ups: 0")
+        self.overdue_followups = QLabel("Overdue Follow-Ups: 0")
 
-        for label in [self.total_patients, self.total_doctors, self.today_appts, self.pending_followups]:
+        for label in [self.total_patients, self.total_doctors, self.today_appts,
+                      self.pending_followups, self.overdue_followups]:
             label.setStyleSheet("font-size: 16px; font-weight: bold; padding: 8px;")
             summary_layout.addWidget(label)
 
@@ -44,7 +92,7 @@ class Dashboard(QWidget):
         appt_layout = QVBoxLayout()
 
         appt_controls_layout = QHBoxLayout()
-        self.appt_calendar = QCalendarWidget()
+        self.appt_calendar = LoadCalendar(events.APPOINTMENT, self.appointment_db.count_by_day)
         self.appt_calendar.setGridVisible(True)
         self.appt_calendar.setSelectedDate(QDate.currentDate())
         self.appt_calendar.selectionChanged.connect(self.on_appt_calendar_date_selected)
@@ -56,13 +104,31 @@ class Dashboard(QWidget):
         self.appt_search_input.setPlaceholderText("🔍 Search Appointments by patient name or phone...")
         self.appt_search_input.textChanged.connect(self.refresh_appointments)
         appt_search_layout.addWidget(self._group_box("Search Patient", self.appt_search_input))
+        self.appt_print_btn = QPushButton("🖨️ Print List")
+        self.appt_print_btn.clicked.connect(
+            lambda: self.print_list("appointments", self.appt_calendar.selectedDate())
+        )
+        appt_search_layout.addWidget(self.appt_print_btn)
+        self.schedules_btn = QPushButton("🗂️ Doctor Schedules")
+        self.schedules_btn.clicked.connect(
+            lambda: self.print_schedules(self.appt_calendar.selectedDate())
+        )
+        appt_search_layout.addWidget(self.schedules_btn)
+        appt_search_layout.addStretch()
 
         appt_controls_layout.addLayout(appt_search_layout)
         appt_layout.addLayout(appt_controls_layout)
 
         # Appointment table with new columns
-        self.appt_table = QTableWidget(0, 7)
-        self.appt_table.setHorizontalHeaderLabels(["Date", "Time", "Reason", "Patient", "Phone", "Doctor", "Status"])
+        # rows come from get_by_date_with_patient
+        self.appt_model = PagedTableModel(
+            ["Date", "Time", "Reason", "Patient", "Phone", "Doctor", "Status"],
+            columns=[1, 2, 3, 5, 6, 8, 9],
+            status_index=9,
+            status_colors=DASHBOARD_STATUS_COLORS,
+        )
+        self.appt_table = QTableView()
+        self.appt_table.setModel(self.appt_model)
         for i, width in enumerate([90, 70, 150, 130, 110, 130, 90]):
             self.appt_table.setColumnWidth(i, width)
 
@@ -75,7 +141,7 @@ class Dashboard(QWidget):
         fup_layout = QVBoxLayout()
 
         fup_controls_layout = QHBoxLayout()
-        self.fup_calendar = QCalendarWidget()
+        self.fup_calendar = LoadCalendar(events.FOLLOWUP, self.followup_db.count_by_day)
         self.fup_calendar.setGridVisible(True)
         self.fup_calendar.setSelectedDate(QDate.currentDate())
         self.fup_calendar.selectionChanged.connect(self.on_fup_calendar_date_selected)
@@ -87,15 +153,25 @@ class Dashboard(QWidget):
         self.fup_search_input.setPlaceholderText("🔍 Search Follow-Ups by patient name or phone...")
         self.fup_search_input.textChanged.connect(self.refresh_followups_for_date)
         fup_search_layout.addWidget(self._group_box("Search Patient", self.fup_search_input))
+        self.fup_print_btn = QPushButton("🖨️ Print List")
+        self.fup_print_btn.clicked.connect(
+            lambda: self.print_list("followups", self.fup_calendar.selectedDate())
+        )
+        fup_search_layout.addWidget(self.fup_print_btn)
+        fup_search_layout.addStretch()
 
         fup_controls_layout.addLayout(fup_search_layout)
         fup_layout.addLayout(fup_controls_layout)
 
         # Follow-up table with new columns
-        self.followup_table = QTableWidget(0, 7)
-        self.followup_table.setHorizontalHeaderLabels([
-            "Date", "Patient", "Phone", "Doctor", "Follow-Up Count", "Remarks", "Status"
-        ])
+        self.followup_model = PagedTableModel(
+            ["Date", "Patient", "Phone", "Doctor", "Follow-Up Count", "Remarks", "Status"],
+            columns=[1, 3, 4, 6, 7, 8, 9],
+            status_index=9,
+            status_colors=DASHBOARD_STATUS_COLORS,
+        )
+        self.followup_table = QTableView()
+        self.followup_table.setModel(self.followup_model)
         for i, width in enumerate([90, 130, 110, 130, 120, 180, 90]):
             self.followup_table.setColumnWidth(i, width)
 
@@ -106,11 +182,23 @@ class Dashboard(QWidget):
         main_layout.addWidget(self.tabs)
         self.setLayout(main_layout)
 
-        # Initial Data Load
+        # Data loads once the event loop runs, so the window paints first
+        QTimer.singleShot(0, self.load)
+
+    def load(self):
         self.refresh_summary()
         self.refresh_appointments()
         self.refresh_followups_for_date()
 
+    # ui.report pulls in fpdf; import it on first use to keep startup short
+    def print_list(self, kind, date):
+        from ui.report import print_list
+        return print_list(self, kind, date)
+
+    def print_schedules(self, date):
+        from ui.report import print_schedules
+        return print_schedules(self, date)
+
     def _group_box(self, title, widget):
         box = QGroupBox(title)
         layout = QVBoxLayout()
@@ -119,79 +207,91 @@ class Dashboard(QWidget):
         return box
 
     def refresh_summary(self):
-        patients = self.patient_db.get_all()
-        doctors = self.doctor_db.get_all()
         today = QDate.currentDate().toString("yyyy-MM-dd")
-        today_appts = self.appointment_db.get_by_date(today)
-        pending_fups = self.followup_db.get_by_status("Pending")
+        summary = self.stats_db.get_summary(today)
 
-        self.total_patients.setText(f"Patients: {len(patients)}")
-        self.total_doctors.setText(f"Doctors: {len(doctors)}")
-        self.today_appts.setText(f"Today Appointments: {len(today_appts)}")
-        self.pending_followups.setText(f"Pending Follow-Ups: {len(pending_fups)}")
+        self.total_patients.setText(f"Patients: {summary.patients}")
+        self.total_doctors.setText(f"Doctors: {summary.doctors}")
+        self.today_appts.setText(f"Today Appointments: {summary.today_appointments}")
+        self.today_appts.setToolTip("\n".join(
+            f"{status or 'No status'}: {count}" for status, count in summary.today_by_status.items()
+        ))
+        self.pending_followups.setText(f"Pending Follow-Ups: {summary.pending_followups}")
+        self.overdue_followups.setText(f"Overdue Follow-Ups: {summary.overdue_followups}")
 
     def refresh_appointments(self):
         keyword = self.appt_search_input.text().lower()
         selected_date = self.appt_calendar.selectedDate().toString("yyyy-MM-dd")
-        data = self.appointment_db.get_by_date(selected_date)
-
-        self.appt_table.setRowCount(0)
-        for row in data:
-            # [date, time, reason, patient, doctor, status]
-            date, time, reason, patient, doctor, status = row
-            phone = self.patient_db.get_phone_by_patient_name(patient) or ""
-
-            if keyword and (keyword not in patient.lower() and keyword not in phone):
-                continue
+        data = self.appt_days.get(selected_date, self.appointment_db.conn)
 
-            row_pos = self.appt_table.rowCount()
-            self.appt_table.insertRow(row_pos)
-
-            values = [date, time, reason, patient, phone, doctor, status]
-            for col, val in enumerate(values):
-                self.appt_table.setItem(row_pos, col, QTableWidgetItem(str(val)))
-
-            self._set_row_color(self.appt_table, row_pos, status)
+        # [id, date, time, reason, patient_id, patient, phone, doctor_id, doctor, status]
+        if keyword:
+            data = [row for row in data if keyword in row[5].lower() or keyword in (row[6] or "")]
+        self.appt_model.set_rows(data)
+        self.prefetch(self.appt_days, selected_date)
 
     def refresh_followups_for_date(self):
         keyword = self.fup_search_input.text().lower()
         selected_date = self.fup_calendar.selectedDate().toString("yyyy-MM-dd")
-        data = self.followup_db.get_by_date(selected_date)
-
-        self.followup_table.setRowCount(0)
-        for row in data:
-            # [date, patient, doctor, followup_count, remarks, status]
-            date, patient, doctor, followup_count, remarks, status = row
-            phone = self.patient_db.get_phone_by_patient_name(patient) or ""
-
-            if keyword and (keyword not in patient.lower() and keyword not in phone):
-                continue
-
-            row_pos = self.followup_table.rowCount()
-            self.followup_table.insertRow(row_pos)
-
-            values = [date, patient, phone, doctor, followup_count, remarks, status]
-            for col, val in enumerate(values):
-                self.followup_table.setItem(row_pos, col, QTableWidgetItem(str(val)))
+        data = self.fup_days.get(selected_date, self.followup_db.conn)
+
+        # [id, date, patient_id, patient, phone, doctor_id, doctor, followup_count, remarks, status]
+        if keyword:
+            data = [row for row in data if keyword in row[3].lower() or keyword in (row[4] or "")]
+        self.followup_model.set_rows(data)
+        self.prefetch(self.fup_days, selected_date)
+
+    def prefetch(self, cache, date_str):
+        """Read the days around date_str into cache in the background, shortly."""
+        self._prefetch_around[cache] = date_str
+        self._prefetch_timer.start()
+
+    def _start_prefetch(self):
+        for cache, date_str in self._prefetch_around.items():
+            dates = cache.missing(around(date_str, self.prefetch_days))
+            if dates:
+                QThreadPool.globalInstance().start(_PrefetchTask(cache, dates))
+        self._prefetch_around.clear()
+
+    def appointments_changed(self, dates, patient_ids=()):
+        """Apply an appointment write: counters always, the table only for its day."""
+        self.refresh_summary()
+        if self.appt_calendar.selectedDate().toString("yyyy-MM-dd") in dates:
+            self.refresh_appointments()
 
-            self._set_row_color(self.followup_table, row_pos, status)
+    def followups_changed(self, dates, patient_ids=()):
+        """Apply a follow-up write; other days only need their patients' counts."""
+        self.refresh_summary()
+        if self.fup_calendar.selectedDate().toString("yyyy-MM-dd") in dates:
+            self.refresh_followups_for_date()
+            return
+        counts = self.patient_db.get_counts(patient_ids)
+        self.followup_model.update_rows(
+            lambda row: row[2] in counts,
+            lambda row: row[:7] + (counts[row[2]][1],) + row[8:],
+        )
+
+    def on_change(self, event):
+        # caches first, so the refreshes below re-read what the write changed
+        self.appt_days.on_change(event)
+        self.fup_days.on_change(event)
+        if event.op == events.RELOAD:
+            self.refresh_summary()
+            self.refresh_appointments()
+            self.refresh_followups_for_date()
+        elif event.entity == events.APPOINTMENT:
+            self.appointments_changed(event.dates, event.patient_ids)
+        elif event.entity == events.FOLLOWUP:
+            self.followups_changed(event.dates, event.patient_ids)
+        elif event.entity in (events.PATIENT, events.DOCTOR):
+            self.refresh_summary()
+            if event.op != events.INSERT:
+                # names on either day may be stale, or their rows gone
+                self.refresh_appointments()
+                self.refresh_followups_for_date()
 
     def on_appt_calendar_date_selected(self):
         self.refresh_appointments()
 
     def on_fup_calendar_date_selected(self):
         self.refresh_followups_for_date()
-
-    def _set_row_color(self, table, row_index, status):
-        color = "#ffffff"
-        if status.lower() == "pending":
-            color = "#fff3cd"
-        elif status.lower() == "cancelled":
-            color = "#f8d7da"
-        elif status.lower() == "completed":
-            color = "#d4edda"
-
-        for col in range(table.columnCount()):
-            item = table.item(row_index, col)
-            if item:
-                item.setBackground(QColor(color))
@@ -1,11 +1,17 @@
 # ui/doctors.py
 
+import sqlite3
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox,
-    QPushButton, QTableWidget, QTableWidgetItem, QLabel, QMessageBox,QFormLayout,QFrame
+    QPushButton, QTableView, QLabel, QMessageBox,QFormLayout,QFrame
 )
+from database import events
 from database.doctor_db import DoctorDB
-from database.setting_db import SpecializationDB
+from ui.events import bridge
+from ui.export import export_view
+from ui.reference_models import specialization_model
+from ui.table_model import PagedTableModel
 
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
@@ -18,9 +24,9 @@ class DoctorManagement(QWidget):
         self.setWindowTitle("Doctor Management")
         self.setGeometry(100, 100, 700, 400)
         self.db = DoctorDB()
-        self.spec_db = SpecializationDB()
         self.selected_id = None
         self.initUI()
+        bridge().changed.connect(self.on_change)
 
 
 
@@ -45,10 +51,10 @@ class DoctorManagement(QWidget):
         self.name_input.setMinimumHeight(35)
 
         self.spec_input = QComboBox()
+        self.spec_input.setModel(specialization_model())
         self.spec_input.setFont(input_font)
         self.spec_input.setMinimumWidth(400)
         self.spec_input.setMinimumHeight(35)
-        self.refresh_specialization_dropdown()
 
         form_layout.addRow("👨‍⚕️ Name:", self.name_input)
         form_layout.addRow("🔬 Specialization:", self.spec_input)
@@ -83,13 +89,15 @@ class DoctorManagement(QWidget):
         update_btn = styled_button("🔄 Update", "#007bff")
         delete_btn = styled_button("🗑️ Delete", "#dc3545")
         clear_btn = styled_button("🧹 Clear", "#6c757d")
+        export_btn = styled_button("📤 Export", "#17a2b8")
 
         add_btn.clicked.connect(self.add_doctor)
         update_btn.clicked.connect(self.update_doctor)
         delete_btn.clicked.connect(self.delete_doctor)
         clear_btn.clicked.connect(self.clear_form)
+        export_btn.clicked.connect(self.export)
 
-        for btn in [add_btn, update_btn, delete_btn, clear_btn]:
+        for btn in [add_btn, update_btn, delete_btn, clear_btn, export_btn]:
             button_layout.addWidget(btn)
 
         top_layout.addLayout(button_layout, 1)
@@ -111,12 +119,12 @@ class DoctorManagement(QWidget):
         main_layout.addWidget(self.search_input)
 
         # 📊 Doctor Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["ID", "Name", "Specialization"])
+        self.model = PagedTableModel(["ID", "Name", "Specialization"], fetch_page=self.fetch_page)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setFont(QFont("Arial", 11))
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ccc;
                 background-color: #f9f9f9;
             }
@@ -129,8 +137,8 @@ class DoctorManagement(QWidget):
         """)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.cellClicked.connect(self.table_clicked)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.clicked.connect(self.table_clicked)
 
         main_layout.addWidget(self.table)
         self.setLayout(main_layout)
@@ -139,12 +147,6 @@ class DoctorManagement(QWidget):
 
 
 
-    def refresh_specialization_dropdown(self):
-        self.spec_input.clear()
-        self.specializations = self.spec_db.get_all()
-        for sid, name in self.specializations:
-            self.spec_input.addItem(name, sid)
-
     def get_selected_spec_id(self):
         return self.spec_input.currentData()
 
@@ -153,7 +155,6 @@ class DoctorManagement(QWidget):
         spec_id = self.get_selected_spec_id()
         if name and spec_id is not None:
             self.db.insert(name, spec_id)
-            self.refresh_table()
             self.clear_form()
         else:
             QMessageBox.warning(self, "Missing Fields", "Both name and specialization are required.")
@@ -166,32 +167,43 @@ class DoctorManagement(QWidget):
         spec_id = self.get_selected_spec_id()
         if name and spec_id is not None:
             self.db.update(self.selected_id, name, spec_id)
-            self.refresh_table()
             self.clear_form()
 
     def delete_doctor(self):
         if self.selected_id is None:
             QMessageBox.warning(self, "No Selection", "Please select a doctor to delete.")
             return
-        self.db.delete(self.selected_id)
-        self.refresh_table()
+        try:
+            self.db.delete(self.selected_id)
+        except sqlite3.IntegrityError:
+            QMessageBox.warning(self, "In Use", "This doctor still has follow-ups and cannot be deleted.")
+            return
         self.clear_form()
 
-    def table_clicked(self, row, col):
-        self.selected_id = int(self.table.item(row, 0).text())
-        self.name_input.setText(self.table.item(row, 1).text())
-        specialization = self.table.item(row, 2).text()
-        index = self.spec_input.findText(specialization)
+    def table_clicked(self, index):
+        self.selected_id, name, specialization = self.model.row_at(index.row())
+        self.name_input.setText(name)
+        index = self.spec_input.findText(specialization or "")
         if index >= 0:
             self.spec_input.setCurrentIndex(index)
 
+    def fetch_page(self, after_id, limit):
+        return self.db.get_page(after_id, limit, self.search_input.text().strip())
+
     def refresh_table(self):
-        self.table.setRowCount(0)
-        for row in self.db.get_all():
-            row_index = self.table.rowCount()
-            self.table.insertRow(row_index)
-            for col, val in enumerate(row):
-                self.table.setItem(row_index, col, QTableWidgetItem(str(val)))
+        self.model.reload()
+
+    def on_change(self, event):
+        if event.op == events.RELOAD or (
+                event.entity == events.SPECIALIZATION and event.op != events.INSERT):
+            # a deleted specialization shows on any number of rows
+            self.refresh_table()
+        elif event.entity == events.DOCTOR:
+            self.model.patch_row(event.id, self.db.get_row(event.id, self.search_input.text().strip()))
+
+    def export(self):
+        """Export every doctor matching the current search, not just the loaded rows."""
+        export_view(self, "doctors", self.search_input.text().strip())
 
     def clear_form(self):
         self.selected_id = None
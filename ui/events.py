@@ -0,0 +1,34 @@
+# ui/events.py
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from database import events
+
+
+class EventBridge(QObject):
+    """Re-emits database change events as a Qt signal.
+
+    Slots connected to `changed` run on their own object's thread, so
+    writes published from worker threads still reach widgets safely on
+    the GUI thread.
+    """
+
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._unsubscribe = events.subscribe(self.changed.emit)
+
+    def close(self):
+        self._unsubscribe()
+
+
+_bridge = None
+
+
+def bridge():
+    """The process-wide EventBridge, created on first use."""
+    global _bridge
+    if _bridge is None:
+        _bridge = EventBridge()
+    return _bridge
@@ -0,0 +1,79 @@
+# ui/export.py
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from database.connection import get_read_connection
+from database.export import ExportCancelled, export_rows
+
+
+class _ExportSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(int)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class ExportTask(QRunnable):
+    """Runs database.export.export_rows on a pool thread."""
+
+    def __init__(self, entity, path, keyword=""):
+        super().__init__()
+        self.entity = entity
+        self.path = path
+        self.keyword = keyword
+        self.signals = _ExportSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            count = export_rows(
+                self.entity, self.path, self.keyword, conn=get_read_connection(),
+                progress=self.signals.progress.emit, is_cancelled=self._cancel.is_set,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+        else:
+            self.signals.finished.emit(count)
+
+
+def export_view(parent, entity, keyword="", title="Export"):
+    """Ask for a file and export entity's rows matching keyword in the background."""
+    path, _ = QFileDialog.getSaveFileName(
+        parent, title, f"{entity}.csv", "CSV (*.csv);;JSON Lines (*.jsonl)"
+    )
+    if not path:
+        return None
+
+    task = ExportTask(entity, path, keyword)
+    dialog = QProgressDialog(f"Exporting {entity}...", "Cancel", 0, 0, parent)
+    dialog.setWindowTitle(title)
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.canceled.connect(task.cancel)
+
+    def done():
+        dialog.canceled.disconnect(task.cancel)
+        dialog.close()
+
+    def finished(count):
+        done()
+        QMessageBox.information(parent, title, f"Exported {count} {entity} to {path}.")
+
+    def failed(message):
+        done()
+        QMessageBox.warning(parent, title, f"Export failed: {message}")
+
+    task.signals.progress.connect(lambda count: dialog.setLabelText(f"Exported {count} {entity}..."))
+    task.signals.finished.connect(finished)
+    task.signals.cancelled.connect(done)
+    task.signals.failed.connect(failed)
+    QThreadPool.globalInstance().start(task)
+    return task
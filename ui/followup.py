@@ -1,15 +1,20 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QComboBox, QDateEdit, QTableWidget, QTableWidgetItem, QMessageBox,
+    QComboBox, QDateEdit, QTableView, QMessageBox,
     QListWidget, QListWidgetItem, QSizePolicy,QFormLayout,QFrame
 )
 from PyQt6.QtCore import QDate, Qt
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtGui import QFont
 
 from database.followup_db import FollowUpDB
+from database import events, reference
 from database.clinic_db import PatientDB
-from database.setting_db import StatusDB
-from database.doctor_db import DoctorDB  # ⬅️ You need to have this
+from database.patient_index import patients
+from ui.events import bridge
+from ui.export import export_view
+from ui.reference_models import doctor_model, status_model
+from ui.search_controller import SearchController
+from ui.table_model import PAGE_SIZE, PagedTableModel
 
 class FollowUpManager(QWidget):
     def __init__(self):
@@ -18,11 +23,11 @@ class FollowUpManager(QWidget):
         self.setGeometry(100, 100, 1100, 500)
         self.db = FollowUpDB()
         self.patient_db = PatientDB()
-        self.status_db = StatusDB()
-        self.doctor_db = DoctorDB()
         self.selected_id = None
+        self.keyword = ""
         self.selected_patient_id = None
         self.initUI()
+        bridge().changed.connect(self.on_change)
 
     def initUI(self):
         main_layout = QVBoxLayout()
@@ -42,7 +47,10 @@ class FollowUpManager(QWidget):
         self.patient_search_input.setFont(input_font)
         self.patient_search_input.setMinimumWidth(400)
         self.patient_search_input.setMinimumHeight(35)
-        self.patient_search_input.textChanged.connect(self.on_patient_search)
+        self.patient_search = SearchController(
+            self.patient_search_input, lambda conn, text: PatientDB(conn).search(text)
+        )
+        self.patient_search.results_ready.connect(self.show_patient_matches)
 
         self.patient_list_widget = QListWidget()
         self.patient_list_widget.setMaximumHeight(80)
@@ -50,12 +58,14 @@ class FollowUpManager(QWidget):
 
         # Doctor
         self.doctor_input = QComboBox()
+        self.doctor_input.setModel(doctor_model())
         self.doctor_input.setFont(input_font)
         self.doctor_input.setMinimumWidth(400)
         self.doctor_input.setMinimumHeight(35)
 
         # Status
         self.status_input = QComboBox()
+        self.status_input.setModel(status_model())
         self.status_input.setFont(input_font)
         self.status_input.setMinimumWidth(400)
         self.status_input.setMinimumHeight(35)
@@ -111,13 +121,15 @@ class FollowUpManager(QWidget):
         self.update_btn = styled_button("🔄 Update", "#007bff")
         self.delete_btn = styled_button("🗑️ Delete", "#dc3545")
         self.clear_btn = styled_button("🧹 Clear", "#6c757d")
+        self.export_btn = styled_button("📤 Export", "#17a2b8")
 
         self.add_btn.clicked.connect(self.add_followup)
         self.update_btn.clicked.connect(self.update_followup)
         self.delete_btn.clicked.connect(self.delete_followup)
         self.clear_btn.clicked.connect(self.clear_form)
+        self.export_btn.clicked.connect(self.export)
 
-        for btn in [self.add_btn, self.update_btn, self.delete_btn, self.clear_btn]:
+        for btn in [self.add_btn, self.update_btn, self.delete_btn, self.clear_btn, self.export_btn]:
             button_layout.addWidget(btn)
 
         button_layout.addStretch()
@@ -137,18 +149,25 @@ class FollowUpManager(QWidget):
         self.search_input.setFont(input_font)
         self.search_input.setMinimumHeight(40)
         self.search_input.setStyleSheet("padding: 6px;")
-        self.search_input.textChanged.connect(self.refresh_table)
+        self.search = SearchController(
+            self.search_input,
+            lambda conn, text: FollowUpDB(conn).get_page(None, PAGE_SIZE, text),
+        )
+        self.search.results_ready.connect(self.on_search_results)
         main_layout.addWidget(self.search_input)
 
         # --- Table View ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Patient", "Phone", "Doctor", "Date", "Remarks", "Status", "Follow-up Count"
-        ])
+        # rows: [id, patient, phone, doctor, date, remarks, status, count, patient_id, doctor_id]
+        self.model = PagedTableModel(
+            ["ID", "Patient", "Phone", "Doctor", "Date", "Remarks", "Status", "Follow-up Count"],
+            fetch_page=self.fetch_page,
+            status_index=6,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setFont(QFont("Arial", 11))
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ccc;
                 background-color: #f9f9f9;
             }
@@ -161,8 +180,8 @@ class FollowUpManager(QWidget):
         """)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.cellClicked.connect(self.table_clicked)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.clicked.connect(self.table_clicked)
 
         main_layout.addWidget(self.table)
 
@@ -172,35 +191,24 @@ class FollowUpManager(QWidget):
         self.refresh_table()
 
 
-    def on_patient_search(self, text):
-        self.load_patient_list(text)
-
     def on_patient_selected(self, item):
         self.selected_patient_id = item.data(Qt.ItemDataRole.UserRole)
         self.patient_search_input.setText(item.text())
+        self.patient_search.cancel()
         self.patient_list_widget.clear()
 
     def load_patient_list(self, filter_text=""):
+        self.show_patient_matches(filter_text, self.patient_db.search(filter_text))
+
+    def show_patient_matches(self, _text, patients):
         self.patient_list_widget.clear()
-        patients = self.patient_db.get_all()
-        filter_text = filter_text.lower()
         for pid, name, phone in patients:
-            if filter_text in name.lower() or filter_text in phone.lower():
-                item = QListWidgetItem(f"{name} ({phone})")
-                item.setData(Qt.ItemDataRole.UserRole, pid)
-                self.patient_list_widget.addItem(item)
+            item = QListWidgetItem(f"{name} ({phone})")
+            item.setData(Qt.ItemDataRole.UserRole, pid)
+            self.patient_list_widget.addItem(item)
 
     def refresh_dropdowns(self):
-        # Status
-        self.status_input.clear()
-        for sid, name in self.status_db.get_all():
-            self.status_input.addItem(name, sid)
-
-        # Doctor
-        self.doctor_input.clear()
-        for did, name in self.doctor_db.get_all():
-            self.doctor_input.addItem(name, did)
-
+        # Doctors and statuses come from the shared reference models
         self.load_patient_list()
 
     def get_selected_ids(self):
@@ -216,7 +224,6 @@ class FollowUpManager(QWidget):
             return
 
         self.db.insert(patient_id, doctor_id, date, remarks, status_id)
-        self.refresh_table()
         self.clear_form()
 
     def update_followup(self):
@@ -229,7 +236,6 @@ class FollowUpManager(QWidget):
         remarks = self.remarks_input.text().strip()
 
         self.db.update(self.selected_id, patient_id, doctor_id, date, remarks, status_id)
-        self.refresh_table()
         self.clear_form()
 
     def delete_followup(self):
@@ -238,67 +244,77 @@ class FollowUpManager(QWidget):
             return
 
         self.db.delete(self.selected_id)
-        self.refresh_table()
         self.clear_form()
 
-    def table_clicked(self, row, col):
-        self.selected_id = int(self.table.item(row, 0).text())
-        patient_name = self.table.item(row, 1).text()
-        patient_phone = self.table.item(row, 2).text()
-        doctor_name = self.table.item(row, 3).text()
+    def table_clicked(self, index):
+        row = self.model.row_at(index.row())
+        self.selected_id = row[0]
+
+        # rows carry the patient id, so this is a dictionary lookup
+        self.selected_patient_id = row[8]
+        patient = patients.get(row[8])
+        self.patient_search_input.setText(patient.label() if patient else "")
+        self.patient_search.cancel()
+
+        self.date_input.setDate(QDate.fromString(row[4], "yyyy-MM-dd"))
+        self.remarks_input.setText(row[5] or "")
+        self.status_input.setCurrentText(row[6] or "")
+        self.doctor_input.setCurrentIndex(self.doctor_input.findData(row[9]))
 
-        for pid, name, phone in self.patient_db.get_all():
-            if name == patient_name and phone == patient_phone:
-                self.selected_patient_id = pid
-                self.patient_search_input.setText(f"{name} ({phone})")
-                break
+    def on_search_results(self, text, rows):
+        self.keyword = text
+        self.model.load_first_page(rows)
 
-        self.date_input.setDate(QDate.fromString(self.table.item(row, 4).text(), "yyyy-MM-dd"))
-        self.remarks_input.setText(self.table.item(row, 5).text())
-        self.status_input.setCurrentText(self.table.item(row, 6).text())
-        self.doctor_input.setCurrentText(doctor_name)
+    def fetch_page(self, after_id, limit):
+        return self.db.get_page(after_id, limit, self.keyword)
 
     def refresh_table(self):
-        keyword = self.search_input.text().lower()
-        rows = self.db.get_all()
-
-        self.table.setRowCount(0)
-        for row in rows:
-            patient_name=""
-            patient_phone=""
-            doctor_name=""
-            try:
-                patient_name = row[1].lower()
-                patient_phone = row[2].lower()
-                doctor_name = row[3].lower()
-            except Exception as e:
-                pass
-
-            if keyword and keyword not in patient_name and keyword not in patient_phone and keyword not in doctor_name:
-                continue
-
-            row_index = self.table.rowCount()
-            self.table.insertRow(row_index)
-
-            status = str(row[6]).lower()
-            if status == "pending":
-                background_color = QColor("#FFFACD")
-            elif status == "cancelled":
-                background_color = QColor("#F08080")
-            elif status == "completed":
-                background_color = QColor("#90EE90")
-            else:
-                background_color = QColor("white")
-
-            for col, val in enumerate(row):
-                item = QTableWidgetItem(str(val))
-                item.setBackground(background_color)
-                self.table.setItem(row_index, col, item)
+        self.keyword = self.search_input.text().strip()
+        self.model.reload()
+
+    def on_change(self, event):
+        """Patch the table and pickers for one database write."""
+        if event.op == events.RELOAD:
+            self.refresh_dropdowns()
+            self.refresh_table()
+        elif event.entity == events.FOLLOWUP:
+            # every row shows its patient's follow-up count, so the other
+            # loaded rows of the patients involved change too
+            self.model.patch_row(event.id, self.db.get_row(event.id, self.keyword))
+            self.refresh_counts(event.patient_ids)
+        elif event.entity == events.PATIENT:
+            if self.selected_patient_id is None:
+                self.patient_search.trigger()
+            patient = patients.get(event.id) if event.op == events.UPDATE else None
+            if patient:
+                self.model.update_rows(
+                    lambda row: row[8] == event.id,
+                    lambda row: (row[0], patient.name, patient.phone) + row[3:],
+                )
+        elif event.entity == events.DOCTOR:
+            name = reference.doctors.name(event.id) if event.op == events.UPDATE else None
+            if name:
+                self.model.update_rows(
+                    lambda row: row[9] == event.id,
+                    lambda row: row[:3] + (name,) + row[4:],
+                )
+
+    def refresh_counts(self, patient_ids):
+        counts = self.patient_db.get_counts(patient_ids)
+        self.model.update_rows(
+            lambda row: row[8] in counts,
+            lambda row: row[:7] + (counts[row[8]][1],) + row[8:],
+        )
+
+    def export(self):
+        """Export every followup matching the current search, not just the loaded rows."""
+        export_view(self, "followups", self.keyword)
 
     def clear_form(self):
         self.selected_id = None
         self.selected_patient_id = None
         self.patient_search_input.clear()
+        self.patient_search.cancel()
         self.patient_list_widget.clear()
         self.doctor_input.setCurrentIndex(0)
         self.status_input.setCurrentIndex(0)
@@ -0,0 +1,122 @@
+# ui/load_calendar.py
+
+from collections import namedtuple
+
+from PyQt6.QtCore import QDate, QRect, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QCalendarWidget
+
+from database import events, reference
+from database.days import day_number
+from ui.events import bridge
+
+HEAT_COLOR = QColor("#007bff")
+STATUS_COLORS = {
+    "pending": QColor("#f0ad4e"),
+    "completed": QColor("#28a745"),
+    "cancelled": QColor("#dc3545"),
+}
+OTHER_COLOR = QColor("#6c757d")
+STRIP_HEIGHT = 4
+EPOCH_JULIAN = QDate(1970, 1, 1).toJulianDay()
+
+# first/last: day numbers covered; counts: {day: {status_id: count}}
+_Page = namedtuple("_Page", ["first", "last", "counts", "busiest"])
+
+
+class LoadCalendar(QCalendarWidget):
+    """Calendar that shows how busy each day is.
+
+    Days are shaded by their number of rows relative to the busiest day
+    on the page, with the split by status as a strip along the bottom
+    and the total in the corner. count_by_day(start, end) is the
+    count_by_day of AppointmentDB or FollowUpDB; it runs once for each
+    month page when the page is first painted, and the counts are kept
+    until a write to entity touches one of that page's days.
+    """
+
+    def __init__(self, entity, count_by_day, parent=None):
+        super().__init__(parent)
+        self.entity = entity
+        self.count_by_day = count_by_day
+        self._pages = {}  # (year, month) -> _Page
+        bridge().changed.connect(self.on_change)
+
+    def _page(self):
+        key = (self.yearShown(), self.monthShown())
+        page = self._pages.get(key)
+        if page is None:
+            page = self._pages[key] = self._load(*key)
+        return page
+
+    def _load(self, year, month):
+        # the grid starts at most 13 days before the 1st and spans six weeks
+        first_of_month = QDate(year, month, 1)
+        start, end = first_of_month.addDays(-13), first_of_month.addDays(41)
+        counts = {}
+        for day, status_id, count in self.count_by_day(start.toString("yyyy-MM-dd"),
+                                                       end.toString("yyyy-MM-dd")):
+            counts.setdefault(day, {})[status_id] = count
+        busiest = max((sum(by_status.values()) for by_status in counts.values()), default=0)
+        return _Page(start.toJulianDay() - EPOCH_JULIAN, end.toJulianDay() - EPOCH_JULIAN,
+                     counts, busiest)
+
+    def day_counts(self, date):
+        """{status_id: count} for a QDate on the page shown, or {} if it has none."""
+        return self._page().counts.get(date.toJulianDay() - EPOCH_JULIAN, {})
+
+    def paintCell(self, painter, rect, date):
+        super().paintCell(painter, rect, date)
+        page = self._page()
+        by_status = page.counts.get(date.toJulianDay() - EPOCH_JULIAN)
+        if not by_status:
+            return
+        total = sum(by_status.values())
+        painter.save()
+
+        heat = QColor(HEAT_COLOR)
+        heat.setAlpha(20 + 100 * total // page.busiest)
+        painter.fillRect(rect.adjusted(1, 1, -1, -1), heat)
+
+        # status strip, left to right in status id order
+        x, width = rect.left() + 1, rect.width() - 2
+        top = rect.bottom() - STRIP_HEIGHT
+        for index, (status_id, count) in enumerate(sorted(by_status.items(), key=_status_order)):
+            name = reference.statuses.name(status_id) or ""
+            segment = (rect.right() - x) if index == len(by_status) - 1 else width * count // total
+            painter.fillRect(QRect(x, top, segment, STRIP_HEIGHT),
+                             STATUS_COLORS.get(name.lower(), OTHER_COLOR))
+            x += segment
+
+        font = painter.font()
+        font.setPointSizeF(font.pointSizeF() * 0.7)
+        painter.setFont(font)
+        painter.setPen(QColor("#333333"))
+        painter.drawText(rect.adjusted(2, 1, -3, -STRIP_HEIGHT),
+                         Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignRight, str(total))
+        painter.restore()
+
+    def invalidate(self, dates=None):
+        """Drop cached counts for the pages showing dates ("yyyy-MM-dd"), or all of them."""
+        if dates is None:
+            self._pages.clear()
+        else:
+            days = [day_number(date) for date in dates if date]
+            for key, page in list(self._pages.items()):
+                if any(day is not None and page.first <= day <= page.last for day in days):
+                    del self._pages[key]
+        self.updateCells()
+
+    def on_change(self, event):
+        if event.op == events.RELOAD:
+            self.invalidate()
+        elif event.entity == self.entity:
+            self.invalidate(event.dates)
+        elif event.entity == events.STATUS:
+            # a deleted status leaves rows without one; renames only need a repaint
+            self.invalidate()
+
+
+def _status_order(item):
+    status_id = item[0]
+    return (status_id is None, status_id or 0)
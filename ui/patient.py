@@ -1,12 +1,21 @@
+import sqlite3
+
+from database import events
 from database.clinic_db import PatientDB
+from database.patient_index import patients
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QComboBox,
-    QTableWidget, QTableWidgetItem, QMessageBox, QSizePolicy,QFormLayout,QFrame
+    QTableView, QMessageBox, QSizePolicy,QFormLayout,QFrame
 )
 from PyQt6.QtCore import QDate, Qt
 from PyQt6.QtGui import QFont
 
+from ui.events import bridge
+from ui.export import export_view
+from ui.search_controller import SearchController
+from ui.table_model import PAGE_SIZE, PagedTableModel
+
 class PatientManagement(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -14,7 +23,9 @@ class PatientManagement(QMainWindow):
         self.setGeometry(100, 100, 1000, 700)
         self.db = PatientDB()
         self.selected_id = None
+        self.keyword = ""
         self.initUI()
+        bridge().changed.connect(self.on_change)
     
     def initUI(self):
         main_widget = QWidget()
@@ -106,13 +117,15 @@ class PatientManagement(QMainWindow):
         update_btn = styled_button("🔄 Update", "#007bff")
         delete_btn = styled_button("🗑️ Delete", "#dc3545")
         clear_btn = styled_button("🧹 Clear", "#6c757d")
+        export_btn = styled_button("📤 Export", "#17a2b8")
 
         add_btn.clicked.connect(self.add_patient)
         update_btn.clicked.connect(self.update_patient)
         delete_btn.clicked.connect(self.delete_patient)
         clear_btn.clicked.connect(self.clear_form)
+        export_btn.clicked.connect(self.export)
 
-        for btn in [add_btn, update_btn, delete_btn, clear_btn]:
+        for btn in [add_btn, update_btn, delete_btn, clear_btn, export_btn]:
             button_layout.addWidget(btn)
 
         top_layout.addLayout(button_layout, 1)
@@ -130,18 +143,23 @@ class PatientManagement(QMainWindow):
         self.search_input.setFont(font)
         self.search_input.setMinimumHeight(40)
         self.search_input.setStyleSheet("padding: 6px;")
-        self.search_input.textChanged.connect(self.refresh_table)
+        self.search = SearchController(
+            self.search_input,
+            lambda conn, text: PatientDB(conn).get_summary_page(None, PAGE_SIZE, text),
+        )
+        self.search.results_ready.connect(self.on_search_results)
         main_layout.addWidget(self.search_input)
 
         # 📊 Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
+        self.model = PagedTableModel(
+            ["ID", "Name", "Gender", "Age", "Phone", "Address", "Appointments", "Follow-Ups"],
+            fetch_page=self.fetch_page,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setFont(QFont("Arial", 11))
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Name", "Gender", "Age", "Phone", "Address", "Appointments", "Follow-Ups"
-        ])
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ccc;
                 background-color: #f9f9f9;
             }
@@ -154,8 +172,8 @@ class PatientManagement(QMainWindow):
         """)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.cellClicked.connect(self.table_clicked)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.clicked.connect(self.table_clicked)
 
         main_layout.addWidget(self.table)
 
@@ -170,8 +188,14 @@ class PatientManagement(QMainWindow):
         address = self.address_input.text()
 
         if name and phone:
+            existing = patients.find(name, phone)
+            if existing and QMessageBox.question(
+                self, "Already Registered",
+                f"{existing.label()} is already registered. Register another patient "
+                "with the same name and phone?",
+            ) != QMessageBox.StandardButton.Yes:
+                return
             self.db.insert_patient(name, gender, age, phone, address)
-            self.refresh_table()
             self.clear_form()
         else:
             QMessageBox.warning(self, "Missing Fields", "Name and phone number are required.")
@@ -188,7 +212,6 @@ class PatientManagement(QMainWindow):
         address = self.address_input.text()
 
         self.db.update_patient(self.selected_id, name, gender, age, phone, address)
-        self.refresh_table()
         self.clear_form()
 
     def delete_patient(self):
@@ -196,30 +219,49 @@ class PatientManagement(QMainWindow):
             QMessageBox.warning(self, "No Selection", "Select a patient to delete.")
             return
 
-        self.db.delete_patient(self.selected_id)
-        self.refresh_table()
+        try:
+            self.db.delete_patient(self.selected_id)
+        except sqlite3.IntegrityError:
+            QMessageBox.warning(self, "In Use", "This patient still has follow-ups and cannot be deleted.")
+            return
         self.clear_form()
 
-    def table_clicked(self, row, col):
-        self.selected_id = int(self.table.item(row, 0).text())
-        self.name_input.setText(self.table.item(row, 1).text())
-        self.gender_input.setCurrentText(self.table.item(row, 2).text())
-        self.age_input.setText(self.table.item(row, 3).text())
-        self.phone_number_input.setText(self.table.item(row, 4).text())
-        self.address_input.setText(self.table.item(row, 5).text())
+    def table_clicked(self, index):
+        pid, name, gender, age, phone, address = self.model.row_at(index.row())[:6]
+        self.selected_id = pid
+        self.name_input.setText(name or "")
+        self.gender_input.setCurrentText(gender or "")
+        self.age_input.setText(age or "")
+        self.phone_number_input.setText(phone or "")
+        self.address_input.setText(address or "")
+
+    def on_search_results(self, text, rows):
+        self.keyword = text
+        self.model.load_first_page(rows)
+
+    def fetch_page(self, after_id, limit):
+        return self.db.get_summary_page(after_id, limit, self.keyword)
 
     def refresh_table(self):
-        keyword = self.search_input.text().lower()
-        self.table.setRowCount(0)
-        data = self.db.get_all_with_summary()
-
-        for row in data:
-            if keyword and keyword not in row[1].lower() and keyword not in row[4]:
-                continue
-            row_idx = self.table.rowCount()
-            self.table.insertRow(row_idx)
-            for col, val in enumerate(row):
-                self.table.setItem(row_idx, col, QTableWidgetItem(str(val)))
+        self.keyword = self.search_input.text().strip()
+        self.model.reload()
+
+    def on_change(self, event):
+        if event.op == events.RELOAD:
+            self.refresh_table()
+        elif event.entity == events.PATIENT:
+            self.model.patch_row(event.id, self.db.get_summary_row(event.id, self.keyword))
+        elif event.entity in (events.APPOINTMENT, events.FOLLOWUP):
+            self.refresh_counts(event.patient_ids)
+
+    def refresh_counts(self, patient_ids):
+        """Update the appointment/follow-up counts of already loaded rows."""
+        counts = self.db.get_counts(patient_ids)
+        self.model.update_rows(lambda row: row[0] in counts, lambda row: row[:6] + counts[row[0]])
+
+    def export(self):
+        """Export every patient matching the current search, not just the loaded rows."""
+        export_view(self, "patients", self.keyword)
 
     def clear_form(self):
         self.selected_id = None
@@ -0,0 +1,83 @@
+# ui/reference_models.py
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from database import events, reference
+from ui.events import bridge
+
+
+class ReferenceListModel(QAbstractListModel):
+    """List model over a database.reference table, shared by every combo box.
+
+    Shows the name and exposes the id as UserRole, so QComboBox.currentData()
+    and findData() keep working. After a write it applies the difference row
+    by row rather than resetting, which keeps each combo's current item.
+    """
+
+    def __init__(self, table, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self._items = list(table.items())
+        bridge().changed.connect(self.on_change)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item_id, name = self._items[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return name
+        if role == Qt.ItemDataRole.UserRole:
+            return item_id
+        return None
+
+    def on_change(self, event):
+        if event.entity == self.table.entity:
+            self.sync()
+
+    def sync(self):
+        """Merge the table's current rows in; both lists are in id order."""
+        new = self.table.items()
+        pos = 0
+        for item in new:
+            while pos < len(self._items) and self._items[pos][0] < item[0]:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self._items[pos]
+                self.endRemoveRows()
+            if pos < len(self._items) and self._items[pos][0] == item[0]:
+                if self._items[pos] != item:
+                    self._items[pos] = item
+                    self.dataChanged.emit(self.index(pos), self.index(pos))
+            else:
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._items.insert(pos, item)
+                self.endInsertRows()
+            pos += 1
+        if pos < len(self._items):
+            self.beginRemoveRows(QModelIndex(), pos, len(self._items) - 1)
+            del self._items[pos:]
+            self.endRemoveRows()
+
+
+_models = {}
+
+
+def reference_model(entity):
+    """The shared model for events.DOCTOR, events.STATUS or events.SPECIALIZATION."""
+    if entity not in _models:
+        _models[entity] = ReferenceListModel(reference.TABLES[entity])
+    return _models[entity]
+
+
+def doctor_model():
+    return reference_model(events.DOCTOR)
+
+
+def status_model():
+    return reference_model(events.STATUS)
+
+
+def specialization_model():
+    return reference_model(events.SPECIALIZATION)
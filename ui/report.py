@@ -0,0 +1,151 @@
+# ui/report.py
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDateEdit, QDialog, QDialogButtonBox, QFileDialog, QFormLayout, QMessageBox, QProgressDialog
+)
+
+from database.connection import get_read_connection
+from reports.lists import LISTS, render_list
+from reports.pdf import ReportCancelled
+from reports.schedules import DEFAULT_DAYS, build_packs
+
+
+class _ReportSignals(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class ReportTask(QRunnable):
+    """Runs render(progress=..., is_cancelled=...) on a pool thread.
+
+    render is one of the reports functions with its other arguments bound;
+    it returns a count and raises ReportCancelled when cancelled.
+    """
+
+    def __init__(self, render):
+        super().__init__()
+        self.render = render
+        self.signals = _ReportSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            count = self.render(progress=self.signals.progress.emit, is_cancelled=self._cancel.is_set)
+        except ReportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+        else:
+            self.signals.finished.emit(count)
+
+
+class DateRangeDialog(QDialog):
+    """From/To date picker; both default to the given QDate unless end is given."""
+
+    def __init__(self, date, title, parent=None, end=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.start_input = QDateEdit(date)
+        self.end_input = QDateEdit(end or date)
+        for edit in (self.start_input, self.end_input):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+        self.start_input.dateChanged.connect(
+            lambda start: self.end_input.setDate(max(start, self.end_input.date()))
+        )
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QFormLayout()
+        layout.addRow("From:", self.start_input)
+        layout.addRow("To:", self.end_input)
+        layout.addRow(buttons)
+        self.setLayout(layout)
+
+    def dates(self):
+        start = self.start_input.date().toString("yyyy-MM-dd")
+        end = self.end_input.date().toString("yyyy-MM-dd")
+        return start, max(start, end)
+
+
+def _ask(parent, title, date, name, file_filter, end=None):
+    """Ask for a date range, then a file named name(start, end); None if either is cancelled."""
+    dialog = DateRangeDialog(date, title, parent, end)
+    if dialog.exec() != QDialog.DialogCode.Accepted:
+        return None
+    start, end = dialog.dates()
+    path, _ = QFileDialog.getSaveFileName(parent, title, name(start, end), file_filter)
+    return (path, start, end) if path else None
+
+
+def _start(parent, title, noun, path, render):
+    """Run render on the thread pool behind a cancellable progress dialog."""
+    task = ReportTask(render)
+    progress = QProgressDialog(f"Preparing {noun}...", "Cancel", 0, 0, parent)
+    progress.setWindowTitle(title)
+    progress.setWindowModality(Qt.WindowModality.WindowModal)
+    progress.setMinimumDuration(300)
+    progress.canceled.connect(task.cancel)
+
+    def advance(done, total):
+        progress.setMaximum(total)
+        progress.setValue(done)
+        progress.setLabelText(f"Printed {done} of {total} {noun}...")
+
+    def done():
+        progress.canceled.disconnect(task.cancel)
+        progress.close()
+
+    def finished(count):
+        done()
+        QMessageBox.information(parent, title, f"Wrote {count} {noun} to {path}.")
+
+    def failed(message):
+        done()
+        QMessageBox.warning(parent, title, f"Report failed: {message}")
+
+    task.signals.progress.connect(advance)
+    task.signals.finished.connect(finished)
+    task.signals.cancelled.connect(done)
+    task.signals.failed.connect(failed)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def print_list(parent, kind, date):
+    """Ask for a date range and a file, then render the kind list to PDF in the background."""
+    title = f"Print {LISTS[kind].title}"
+    answer = _ask(parent, title, date,
+                  lambda start, end: f"{kind}-{start}.pdf" if start == end else f"{kind}-{start}_{end}.pdf",
+                  "PDF (*.pdf)")
+    if not answer:
+        return None
+    path, start, end = answer
+    return _start(parent, title, kind, path, lambda **kw: render_list(
+        kind, path, start, end, conn=get_read_connection(), **kw
+    ))
+
+
+def print_schedules(parent, date):
+    """Ask for a date range and a file, then build every doctor's schedule pack into a zip."""
+    title = "Doctor Schedules"
+    answer = _ask(parent, title, date, lambda start, end: f"schedules-{start}.zip", "Zip (*.zip)",
+                  end=date.addDays(DEFAULT_DAYS - 1))
+    if not answer:
+        return None
+    path, start, end = answer
+    return _start(parent, title, "doctor schedules", path, lambda **kw: build_packs(
+        path, start, end, conn=get_read_connection(), **kw
+    ))
@@ -0,0 +1,86 @@
+# ui/search_controller.py
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from database.connection import get_read_connection
+
+SEARCH_DELAY_MS = 250
+
+
+class _SearchSignals(QObject):
+    finished = pyqtSignal(int, str, object)
+    failed = pyqtSignal(int, str)
+
+
+class _SearchTask(QRunnable):
+    def __init__(self, seq, text, query):
+        super().__init__()
+        self.seq = seq
+        self.text = text
+        self.query = query
+        self.signals = _SearchSignals()
+
+    def run(self):
+        try:
+            rows = self.query(get_read_connection(), self.text)
+        except Exception as exc:
+            self.signals.failed.emit(self.seq, str(exc))
+            return
+        self.signals.finished.emit(self.seq, self.text, rows)
+
+
+class SearchController(QObject):
+    """Debounces a QLineEdit and runs its query off the GUI thread.
+
+    query(conn, text) runs on a QThreadPool worker against that thread's
+    read-only connection. Only the result for the newest text is delivered
+    through results_ready; anything older is dropped.
+    """
+
+    results_ready = pyqtSignal(str, object)
+    search_failed = pyqtSignal(str)
+
+    def __init__(self, line_edit, query, delay=SEARCH_DELAY_MS, parent=None):
+        super().__init__(parent or line_edit)
+        self.line_edit = line_edit
+        self.query = query
+        self.pool = QThreadPool.globalInstance()
+        self._seq = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._start)
+        line_edit.textChanged.connect(self._on_text_changed)
+
+    def set_delay(self, delay):
+        self._timer.setInterval(delay)
+
+    def cancel(self):
+        """Forget pending and in-flight searches."""
+        self._timer.stop()
+        self._seq += 1
+
+    def trigger(self):
+        """Search for the current text right away."""
+        self._timer.stop()
+        self._start()
+
+    def _on_text_changed(self, _text):
+        self._seq += 1  # results already running are stale now
+        self._timer.start()
+
+    def _start(self):
+        self._seq += 1
+        task = _SearchTask(self._seq, self.line_edit.text().strip(), self.query)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.pool.start(task)
+
+    def _on_finished(self, seq, text, rows):
+        if seq == self._seq:
+            self.results_ready.emit(text, rows)
+
+    def _on_failed(self, seq, message):
+        if seq == self._seq:
+            self.search_failed.emit(message)
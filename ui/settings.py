@@ -1,10 +1,15 @@
 # ui/settings.py
 
+import sqlite3
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QTableWidget, QTableWidgetItem, QLabel, QMessageBox, QTabWidget
+    QTableWidget, QTableWidgetItem, QLabel, QMessageBox, QTabWidget,
+    QCheckBox, QSpinBox
 )
+from database import events, reference, tracing
 from database.setting_db import SpecializationDB, StatusDB
+from ui.events import bridge
 
 
 class SettingsWindow(QWidget):
@@ -12,7 +17,10 @@ class SettingsWindow(QWidget):
         super().__init__()
         self.setWindowTitle("Settings")
         self.setGeometry(150, 150, 600, 400)
+        self.spec_db = SpecializationDB()
+        self.status_db = StatusDB()
         self.initUI()
+        bridge().changed.connect(self.on_change)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -20,6 +28,10 @@ class SettingsWindow(QWidget):
 
         tabs.addTab(self.specialization_tab_ui(), "Doctor Specializations")
         tabs.addTab(self.status_tab_ui(), "Appointment Statuses")
+        tabs.addTab(self.diagnostics_tab_ui(), "Diagnostics")
+        tabs.currentChanged.connect(
+            lambda index: tabs.widget(index) is self.diagnostics_tab and self.refresh_diagnostics()
+        )
 
         layout.addWidget(tabs)
         self.setLayout(layout)
@@ -56,20 +68,27 @@ class SettingsWindow(QWidget):
     def add_specialization(self):
         name = self.spec_input.text().strip()
         if name:
-            SpecializationDB().insert(name)
-            self.refresh_spec_table()
+            self.spec_db.insert(name)
             self.spec_input.clear()
 
     def delete_specialization(self):
         selected = self.spec_table.currentRow()
         if selected != -1:
             spec_id = int(self.spec_table.item(selected, 0).text())
-            SpecializationDB().delete(spec_id)
+            self.spec_db.delete(spec_id)
+
+    def on_change(self, event):
+        if event.op == events.RELOAD:
+            self.refresh_spec_table()
+            self.refresh_status_table()
+        elif event.entity == events.SPECIALIZATION:
             self.refresh_spec_table()
+        elif event.entity == events.STATUS:
+            self.refresh_status_table()
 
     def refresh_spec_table(self):
         self.spec_table.setRowCount(0)
-        for row in SpecializationDB().get_all():
+        for row in reference.specializations.items():
             row_index = self.spec_table.rowCount()
             self.spec_table.insertRow(row_index)
             for col, val in enumerate(row):
@@ -107,21 +126,101 @@ class SettingsWindow(QWidget):
     def add_status(self):
         name = self.status_input.text().strip()
         if name:
-            StatusDB().insert(name)
-            self.refresh_status_table()
+            self.status_db.insert(name)
             self.status_input.clear()
 
     def delete_status(self):
         selected = self.status_table.currentRow()
         if selected != -1:
             status_id = int(self.status_table.item(selected, 0).text())
-            StatusDB().delete(status_id)
-            self.refresh_status_table()
+            try:
+                self.status_db.delete(status_id)
+            except sqlite3.IntegrityError:
+                QMessageBox.warning(self, "In Use", "This status is still used by follow-ups.")
+                return
 
     def refresh_status_table(self):
         self.status_table.setRowCount(0)
-        for row in StatusDB().get_all():
+        for row in reference.statuses.items():
             row_index = self.status_table.rowCount()
             self.status_table.insertRow(row_index)
             for col, val in enumerate(row):
                 self.status_table.setItem(row_index, col, QTableWidgetItem(str(val)))
+
+    # --- Diagnostics Tab (database.tracing) ---
+    def diagnostics_tab_ui(self):
+        self.diagnostics_tab = QWidget()
+        layout = QVBoxLayout()
+
+        # Controls
+        form = QHBoxLayout()
+        self.trace_check = QCheckBox("Trace queries")
+        self.trace_check.setChecked(tracing.enabled)
+        self.trace_check.toggled.connect(tracing.enable)
+        self.slow_input = QSpinBox()
+        self.slow_input.setRange(1, 60000)
+        self.slow_input.setSuffix(" ms")
+        self.slow_input.setValue(int(tracing.slow_ms))
+        self.slow_input.valueChanged.connect(tracing.set_threshold)
+        refresh_btn = QPushButton("Refresh")
+        reset_btn = QPushButton("Reset")
+        refresh_btn.clicked.connect(self.refresh_diagnostics)
+        reset_btn.clicked.connect(self.reset_diagnostics)
+        form.addWidget(self.trace_check)
+        form.addWidget(QLabel("Slow query threshold:"))
+        form.addWidget(self.slow_input)
+        form.addStretch()
+        form.addWidget(refresh_btn)
+        form.addWidget(reset_btn)
+
+        layout.addLayout(form)
+
+        self.histogram_label = QLabel()
+        layout.addWidget(self.histogram_label)
+
+        # Tables
+        layout.addWidget(QLabel(f"Queries (last {tracing.WINDOW}), slowest total first"))
+        self.query_table = QTableWidget()
+        self.query_table.setColumnCount(8)
+        self.query_table.setHorizontalHeaderLabels(
+            ["Method", "Calls", "Total ms", "p50 ms", "p95 ms", "Max ms", "Avg Rows", "Query"]
+        )
+        layout.addWidget(self.query_table)
+
+        layout.addWidget(QLabel(f"Slow queries (logged to {tracing.SLOW_LOG or 'memory only'})"))
+        self.slow_table = QTableWidget()
+        self.slow_table.setColumnCount(6)
+        self.slow_table.setHorizontalHeaderLabels(["Time", "Method", "ms", "Rows", "Params", "Plan"])
+        layout.addWidget(self.slow_table)
+
+        self.diagnostics_tab.setLayout(layout)
+        return self.diagnostics_tab
+
+    def reset_diagnostics(self):
+        tracing.reset()
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        self.histogram_label.setText("   ".join(
+            f"{'≤ %g ms' % bound if bound else '> %g ms' % tracing.BUCKETS_MS[-1]}: {count}"
+            for bound, count in tracing.histogram()
+        ))
+        self._fill(self.query_table, [
+            (stat.method, stat.calls, f"{stat.total_ms:.1f}", f"{stat.p50_ms:.2f}",
+             f"{stat.p95_ms:.2f}", f"{stat.max_ms:.2f}", f"{stat.rows:.0f}", stat.fingerprint)
+            for stat in tracing.summary()
+        ])
+        self._fill(self.slow_table, [
+            (slow.at, slow.method, slow.ms, slow.rows, slow.params, "; ".join(slow.plan))
+            for slow in tracing.slow_queries()
+        ])
+
+    def _fill(self, table, rows):
+        table.setRowCount(0)
+        for row in rows:
+            row_index = table.rowCount()
+            table.insertRow(row_index)
+            for col, val in enumerate(row):
+                item = QTableWidgetItem(str(val))
+                item.setToolTip(str(val))
+                table.setItem(row_index, col, item)
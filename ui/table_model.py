@@ -0,0 +1,150 @@
+# ui/table_model.py
+
+from bisect import bisect_left
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+PAGE_SIZE = 200
+
+STATUS_COLORS = {
+    "pending": QColor("#FFFACD"),
+    "cancelled": QColor("#F08080"),
+    "completed": QColor("#90EE90"),
+}
+
+
+class PagedTableModel(QAbstractTableModel):
+    """Read-only table model that loads rows on demand as the view scrolls.
+
+    fetch_page(after_key, limit) returns the next page of row tuples after
+    the row whose key is after_key (None for the first page), in ascending
+    key order. Without a fetch_page the model just shows whatever
+    set_rows() gave it.
+    """
+
+    def __init__(self, headers, fetch_page=None, columns=None, status_index=None,
+                 status_colors=None, formatters=None, key=None, page_size=PAGE_SIZE,
+                 parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.fetch_page = fetch_page
+        self.columns = columns or list(range(len(headers)))
+        self.status_index = status_index
+        self.status_colors = status_colors or STATUS_COLORS
+        self.formatters = formatters or {}
+        self.key = key or (lambda row: row[0])
+        self.page_size = page_size
+        self._rows = []
+        self._keys = []
+        self._has_more = False
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = row[self.columns[index.column()]]
+            formatter = self.formatters.get(index.column())
+            if formatter:
+                value = formatter(value)
+            return "" if value is None else str(value)
+
+        if role == Qt.ItemDataRole.BackgroundRole and self.status_index is not None:
+            return self.status_colors.get(str(row[self.status_index]).lower())
+
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        after = self.key(self._rows[-1]) if self._rows else None
+        rows = self.fetch_page(after, self.page_size)
+        if len(rows) < self.page_size:
+            self._has_more = False
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self._keys.extend(self.key(row) for row in rows)
+            self.endInsertRows()
+
+    # --- helpers ---
+    def reload(self):
+        """Drop loaded rows and fetch the first page again."""
+        self._reset([], self.fetch_page is not None)
+        self.fetchMore()
+
+    def load_first_page(self, rows):
+        """Reset to a first page fetched elsewhere (e.g. by a search worker)."""
+        self._reset(rows, self.fetch_page is not None and len(rows) >= self.page_size)
+
+    def set_rows(self, rows):
+        self._reset(rows, False)
+
+    def _reset(self, rows, has_more):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._keys = [self.key(row) for row in self._rows]
+        self._has_more = has_more
+        self.endResetModel()
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def row_for_key(self, key):
+        pos = self._find(key)
+        return None if pos is None else self._rows[pos]
+
+    def _find(self, key):
+        if self.fetch_page is None:
+            return self._keys.index(key) if key in self._keys else None
+        pos = bisect_left(self._keys, key)
+        return pos if pos < len(self._keys) and self._keys[pos] == key else None
+
+    def patch_row(self, key, row):
+        """Apply one write in place: replace, insert or (row=None) remove the row."""
+        pos = self._find(key)
+        if row is None:
+            if pos is not None:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self._rows[pos]
+                del self._keys[pos]
+                self.endRemoveRows()
+        elif pos is not None:
+            self._rows[pos] = row
+            self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self.headers) - 1))
+        elif self.fetch_page is None:
+            self._insert(len(self._rows), key, row)
+        elif not self._has_more or (self._keys and key < self._keys[-1]):
+            # rows past the loaded range arrive with the next fetchMore
+            self._insert(bisect_left(self._keys, key), key, row)
+
+    def _insert(self, pos, key, row):
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._rows.insert(pos, row)
+        self._keys.insert(pos, key)
+        self.endInsertRows()
+
+    def update_rows(self, predicate, update):
+        """Rewrite every loaded row matching predicate with update(row)."""
+        for pos, row in enumerate(self._rows):
+            if predicate(row):
+                self._rows[pos] = update(row)
+                self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self.headers) - 1))